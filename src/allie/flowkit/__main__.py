@@ -23,11 +23,14 @@
 """Main module for the FlowKit service."""
 
 try:
-    from allie.flowkit.config._config import CONFIG
+    from allie.flowkit.config._config import CONFIG, WORKER_COUNT_VARIABLE
     import uvicorn
 except ImportError:
     raise ImportError("Please install uvicorn to run the service: pip install allie-flowkit-python[all]")
 import argparse
+import os
+from pathlib import Path
+import tempfile
 from urllib.parse import urlparse
 
 
@@ -48,12 +51,32 @@ def substitute_empty_values(args):
     port = args.port or urlparse(CONFIG.flowkit_python_endpoint).port
     CONFIG.flowkit_python_endpoint = f"http://0.0.0.0:{port}"
     CONFIG.flowkit_python_workers = args.workers or CONFIG.flowkit_python_workers
+    # The workers size their pools to their share of the CPUs
+    os.environ[WORKER_COUNT_VARIABLE] = str(CONFIG.flowkit_python_workers)
     CONFIG.use_ssl = (args.use_ssl.lower() == "true") if args.use_ssl is not None else CONFIG.use_ssl
     CONFIG.ssl_cert_private_key_file = args.ssl_keyfile or CONFIG.ssl_cert_private_key_file
     CONFIG.ssl_cert_public_key_file = args.ssl_certfile or CONFIG.ssl_cert_public_key_file
     return
 
 
+def prepare_metrics_directory():
+    """Point all worker processes at an empty directory for their Prometheus metrics.
+
+    The directory is only used by the processes importing the metrics
+    after it is set. This process already did, so it only applies to the
+    uvicorn workers started in new processes.
+
+    """
+    if CONFIG.metrics_directory:
+        directory = Path(CONFIG.metrics_directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for metrics_file in directory.glob("*.db"):
+            metrics_file.unlink()
+    else:
+        directory = Path(tempfile.mkdtemp(prefix="allie-flowkit-metrics-"))
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(directory)
+
+
 def main():
     """Run entrypoint for the FlowKit service."""
     if not CONFIG.extract_config_from_azure_key_vault:
@@ -65,6 +88,12 @@ def main():
 
     port = urlparse(CONFIG.flowkit_python_endpoint).port
 
+    # Hand the secrets read from Azure Key Vault and the metrics directory to the workers. A single
+    # worker runs in this process, whose metrics were defined on import and are kept in memory
+    CONFIG.share_key_vault_secrets()
+    if CONFIG.flowkit_python_workers > 1:
+        prepare_metrics_directory()
+
     # Run the service
     uvicorn.run(
         "allie.flowkit.flowkit_service:flowkit_service",
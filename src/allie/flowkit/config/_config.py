@@ -22,13 +22,21 @@
 
 """Module for reading the configuration settings from a YAML file."""
 
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 from pathlib import Path
+import tempfile
 
-from azure.identity import ManagedIdentityCredential
-from azure.keyvault.secrets import SecretClient
-import yaml
+# Environment variable through which worker processes receive the path of the secrets read from Azure Key Vault
+KEY_VAULT_SECRETS_VARIABLE = "ALLIE_FLOWKIT_KEY_VAULT_SECRETS_FILE"
+# Environment variable through which worker processes receive the number of workers given on the command line
+WORKER_COUNT_VARIABLE = "ALLIE_FLOWKIT_WORKERS"
+KEY_VAULT_MAX_CONCURRENT_REQUESTS = 16
+
+# Where the splitter endpoints can run their CPU-bound work
+EXECUTION_MODES = ("inline", "thread", "process")
 
 
 class Config:
@@ -38,12 +46,116 @@ class Config:
     ----------
     flowkit_python_api_key : str
         The API key for accessing the Allie Flowkit Python service.
+    splitter_execution_mode : str
+        Where the splitter endpoints run their CPU-bound work: ``inline``
+        on the event loop, in a ``thread`` pool, or in a ``process`` pool.
+    process_pool_size : int
+        Number of worker processes in the process pool of each service
+        worker. ``0`` shares the CPUs out between the service workers.
+    process_pool_max_tasks_per_child : int
+        Number of tasks a worker process runs before it is replaced.
+        ``0`` keeps worker processes alive for the pool lifetime.
+    process_pool_task_timeout : int
+        Maximum number of seconds to wait for a task. ``0`` disables
+        the timeout.
+    upload_spool_max_size : int
+        Size in bytes above which uploaded documents are spooled to disk.
+    upload_spool_directory : str
+        Directory for spooled uploads. Empty uses the system temporary
+        directory.
+    splitter_cache_max_size : int
+        Size in bytes of the in-process splitter result cache. ``0``
+        disables it.
+    splitter_cache_directory : str
+        Directory of the splitter result cache shared by all worker
+        processes. Empty disables it.
+    splitter_cache_disk_max_size : int
+        Size in bytes of the shared splitter result cache. ``0`` means
+        unbounded.
+    pdf_partition_size : int
+        Number of pages of a PDF document extracted by each worker process.
+        Documents with more pages are extracted in parallel. ``0`` disables
+        parallel extraction.
+    extraction_pool_size : int
+        Number of worker processes extracting parts of a document in
+        parallel in each service worker. ``0`` shares the CPUs out between
+        the service workers. In process execution mode, it is shared out
+        between the request worker processes.
+    ppt_extraction_backend : str
+        How PowerPoint text is extracted when the request does not say:
+        ``pptx`` through the python-pptx object model, or ``xml`` straight
+        from the slide XML parts.
+    ppt_partition_size : int
+        Number of slides parsed by each worker process with the ``xml``
+        backend. Documents with more slides are parsed in parallel. ``0``
+        disables parallel parsing.
+    splitter_length_function : str
+        How chunks are measured when the request does not say:
+        ``characters``, with chunk sizes in tokens converted to characters,
+        or ``tokens``, counted with the tokenizer.
+    tokenizer_vocabulary_file : str
+        Path of the WordPiece vocabulary file of the tokenizer, such as the
+        ``vocab.txt`` of the embedding model.
+    tokenizer_lowercase : bool
+        Whether the tokenizer lowercases text and strips accents, for
+        uncased models.
+    metrics_directory : str
+        Directory where the worker processes write their Prometheus metrics
+        when the service is started from its entrypoint. It is emptied on
+        startup. Empty uses a new temporary directory.
+    metrics_require_api_key : bool
+        Whether the metrics endpoint requires the API key, like the other
+        endpoints. Disable it only where the endpoint is not reachable from
+        outside, for scrapers that cannot send the 'api-key' header.
+    admission_max_concurrent_jobs : int
+        Maximum number of splitter requests a worker process handles at
+        once. ``0`` means unlimited.
+    admission_max_in_flight_bytes : int
+        Maximum total body size of the splitter requests a worker process
+        handles at once. Requests with a chunked body are rejected when
+        it is set. ``0`` means unlimited.
+    admission_max_queue_size : int
+        Maximum number of splitter requests waiting for admission in a
+        worker process. Further requests get a 429 response.
+    admission_queue_timeout : int
+        Maximum number of seconds a splitter request waits for admission
+        before getting a 503 response. ``0`` waits without limit.
+    admission_retry_after : int
+        Number of seconds in the 'Retry-After' header of rejected requests.
+    job_directory : str
+        Directory holding the documents and chunks of splitter jobs, shared
+        by all workers. Empty uses a directory in the temporary directory.
+    job_workers : int
+        Number of splitter jobs run at once by each worker.
+    job_retention : int
+        Number of seconds finished jobs are kept before they are deleted.
+    validate_responses : bool
+        Whether the responses built by the splitter from its own chunks are
+        validated against their models. Disabling it skips the validation.
+    revision_store_directory : str
+        Directory of the SQLite store of the extracted content and chunks of
+        split documents, which later revisions are split against. Empty
+        disables incremental splitting.
+    revision_store_max_size : int
+        Maximum size in bytes of the revision store. ``0`` means unbounded.
+    boilerplate_min_pages : int
+        Minimum number of pages or slides a line must be on to be removed as
+        boilerplate.
+    boilerplate_min_page_percent : int
+        Minimum percentage of the pages or slides of a document a line must
+        be on to be removed as boilerplate.
+    dedup_index_directory : str
+        Directory of the SQLite index of the content hashes of the chunks
+        seen in each collection, which requests with a 'dedup_collection'
+        are deduplicated against. Empty disables deduplication.
 
     Methods
     -------
     _load_config(config_path: str) -> dict
         Read the YAML configuration file and return its content as
         a dictionary.
+    share_key_vault_secrets()
+        Share the secrets read from Azure Key Vault with child processes.
 
     """
 
@@ -66,21 +178,66 @@ class Config:
         # Define the configuration variables to be parsed from the YAML file
         self.flowkit_python_api_key = str(self._yaml.get("FLOWKIT_PYTHON_API_KEY", ""))
         self.flowkit_python_endpoint = str(self._yaml.get("FLOWKIT_PYTHON_ENDPOINT", "http://localhost:50052"))
-        self.flowkit_python_workers = int(self._yaml.get("FLOWKIT_PYTHON_WORKERS", 4))
+        self.flowkit_python_workers = int(
+            os.getenv(WORKER_COUNT_VARIABLE) or self._yaml.get("FLOWKIT_PYTHON_WORKERS", 4)
+        )
         self.use_ssl = bool(self._yaml.get("USE_SSL", False))
         self.ssl_cert_public_key_file = str(self._yaml.get("SSL_CERT_PUBLIC_KEY_FILE", ""))
         self.ssl_cert_private_key_file = str(self._yaml.get("SSL_CERT_PRIVATE_KEY_FILE", ""))
         self.extract_config_from_azure_key_vault = bool(self._yaml.get("EXTRACT_CONFIG_FROM_AZURE_KEY_VAULT", False))
         self.azure_managed_identity_id = str(self._yaml.get("AZURE_MANAGED_IDENTITY_ID", ""))
         self.azure_key_vault_name = str(self._yaml.get("AZURE_KEY_VAULT_NAME", ""))
-
-        # If azure key vault configured, read values from vault
+        self.splitter_execution_mode = str(self._yaml.get("SPLITTER_EXECUTION_MODE", "inline"))
+        self.process_pool_size = int(self._yaml.get("PROCESS_POOL_SIZE", 0))
+        self.process_pool_max_tasks_per_child = int(self._yaml.get("PROCESS_POOL_MAX_TASKS_PER_CHILD", 0))
+        self.process_pool_task_timeout = int(self._yaml.get("PROCESS_POOL_TASK_TIMEOUT", 0))
+        self.upload_spool_max_size = int(self._yaml.get("UPLOAD_SPOOL_MAX_SIZE", 8 * 1024 * 1024))
+        self.upload_spool_directory = str(self._yaml.get("UPLOAD_SPOOL_DIRECTORY", ""))
+        self.splitter_cache_max_size = int(self._yaml.get("SPLITTER_CACHE_MAX_SIZE", 64 * 1024 * 1024))
+        self.splitter_cache_directory = str(self._yaml.get("SPLITTER_CACHE_DIRECTORY", ""))
+        self.splitter_cache_disk_max_size = int(self._yaml.get("SPLITTER_CACHE_DISK_MAX_SIZE", 1024 * 1024 * 1024))
+        self.pdf_partition_size = int(self._yaml.get("PDF_PARTITION_SIZE", 0))
+        self.extraction_pool_size = int(self._yaml.get("EXTRACTION_POOL_SIZE", 0))
+        self.ppt_extraction_backend = str(self._yaml.get("PPT_EXTRACTION_BACKEND", "pptx"))
+        self.ppt_partition_size = int(self._yaml.get("PPT_PARTITION_SIZE", 0))
+        self.splitter_length_function = str(self._yaml.get("SPLITTER_LENGTH_FUNCTION", "characters"))
+        self.tokenizer_vocabulary_file = str(self._yaml.get("TOKENIZER_VOCABULARY_FILE", ""))
+        self.tokenizer_lowercase = bool(self._yaml.get("TOKENIZER_LOWERCASE", True))
+        self.metrics_directory = str(self._yaml.get("METRICS_DIRECTORY", ""))
+        self.metrics_require_api_key = bool(self._yaml.get("METRICS_REQUIRE_API_KEY", True))
+        self.admission_max_concurrent_jobs = int(self._yaml.get("ADMISSION_MAX_CONCURRENT_JOBS", 0))
+        self.admission_max_in_flight_bytes = int(self._yaml.get("ADMISSION_MAX_IN_FLIGHT_BYTES", 0))
+        self.admission_max_queue_size = int(self._yaml.get("ADMISSION_MAX_QUEUE_SIZE", 64))
+        self.admission_queue_timeout = int(self._yaml.get("ADMISSION_QUEUE_TIMEOUT", 30))
+        self.admission_retry_after = int(self._yaml.get("ADMISSION_RETRY_AFTER", 1))
+        self.job_directory = str(self._yaml.get("JOB_DIRECTORY", ""))
+        self.job_workers = int(self._yaml.get("JOB_WORKERS", 1))
+        self.job_retention = int(self._yaml.get("JOB_RETENTION", 24 * 60 * 60))
+        self.validate_responses = bool(self._yaml.get("VALIDATE_RESPONSES", True))
+        self.revision_store_directory = str(self._yaml.get("REVISION_STORE_DIRECTORY", ""))
+        self.revision_store_max_size = int(self._yaml.get("REVISION_STORE_MAX_SIZE", 1024 * 1024 * 1024))
+        self.boilerplate_min_pages = int(self._yaml.get("BOILERPLATE_MIN_PAGES", 3))
+        self.boilerplate_min_page_percent = int(self._yaml.get("BOILERPLATE_MIN_PAGE_PERCENT", 50))
+        self.dedup_index_directory = str(self._yaml.get("DEDUP_INDEX_DIRECTORY", ""))
+
+        # If azure key vault configured, read values from vault, unless
+        # the parent process already did
+        self._key_vault_secrets = {}
         if self.extract_config_from_azure_key_vault:
-            self._get_config_from_azure_key_vault()
+            shared_secrets_path = os.getenv(KEY_VAULT_SECRETS_VARIABLE)
+            if shared_secrets_path and Path(shared_secrets_path).is_file():
+                self._set_config_from_secrets(json.loads(Path(shared_secrets_path).read_text()))
+            else:
+                self._get_config_from_azure_key_vault()
 
         # Check the mandatory configuration variables
         if not self.flowkit_python_api_key:
             raise ValueError("FLOWKIT_PYTHON_API_KEY is missing in the configuration file.")
+        if self.splitter_execution_mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"Unsupported SPLITTER_EXECUTION_MODE: {self.splitter_execution_mode}. "
+                f"Expected one of {', '.join(EXECUTION_MODES)}."
+            )
 
     def _load_config(self, config_path: str) -> dict:
         """Read the YAML configuration file.
@@ -101,6 +258,8 @@ class Config:
             If the configuration file is not found at the given path.
 
         """
+        import yaml
+
         try:
             with Path(config_path).open("r") as file:
                 return yaml.safe_load(file)
@@ -118,6 +277,9 @@ class Config:
 
     def _get_config_from_azure_key_vault(self):
         """Extract configuration from Azure Key Vault and set attributes."""
+        from azure.identity import ManagedIdentityCredential
+        from azure.keyvault.secrets import SecretClient
+
         # Get environment variables
         azure_managed_identity_id = os.getenv(self.azure_managed_identity_id)
         azure_key_vault_name = os.getenv(self.azure_key_vault_name)
@@ -143,37 +305,127 @@ class Config:
         # Create Azure Key Vault SecretClient
         client = SecretClient(vault_url=key_vault_url, credential=credential)
 
-        # List all secrets
-        secret_properties = client.list_properties_of_secrets()
-
-        # Reflect on the fields of the Config class
-        global_config_fields = {field: value for field, value in self.__dict__.items() if not field.startswith("_")}
-
-        # Iterate over all secrets
-        for secret_property in secret_properties:
-            secret_name = secret_property.name
-            secret_value = client.get_secret(secret_name).value
-
-            # Format the field name to match the secret name format
-            formatted_field_name = secret_name.replace("_", "").upper()
-
-            # Match secret names to Config class fields and set values
-            for field_name in global_config_fields:
-                # Remove underscores and convert to uppercase for matching
-                if field_name.replace("_", "").upper() == formatted_field_name:
-                    # Handle different field types
-                    field_type = type(getattr(self, field_name))
-                    if field_type is str:
-                        setattr(self, field_name, secret_value)
-                    elif field_type is bool:
-                        setattr(self, field_name, secret_value.lower() == "true")
-                    elif field_type is int:
-                        setattr(self, field_name, int(secret_value))
-                    elif field_type is list:
-                        setattr(self, field_name, json.loads(secret_value))
-                    else:
-                        raise ValueError(f"Unsupported field type: {field_type}")
-
-
-# Initialize the config object
-CONFIG = Config()
+        self._get_config_from_secret_client(client)
+
+    def _get_config_from_secret_client(self, client):
+        """Fetch the secrets matching configuration fields and set attributes.
+
+        Only secrets whose name matches a field are fetched, and they are
+        fetched concurrently.
+
+        Parameters
+        ----------
+        client : azure.keyvault.secrets.SecretClient
+            The client of the Key Vault to read the secrets from.
+
+        """
+        # Reflect on the fields of the Config class, removing underscores and
+        # converting to uppercase for matching secret names
+        formatted_field_names = {
+            field_name.replace("_", "").upper(): field_name
+            for field_name in self.__dict__
+            if not field_name.startswith("_")
+        }
+
+        # List all secrets and keep the ones matching a field
+        secret_field_names = {}
+        for secret_property in client.list_properties_of_secrets():
+            field_name = formatted_field_names.get(secret_property.name.replace("_", "").upper())
+            if field_name:
+                secret_field_names[secret_property.name] = field_name
+        if not secret_field_names:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(KEY_VAULT_MAX_CONCURRENT_REQUESTS, len(secret_field_names))) as pool:
+            secret_values = pool.map(lambda secret_name: client.get_secret(secret_name).value, secret_field_names)
+            secrets = dict(zip(secret_field_names.values(), secret_values))
+        self._set_config_from_secrets(secrets)
+
+    def _set_config_from_secrets(self, secrets: dict[str, str]):
+        """Set attributes from secret values.
+
+        Parameters
+        ----------
+        secrets : dict[str, str]
+            The secret value of each field name.
+
+        """
+        for field_name, secret_value in secrets.items():
+            # Handle different field types
+            field_type = type(getattr(self, field_name))
+            if field_type is str:
+                setattr(self, field_name, secret_value)
+            elif field_type is bool:
+                setattr(self, field_name, secret_value.lower() == "true")
+            elif field_type is int:
+                setattr(self, field_name, int(secret_value))
+            elif field_type is list:
+                setattr(self, field_name, json.loads(secret_value))
+            else:
+                raise ValueError(f"Unsupported field type: {field_type}")
+        self._key_vault_secrets.update(secrets)
+
+    def share_key_vault_secrets(self):
+        """Share the secrets read from Azure Key Vault with child processes.
+
+        The secrets are written to a temporary file only readable by the
+        current user, which is removed when the current process exits. Only
+        its path is put in the environment, which worker processes inherit,
+        so that they do not read the Key Vault again.
+
+        """
+        if self._key_vault_secrets:
+            # The file is created with owner-only permissions
+            descriptor, secrets_path = tempfile.mkstemp(prefix="allie-flowkit-secrets-", suffix=".json")
+            with os.fdopen(descriptor, "w") as secrets_file:
+                json.dump(self._key_vault_secrets, secrets_file)
+            atexit.register(Path(secrets_path).unlink, missing_ok=True)
+            os.environ[KEY_VAULT_SECRETS_VARIABLE] = secrets_path
+
+
+class LazyConfig:
+    """Represent the configuration settings, read on first use.
+
+    Attribute access, assignment, and deletion are forwarded to a Config
+    object created on first use, so that importing the service does not
+    read the configuration file or reach Azure Key Vault.
+
+    """
+
+    def __init__(self):
+        """Initialize the LazyConfig object without reading the configuration."""
+        object.__setattr__(self, "_config", None)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the configuration settings have been read."""
+        return self._config is not None
+
+    def load(self) -> Config:
+        """Read the configuration settings if they have not been read yet.
+
+        Returns
+        -------
+        Config
+            The configuration settings.
+
+        """
+        if self._config is None:
+            object.__setattr__(self, "_config", Config())
+        return self._config
+
+    def __getattr__(self, name: str):
+        """Get a configuration setting."""
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name: str, value):
+        """Set a configuration setting."""
+        setattr(self.load(), name, value)
+
+    def __delattr__(self, name: str):
+        """Delete a configuration setting."""
+        delattr(self.load(), name)
+
+
+# Initialize the config object, which reads the configuration on first use
+CONFIG = LazyConfig()
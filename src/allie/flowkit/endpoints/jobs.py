@@ -0,0 +1,173 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for running the splitter on very large documents as background jobs."""
+
+from allie.flowkit.endpoints.splitter import decode_document_content, validate_api_key, validate_request
+from allie.flowkit.fastapi_utils import FastJSONResponse
+from allie.flowkit.models.jobs import JobChunksResponse, JobInfo, JobStatus
+from allie.flowkit.models.splitter import SplitterRequest
+from allie.flowkit.utils.jobs import get_job_store, submit_job
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+
+# Document types that can be split by a job
+JOB_DOCUMENT_TYPES = ("pdf", "ppt", "py")
+
+router = APIRouter()
+
+
+@router.post("/splitter/{document_type}", response_model=JobInfo, status_code=202)
+async def submit_splitter_job(document_type: str, request: SplitterRequest, api_key: str = Header(...)) -> JobInfo:
+    """Submit a job splitting a document into chunks in the background.
+
+    Parameters
+    ----------
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    request : SplitterRequest
+        An object containing 'document_content' in Base64,
+        'chunk_size', and 'chunk_overlap'.
+    api_key : str
+        The API key for authentication.
+
+    Returns
+    -------
+    JobInfo
+        The status of the queued job, to poll with its 'job_id'.
+
+    """
+    validate_request(request, api_key)
+    if document_type not in JOB_DOCUMENT_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unsupported document type: {document_type}")
+    validate_job_options(request)
+    # Decoding and storing a large document would block the event loop
+    document = await run_in_threadpool(decode_document_content, request)
+    return await run_in_threadpool(submit_job, document, document_type, request)
+
+
+@router.get("/{job_id}", response_model=JobInfo)
+async def get_job(job_id: str, api_key: str = Header(...)) -> JobInfo:
+    """Get the status and progress of a job.
+
+    Parameters
+    ----------
+    job_id : str
+        The ID of the job.
+    api_key : str
+        The API key for authentication.
+
+    Returns
+    -------
+    JobInfo
+        The status of the job.
+
+    """
+    validate_api_key(api_key)
+    return get_existing_job(job_id)
+
+
+@router.get("/{job_id}/chunks", response_model=JobChunksResponse)
+async def get_job_chunks(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    api_key: str = Header(...),
+) -> JobChunksResponse:
+    """Get a page of the chunks of a succeeded job.
+
+    Parameters
+    ----------
+    job_id : str
+        The ID of the job.
+    offset : int
+        The index of the first chunk.
+    limit : int
+        The maximum number of chunks.
+    api_key : str
+        The API key for authentication.
+
+    Returns
+    -------
+    JobChunksResponse
+        The chunks, with the 'next_offset' of the next page if any.
+
+    """
+    validate_api_key(api_key)
+    job = get_existing_job(job_id)
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status.value}")
+    return FastJSONResponse(get_job_store().get_chunks(job, offset, limit))
+
+
+@router.delete("/{job_id}", status_code=204)
+async def delete_job(job_id: str, api_key: str = Header(...)):
+    """Delete a job and its chunks.
+
+    Parameters
+    ----------
+    job_id : str
+        The ID of the job.
+    api_key : str
+        The API key for authentication.
+
+    """
+    validate_api_key(api_key)
+    if not get_job_store().delete(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+
+def validate_job_options(request: SplitterRequest):
+    """Reject the splitting options that a job cannot honor, since its chunks are stored without them."""
+    if request.response_format != "chunks":
+        raise HTTPException(status_code=400, detail="Jobs only support the 'chunks' response format")
+    if request.include_metadata:
+        raise HTTPException(status_code=400, detail="Jobs do not support 'include_metadata'")
+    if request.previous_version:
+        raise HTTPException(status_code=400, detail="Jobs do not support 'previous_version'")
+    if request.granularities:
+        raise HTTPException(status_code=400, detail="Jobs do not support 'granularities'")
+
+
+def get_existing_job(job_id: str) -> JobInfo:
+    """Get the status of a job.
+
+    Parameters
+    ----------
+    job_id : str
+        The ID of the job.
+
+    Returns
+    -------
+    JobInfo
+        The status of the job.
+
+    Raises
+    ------
+    HTTPException
+        If there is no such job.
+
+    """
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
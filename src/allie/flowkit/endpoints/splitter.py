@@ -22,19 +22,64 @@
 
 """Module for splitting text into chunks."""
 
+import asyncio
 import base64
-import io
+import bisect
+import collections
+import hashlib
+import itertools
+from pathlib import Path
+import re
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 from allie.flowkit.config._config import CONFIG
+from allie.flowkit.fastapi_utils import FastJSONResponse, build_model
 from allie.flowkit.models.functions import FunctionCategory
-from allie.flowkit.models.splitter import SplitterRequest, SplitterResponse
+from allie.flowkit.models.splitter import (
+    GranularityChunks,
+    SplitterBatchItem,
+    SplitterBatchRequest,
+    SplitterBatchResponse,
+    SplitterBatchResult,
+    SplitterRequest,
+    SplitterResponse,
+)
+from allie.flowkit.utils.boilerplate import remove_boilerplate
+from allie.flowkit.utils.cache import cache_key, get_chunk_cache, hash_document
 from allie.flowkit.utils.decorators import category, display_name
-from fastapi import APIRouter, Header, HTTPException
-from langchain.text_splitter import PythonCodeTextSplitter, RecursiveCharacterTextSplitter
-from pdfminer.high_level import extract_text
-from pptx import Presentation
+from allie.flowkit.utils.dedup import get_chunk_index
+from allie.flowkit.utils.executor import run_in_executor
+from allie.flowkit.utils.metrics import CHUNK_COUNT, DOCUMENT_SIZE, time_stage
+from allie.flowkit.utils.pdf import count_pdf_pages, extract_pdf_text_parallel
+from allie.flowkit.utils.ppt import extract_ppt_slides_from_xml
+from allie.flowkit.utils.revisions import diff_units, get_revision_store, plan_regions
+from allie.flowkit.utils.streaming import get_stream_media_type, stream_chunks
+from allie.flowkit.utils.text_splitter import PYTHON_SEPARATORS, TEXT_SEPARATORS, RecursiveTextSplitter
+from allie.flowkit.utils.tokenizer import get_tokenizer
+from allie.flowkit.utils.uploads import UploadedDocument, open_document, read_document, receive_upload
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
 
 TOKEN_TO_CHARACTER_MULTIPLIER = 4
+PPT_BACKENDS = ("pptx", "xml")
+LENGTH_FUNCTIONS = ("characters", "tokens")
+PAGE_BREAK_PATTERN = re.compile("\f")
+CHUNK_DIGEST_SIZE = 16
+DEDUP_BATCH_SIZE = 1000
+# Response fields with a value for each chunk
+CHUNK_FIELDS = (
+    "chunks",
+    "spans",
+    "slide_numbers",
+    "page_numbers",
+    "previous_chunk_indices",
+    "chunk_hashes",
+    "chunk_ids",
+)
 
 router = APIRouter()
 
@@ -42,7 +87,9 @@ router = APIRouter()
 @router.post("/ppt", response_model=SplitterResponse)
 @category(FunctionCategory.DATA_EXTRACTION)
 @display_name("Split PPT")
-async def split_ppt(request: SplitterRequest, api_key: str = Header(...)) -> SplitterResponse:
+async def split_ppt(
+    request: SplitterRequest, api_key: str = Header(...), accept: str | None = Header(None)
+) -> SplitterResponse:
     """Endpoint for splitting text in a PowerPoint document into chunks.
 
     Parameters
@@ -52,16 +99,20 @@ async def split_ppt(request: SplitterRequest, api_key: str = Header(...)) -> Spl
         'chunk_size', and 'chunk_overlap'
     api_key : str
         The API key for authentication.
+    accept : str | None
+        'application/x-ndjson' or 'text/event-stream' to stream the chunks.
 
     """
     validate_request(request, api_key)
-    return process_ppt(request)
+    return await split_request(request, "ppt", accept)
 
 
 @router.post("/py", response_model=SplitterResponse)
 @category(FunctionCategory.DATA_EXTRACTION)
 @display_name("Split Python Code")
-async def split_py(request: SplitterRequest, api_key: str = Header(...)) -> SplitterResponse:
+async def split_py(
+    request: SplitterRequest, api_key: str = Header(...), accept: str | None = Header(None)
+) -> SplitterResponse:
     """Endpoint for splitting Python code into chunks.
 
     Parameters
@@ -71,6 +122,8 @@ async def split_py(request: SplitterRequest, api_key: str = Header(...)) -> Spli
         'chunk_size', and 'chunk_overlap'
     api_key : str
         The API key for authentication.
+    accept : str | None
+        'application/x-ndjson' or 'text/event-stream' to stream the chunks.
 
     Returns
     -------
@@ -79,13 +132,15 @@ async def split_py(request: SplitterRequest, api_key: str = Header(...)) -> Spli
 
     """
     validate_request(request, api_key)
-    return process_python_code(request)
+    return await split_request(request, "py", accept)
 
 
 @router.post("/pdf", response_model=SplitterResponse)
 @category(FunctionCategory.DATA_EXTRACTION)
 @display_name("Split PDF")
-async def split_pdf(request: SplitterRequest, api_key: str = Header(...)) -> SplitterResponse:
+async def split_pdf(
+    request: SplitterRequest, api_key: str = Header(...), accept: str | None = Header(None)
+) -> SplitterResponse:
     """Endpoint for splitting text in a PDF document into chunks.
 
     Parameters
@@ -95,6 +150,8 @@ async def split_pdf(request: SplitterRequest, api_key: str = Header(...)) -> Spl
         'chunk_size', and 'chunk_overlap'.
     api_key : str
         The API key for authentication.
+    accept : str | None
+        'application/x-ndjson' or 'text/event-stream' to stream the chunks.
 
     Returns
     -------
@@ -103,17 +160,53 @@ async def split_pdf(request: SplitterRequest, api_key: str = Header(...)) -> Spl
 
     """
     validate_request(request, api_key)
-    return process_pdf(request)
+    return await split_request(request, "pdf", accept)
 
 
-def process_ppt(request: SplitterRequest) -> SplitterResponse:
-    """Process a PowerPoint document to split text into chunks.
+@router.post("/batch", response_model=SplitterBatchResponse)
+@category(FunctionCategory.DATA_EXTRACTION)
+@display_name("Split Batch")
+async def split_batch(request: SplitterBatchRequest, api_key: str = Header(...)) -> SplitterBatchResponse:
+    """Endpoint for splitting several PDF, PowerPoint, and Python documents into chunks.
 
     Parameters
     ----------
-    request : SplitterRequest
-        An object containing 'document_content' in Base64,
-        'chunk_size', and 'chunk_overlap'
+    request : SplitterBatchRequest
+        An object containing a list of 'documents', each with its
+        'document_type', 'document_content' in Base64, 'chunk_size',
+        and 'chunk_overlap'.
+    api_key : str
+        The API key for authentication.
+
+    Returns
+    -------
+    SplitterBatchResponse
+        An object containing, in request order, the chunks or the error
+        of each document.
+
+    """
+    validate_api_key(api_key)
+    results = await asyncio.gather(*(split_batch_item(item) for item in request.documents))
+    return FastJSONResponse(build_model(SplitterBatchResponse, results=results))
+
+
+@router.post("/ppt/upload", response_model=SplitterResponse)
+async def split_ppt_upload(
+    request: Request, api_key: str = Header(...), accept: str | None = Header(None)
+) -> SplitterResponse:
+    """Endpoint for splitting text in an uploaded PowerPoint document into chunks.
+
+    Parameters
+    ----------
+    request : Request
+        A request whose body is the raw document, or a multipart form
+        with the document in the 'file' field. 'chunk_size', 'chunk_overlap',
+        and the other options of 'SplitterRequest' are read from the query
+        string or the form fields.
+    api_key : str
+        The API key for authentication.
+    accept : str | None
+        'application/x-ndjson' or 'text/event-stream' to stream the chunks.
 
     Returns
     -------
@@ -121,39 +214,177 @@ def process_ppt(request: SplitterRequest) -> SplitterResponse:
         An object containing a list of text chunks.
 
     """
-    try:
-        document_content = base64.b64decode(request.document_content)
-    except base64.binascii.Error:
-        raise HTTPException(status_code=400, detail="Invalid Base64 encoding")
+    validate_api_key(api_key)
+    return await split_upload(request, "ppt", accept)
+
+
+@router.post("/py/upload", response_model=SplitterResponse)
+async def split_py_upload(
+    request: Request, api_key: str = Header(...), accept: str | None = Header(None)
+) -> SplitterResponse:
+    """Endpoint for splitting uploaded Python code into chunks.
+
+    Parameters
+    ----------
+    request : Request
+        A request whose body is the raw code, or a multipart form
+        with the code in the 'file' field. 'chunk_size', 'chunk_overlap',
+        and the other options of 'SplitterRequest' are read from the query
+        string or the form fields.
+    api_key : str
+        The API key for authentication.
+    accept : str | None
+        'application/x-ndjson' or 'text/event-stream' to stream the chunks.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks.
+
+    """
+    validate_api_key(api_key)
+    return await split_upload(request, "py", accept)
+
+
+@router.post("/pdf/upload", response_model=SplitterResponse)
+async def split_pdf_upload(
+    request: Request, api_key: str = Header(...), accept: str | None = Header(None)
+) -> SplitterResponse:
+    """Endpoint for splitting text in an uploaded PDF document into chunks.
+
+    Parameters
+    ----------
+    request : Request
+        A request whose body is the raw document, or a multipart form
+        with the document in the 'file' field. 'chunk_size', 'chunk_overlap',
+        and the other options of 'SplitterRequest' are read from the query
+        string or the form fields.
+    api_key : str
+        The API key for authentication.
+    accept : str | None
+        'application/x-ndjson' or 'text/event-stream' to stream the chunks.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks.
+
+    """
+    validate_api_key(api_key)
+    return await split_upload(request, "pdf", accept)
+
+
+async def split_request(request: SplitterRequest, document_type: str, accept: str | None) -> Response:
+    """Split the document of a validated splitter request off the event loop.
+
+    Parameters
+    ----------
+    request : SplitterRequest
+        An object containing 'document_content' in Base64,
+        'chunk_size', and 'chunk_overlap'.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    accept : str | None
+        The 'Accept' header of the request.
+
+    Returns
+    -------
+    Response
+        The JSON response, or the streamed chunks if the client accepts a
+        streaming media type.
+
+    """
+    media_type = get_stream_media_type(accept)
+    if media_type:
+        validate_streaming(request)
+        # Errors raised once the response has started could not change its status
+        splitter = await run_in_threadpool(get_text_splitter, request, document_type)
+        content = await run_in_executor(extract_request_content, request, document_type)
+        return stream_chunks(iter_document_chunks(content, document_type, request, splitter), media_type)
+    response = await run_in_executor(PROCESSORS[document_type], request)
+    return serialize_response(response)
+
+
+async def split_upload(request: Request, document_type: str, accept: str | None) -> Response:
+    """Receive an uploaded document and split it off the event loop.
+
+    Parameters
+    ----------
+    request : Request
+        A request whose body is the raw document, or a multipart form
+        with the document in the 'file' field.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    accept : str | None
+        The 'Accept' header of the request.
+
+    Returns
+    -------
+    Response
+        The JSON response, or the streamed chunks if the client accepts a
+        streaming media type.
+
+    """
+    media_type = get_stream_media_type(accept)
+    async with receive_upload(request) as upload:
+        options = validate_upload(upload)
+        if media_type:
+            validate_streaming(options)
+            # Errors raised once the response has started could not change its status
+            splitter = await run_in_threadpool(get_text_splitter, options, document_type)
+            content = await run_in_executor(extract_clean_document, upload.document, document_type, options)
+            return stream_chunks(iter_document_chunks(content, document_type, options, splitter), media_type)
+        response = await run_in_executor(split_document, upload.document, document_type, options)
+    return serialize_response(response)
+
+
+async def split_batch_item(item: SplitterBatchItem) -> SplitterBatchResult:
+    """Split a document of a batch request, capturing its error if any.
+
+    Parameters
+    ----------
+    item : SplitterBatchItem
+        An object containing 'document_type', 'document_content' in
+        Base64, 'chunk_size', and 'chunk_overlap'.
 
+    Returns
+    -------
+    SplitterBatchResult
+        The chunks of the document, or the status code and detail of its error.
+
+    """
     try:
-        ppt_document = Presentation(io.BytesIO(document_content))
+        validate_request_parameters(item)
+        response = await run_in_executor(PROCESSORS[item.document_type], item)
+    except HTTPException as e:
+        return SplitterBatchResult(status_code=e.status_code, error=str(e.detail))
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error processing PowerPoint file: {str(e)}")
+        return SplitterBatchResult(status_code=500, error=f"Error processing document: {str(e)}")
+    # The fields are copied as they are, since nested models dumped to dicts would not serialize as models
+    fields = {name: getattr(response, name) for name in SplitterResponse.model_fields}
+    return build_model(SplitterBatchResult, status_code=200, **fields)
 
-    ppt_text = ""
-    for slide in ppt_document.slides:
-        for shape in slide.shapes:
-            if shape.has_text_frame:
-                for paragraph in shape.text_frame.paragraphs:
-                    for run in paragraph.runs:
-                        ppt_text += run.text + " "
 
-    if not ppt_text:
-        raise HTTPException(status_code=400, detail="No text found in PowerPoint document")
+def serialize_response(response: SplitterResponse) -> Response:
+    """Serialize a splitter response to JSON with orjson, recording the serialization time.
 
-    chunk_size_langchain = request.chunk_size * TOKEN_TO_CHARACTER_MULTIPLIER
-    chunk_overlap_langchain = request.chunk_overlap * TOKEN_TO_CHARACTER_MULTIPLIER
+    Parameters
+    ----------
+    response : SplitterResponse
+        The response to serialize.
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size_langchain, chunk_overlap=chunk_overlap_langchain)
-    chunks = splitter.split_text(ppt_text)
-    response = SplitterResponse(chunks=chunks)
+    Returns
+    -------
+    Response
+        The JSON response.
 
-    return response
+    """
+    with time_stage("serialize"):
+        return FastJSONResponse(response)
 
 
-def process_python_code(request: SplitterRequest) -> SplitterResponse:
-    """Process Python code to split text into chunks.
+def process_ppt(request: SplitterRequest) -> SplitterResponse:
+    """Process a PowerPoint document to split text into chunks.
 
     Parameters
     ----------
@@ -167,24 +398,29 @@ def process_python_code(request: SplitterRequest) -> SplitterResponse:
         An object containing a list of text chunks.
 
     """
-    try:
-        document_content = base64.b64decode(request.document_content)
-    except base64.binascii.Error:
-        raise HTTPException(status_code=400, detail="Invalid Base64 encoding")
+    with time_stage("decode"):
+        document_content = decode_document_content(request)
+    return split_document(document_content, "ppt", request)
 
-    try:
-        document_content_str = document_content.decode("utf-8")
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="Error decoding Python code")
 
-    chunk_size_langchain = request.chunk_size * TOKEN_TO_CHARACTER_MULTIPLIER
-    chunk_overlap_langchain = request.chunk_overlap * TOKEN_TO_CHARACTER_MULTIPLIER
+def process_python_code(request: SplitterRequest) -> SplitterResponse:
+    """Process Python code to split text into chunks.
 
-    splitter = PythonCodeTextSplitter(chunk_size=chunk_size_langchain, chunk_overlap=chunk_overlap_langchain)
-    chunks = splitter.split_text(document_content_str)
-    response = SplitterResponse(chunks=chunks)
+    Parameters
+    ----------
+    request : SplitterRequest
+        An object containing 'document_content' in Base64,
+        'chunk_size', and 'chunk_overlap'
 
-    return response
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks.
+
+    """
+    with time_stage("decode"):
+        document_content = decode_document_content(request)
+    return split_document(document_content, "py", request)
 
 
 def process_pdf(request: SplitterRequest) -> SplitterResponse:
@@ -201,63 +437,1170 @@ def process_pdf(request: SplitterRequest) -> SplitterResponse:
     SplitterResponse
         An object containing a list of text chunks.
 
+    """
+    with time_stage("decode"):
+        document_content = decode_document_content(request)
+    return split_document(document_content, "pdf", request)
+
+
+def decode_document_content(request: SplitterRequest) -> bytes:
+    """Decode the Base64 document content of a splitter request.
+
+    Parameters
+    ----------
+    request : SplitterRequest
+        An object containing 'document_content' in Base64.
+
+    Returns
+    -------
+    bytes
+        The decoded document content.
+
+    Raises
+    ------
+    HTTPException
+        If the document content is not valid Base64.
+
     """
     try:
-        document_content = base64.b64decode(request.document_content)
+        return base64.b64decode(request.document_content)
     except base64.binascii.Error:
         raise HTTPException(status_code=400, detail="Invalid Base64 encoding")
 
+
+def iter_slide_texts(ppt_document: "Presentation", paragraph_end: str = "") -> Iterator[str]:
+    """Iterate over the text of each slide of a PowerPoint document.
+
+    Parameters
+    ----------
+    ppt_document : Presentation
+        The PowerPoint document.
+    paragraph_end : str
+        The text appended to each paragraph, such as a newline to keep the
+        paragraphs apart.
+
+    Yields
+    ------
+    str
+        The text of all runs of a slide, each followed by a space. Slides
+        without text yield an empty string, so that slides can be numbered.
+
+    """
+    for slide in ppt_document.slides:
+        yield "".join(
+            "".join(f"{run.text} " for run in paragraph.runs) + paragraph_end
+            for shape in slide.shapes
+            if shape.has_text_frame
+            for paragraph in shape.text_frame.paragraphs
+        )
+
+
+def extract_ppt_slides(document: bytes | Path, options: SplitterRequest | None = None) -> list[str]:
+    """Extract the text of each slide of a PowerPoint document.
+
+    The 'ppt_backend' option, or ``CONFIG.ppt_extraction_backend`` if it is
+    not set, selects between the python-pptx object model ('pptx') and a
+    direct read of the slide XML parts ('xml'). When boilerplate is
+    removed, each paragraph ends with a newline, so that repeated
+    paragraphs are found within slides.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    options : SplitterRequest | None
+        An object containing the extraction options.
+
+    Returns
+    -------
+    list[str]
+        The text of each slide, in slide order.
+
+    """
+    backend = (options and options.ppt_backend) or CONFIG.ppt_extraction_backend
+    if backend not in PPT_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported PowerPoint backend: {backend}")
+
+    paragraph_end = "\n" if options and options.boilerplate != "keep" else ""
+    try:
+        if backend == "xml":
+            slides = extract_ppt_slides_from_xml(document, CONFIG.ppt_partition_size, paragraph_end)
+        else:
+            from pptx import Presentation
+
+            with open_document(document) as document_stream:
+                ppt_document = Presentation(document_stream)
+            slides = list(iter_slide_texts(ppt_document, paragraph_end))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error processing PowerPoint file: {str(e)}")
+
+    if not any(slides):
+        raise HTTPException(status_code=400, detail="No text found in PowerPoint document")
+
+    return slides
+
+
+def extract_ppt_text(document: bytes | Path, options: SplitterRequest | None = None) -> str:
+    """Extract the text of a PowerPoint document.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    options : SplitterRequest | None
+        An object containing the extraction options.
+
+    Returns
+    -------
+    str
+        The text of all runs in the document, separated by spaces.
+
+    """
+    return "".join(extract_ppt_slides(document, options))
+
+
+def extract_python_code(document: bytes | Path, options: SplitterRequest | None = None) -> str:
+    """Decode Python code encoded in UTF-8.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The code encoded in UTF-8, or the path of the file holding it.
+    options : SplitterRequest | None
+        An object containing the extraction options.
+
+    Returns
+    -------
+    str
+        The Python code.
+
+    """
+    try:
+        return read_document(document).decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Error decoding Python code")
+
+
+def extract_pdf_text(document: bytes | Path, options: SplitterRequest | None = None) -> str:
+    """Extract the text of a PDF document.
+
+    Documents with more pages than ``CONFIG.pdf_partition_size`` are
+    extracted in parallel worker processes.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    options : SplitterRequest | None
+        An object containing the extraction options.
+
+    Returns
+    -------
+    str
+        The text of the document.
+
+    """
     try:
-        pdf_text = extract_text(io.BytesIO(document_content))
+        with open_document(document) as document_stream:
+            page_count = count_pdf_pages(document_stream) if CONFIG.pdf_partition_size > 0 else 0
+            if page_count > CONFIG.pdf_partition_size > 0:
+                pdf_text = extract_pdf_text_parallel(document, page_count, CONFIG.pdf_partition_size)
+            else:
+                from pdfminer.high_level import extract_text
+
+                document_stream.seek(0)
+                pdf_text = extract_text(document_stream)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error processing PDF file: {str(e)}")
 
     if not pdf_text:
         raise HTTPException(status_code=400, detail="No text found in PDF document")
 
-    chunk_size_langchain = request.chunk_size * TOKEN_TO_CHARACTER_MULTIPLIER
-    chunk_overlap_langchain = request.chunk_overlap * TOKEN_TO_CHARACTER_MULTIPLIER
+    return pdf_text
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size_langchain, chunk_overlap=chunk_overlap_langchain)
-    chunks = splitter.split_text(pdf_text)
-    response = SplitterResponse(chunks=chunks)
 
-    return response
+def extract_request_content(request: SplitterRequest, document_type: str) -> str | list[str]:
+    """Decode the document of a splitter request and extract its content.
 
+    Parameters
+    ----------
+    request : SplitterRequest
+        An object containing 'document_content' in Base64.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+
+    Returns
+    -------
+    str | list[str]
+        The text of the document, or the text of each slide of a
+        PowerPoint document.
+
+    """
+    with time_stage("decode"):
+        document_content = decode_document_content(request)
+    return extract_clean_document(document_content, document_type, request)
 
-def validate_request(request: SplitterRequest, api_key: str):
-    """Validate the splitter request and API key.
+
+def extract_clean_document(document: bytes | Path, document_type: str, options: SplitterRequest) -> str | list[str]:
+    """Extract the content of a document and remove its boilerplate, if requested.
 
     Parameters
     ----------
-    request : SplitterRequest
-        An object containing 'document_content' in Base64,
-        'chunk_size', and 'chunk_overlap'
-    api_key : str
-        The API key for authentication.
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing the extraction options and 'boilerplate'.
+
+    Returns
+    -------
+    str | list[str]
+        The text of the document, or the text of each slide of a
+        PowerPoint document.
+
+    """
+    content = extract_document(document, document_type, options)
+    return clean_document(content, document_type, options)[0]
+
+
+def clean_document(
+    content: str | list[str], document_type: str, options: SplitterRequest
+) -> tuple[str | list[str], int]:
+    """Remove the boilerplate repeated on the pages or slides of a document, if requested.
+
+    Parameters
+    ----------
+    content : str | list[str]
+        The text of the document, or the text of each slide of a
+        PowerPoint document.
+    document_type : str
+        The type of the document. Only the boilerplate of 'pdf' and 'ppt'
+        documents is removed.
+    options : SplitterRequest
+        An object containing 'boilerplate'.
+
+    Returns
+    -------
+    tuple[str | list[str], int]
+        The content without the boilerplate, with its pages or slides in
+        place, and the number of characters removed.
 
     Raises
     ------
     HTTPException
-        If the API key is invalid or if any of the request parameters are invalid.
+        If removing the boilerplate would remove all text of the document.
 
     """
-    # Check if the provided API key matches the expected API key
-    if api_key != CONFIG.flowkit_python_api_key:
-        raise HTTPException(status_code=401, detail="Invalid API key")
+    if options.boilerplate == "keep" or document_type not in ("pdf", "ppt"):
+        return content, 0
+    with time_stage("boilerplate"):
+        pages = content if document_type == "ppt" else content.split("\f")
+        cleaned_pages, removed = remove_boilerplate(
+            pages, options.boilerplate, CONFIG.boilerplate_min_pages, CONFIG.boilerplate_min_page_percent
+        )
+    if any(page.strip() for page in pages) and not any(page.strip() for page in cleaned_pages):
+        raise HTTPException(status_code=400, detail="Boilerplate removal would remove all text of the document")
+    return (cleaned_pages if document_type == "ppt" else "\f".join(cleaned_pages)), removed
 
-    # Check if document content is provided
-    if not request.document_content:
-        raise HTTPException(status_code=400, detail="No document content provided")
 
-    # Check if chunk size is provided
-    if not request.chunk_size:
-        raise HTTPException(status_code=400, detail="No chunk size provided")
+def extract_document(document: bytes | Path, document_type: str, options: SplitterRequest) -> str | list[str]:
+    """Extract the content of a document, recording its size and the extraction time.
 
-    # Check if chunk size is greater than 0
-    if request.chunk_size <= 0:
-        raise HTTPException(status_code=400, detail="Chunk size must be greater than 0")
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing the extraction options.
 
-    # Check if chunk overlap is greater than or equal to 0
-    if request.chunk_overlap < 0:
-        raise HTTPException(status_code=400, detail="Chunk overlap must be greater than or equal to 0")
+    Returns
+    -------
+    str | list[str]
+        The text of the document, or the text of each slide of a
+        PowerPoint document.
+
+    """
+    document_size = len(document) if isinstance(document, bytes) else document.stat().st_size
+    DOCUMENT_SIZE.labels(document_type).observe(document_size)
+    with time_stage("extract"):
+        return EXTRACTORS[document_type](document, options)
+
+
+def get_text_splitter(options: SplitterRequest, document_type: str) -> RecursiveTextSplitter:
+    """Create the text splitter of a splitter request.
+
+    With the 'characters' length function, chunk sizes are converted to
+    characters with ``TOKEN_TO_CHARACTER_MULTIPLIER``. With the 'tokens'
+    length function, chunks are measured with the configured tokenizer.
+
+    Parameters
+    ----------
+    options : SplitterRequest
+        An object containing 'chunk_size', 'chunk_overlap', and
+        'length_function'.
+    document_type : str
+        The type of the document to split. Python code is split on class
+        and function definitions first.
+
+    Returns
+    -------
+    RecursiveTextSplitter
+        The text splitter.
+
+    Raises
+    ------
+    HTTPException
+        If the tokens length function is requested but no tokenizer is
+        configured, or if its vocabulary file cannot be read.
+
+    """
+    separators = PYTHON_SEPARATORS if document_type == "py" else TEXT_SEPARATORS
+    if get_length_function(options) == "tokens":
+        try:
+            tokenizer = get_tokenizer()
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Token length function is not available: {str(e)}")
+        except OSError as e:
+            raise HTTPException(status_code=500, detail=f"Tokenizer vocabulary file cannot be read: {str(e)}")
+        return RecursiveTextSplitter(options.chunk_size, options.chunk_overlap, separators, tokenizer.count_tokens)
+    return RecursiveTextSplitter(
+        options.chunk_size * TOKEN_TO_CHARACTER_MULTIPLIER,
+        options.chunk_overlap * TOKEN_TO_CHARACTER_MULTIPLIER,
+        separators,
+    )
+
+
+def get_length_function(options: SplitterRequest) -> str:
+    """Get the length function of a splitter request.
+
+    Parameters
+    ----------
+    options : SplitterRequest
+        An object containing 'length_function'.
+
+    Returns
+    -------
+    str
+        'characters' or 'tokens', from the request or ``CONFIG.splitter_length_function``.
+
+    """
+    length_function = options.length_function or CONFIG.splitter_length_function
+    if length_function not in LENGTH_FUNCTIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported length function: {length_function}")
+    return length_function
+
+
+def iter_ppt_spans(
+    slides: list[str], options: SplitterRequest, splitter: RecursiveTextSplitter
+) -> Iterator[tuple[int, int, int]]:
+    """Split the text of a PowerPoint document into chunks.
+
+    Parameters
+    ----------
+    slides : list[str]
+        The text of each slide, in slide order.
+    options : SplitterRequest
+        An object containing 'split_by_slide'.
+    splitter : RecursiveTextSplitter
+        The text splitter of the request.
+
+    Yields
+    ------
+    tuple[int, int, int]
+        The start and end offset of each chunk in the text of all slides,
+        and the number of the slide it starts on.
+
+    """
+    slide_starts = list(itertools.accumulate((len(slide_text) for slide_text in slides[:-1]), initial=0))
+    if options.split_by_slide:
+        for slide_number, (slide_start, slide_text) in enumerate(zip(slide_starts, slides), start=1):
+            for start, end in splitter.split_spans(slide_text):
+                yield slide_start + start, slide_start + end, slide_number
+        return
+
+    for start, end in splitter.split_spans("".join(slides)):
+        yield start, end, bisect.bisect_right(slide_starts, start)
+
+
+def iter_pdf_spans(text: str, splitter: RecursiveTextSplitter) -> Iterator[tuple[int, int, int]]:
+    """Split the text of a PDF document into chunks.
+
+    Parameters
+    ----------
+    text : str
+        The text of the document, with a form feed after each page.
+    splitter : RecursiveTextSplitter
+        The text splitter of the request.
+
+    Yields
+    ------
+    tuple[int, int, int]
+        The start and end offset of each chunk in the text, and the number
+        of the page it starts on.
+
+    """
+    page_ends = [match.start() for match in PAGE_BREAK_PATTERN.finditer(text)]
+    for start, end in splitter.split_spans(text):
+        yield start, end, bisect.bisect_right(page_ends, start) + 1
+
+
+def iter_document_spans(
+    content: str | list[str],
+    document_type: str,
+    options: SplitterRequest,
+    splitter: RecursiveTextSplitter | None = None,
+) -> Iterator[dict]:
+    """Split the extracted content of a document into chunks, as offsets.
+
+    Parameters
+    ----------
+    content : str | list[str]
+        The text of the document, or the text of each slide of a
+        PowerPoint document.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing 'chunk_size', 'chunk_overlap', and the
+        splitting options.
+    splitter : RecursiveTextSplitter | None
+        The text splitter of the request, created from the options if not
+        given.
+
+    Yields
+    ------
+    dict
+        The 'start' and 'end' offset of each chunk in the document text,
+        with its 'page_number' for a PDF document or its 'slide_number' for
+        a PowerPoint document.
+
+    """
+    splitter = splitter or get_text_splitter(options, document_type)
+    if document_type == "ppt":
+        for start, end, slide_number in iter_ppt_spans(content, options, splitter):
+            yield {"start": start, "end": end, "slide_number": slide_number}
+    elif document_type == "pdf":
+        for start, end, page_number in iter_pdf_spans(content, splitter):
+            yield {"start": start, "end": end, "page_number": page_number}
+    else:
+        for start, end in splitter.split_spans(content):
+            yield {"start": start, "end": end}
+
+
+def iter_document_chunks(
+    content: str | list[str],
+    document_type: str,
+    options: SplitterRequest,
+    splitter: RecursiveTextSplitter | None = None,
+) -> Iterator[dict]:
+    """Split the extracted content of a document into chunks.
+
+    Parameters
+    ----------
+    content : str | list[str]
+        The text of the document, or the text of each slide of a
+        PowerPoint document.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing 'chunk_size', 'chunk_overlap', and the
+        splitting options.
+    splitter : RecursiveTextSplitter | None
+        The text splitter of the request, created from the options if not
+        given.
+
+    Yields
+    ------
+    dict
+        Each chunk under 'chunk', with its 'page_number' for a PDF document
+        or its 'slide_number' for a PowerPoint document, and whether it is a
+        'duplicate' when deduplicated with the 'flag' dedup mode.
+
+    """
+    text = get_document_text(content)
+    # The offsets are popped before the rest of the span is unpacked
+    chunks = (
+        {"chunk": text[span.pop("start") : span.pop("end")], **span}
+        for span in iter_document_spans(content, document_type, options, splitter)
+    )
+    if options.dedup_collection:
+        chunks = deduplicate_chunks(chunks, document_type, options)
+    yield from chunks
+
+
+def get_document_text(content: str | list[str]) -> str:
+    """Get the text of the extracted content of a document.
+
+    Parameters
+    ----------
+    content : str | list[str]
+        The text of the document, or the text of each slide of a
+        PowerPoint document.
+
+    Returns
+    -------
+    str
+        The text of the document, which chunk offsets refer to.
+
+    """
+    return "".join(content) if isinstance(content, list) else content
+
+
+def split_document(document: bytes | Path, document_type: str, options: SplitterRequest) -> SplitterResponse:
+    """Extract the text of a document and split it into chunks.
+
+    Results are cached by document content and splitting options, and
+    deduplicated against the chunk index afterwards. A cached result is
+    only used if the revision store, when enabled, still holds the
+    document, so that it can be the previous version of a later request.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing 'chunk_size', 'chunk_overlap', and the
+        splitting options. Its 'document_content' is ignored.
+
+    Returns
+    -------
+    SplitterResponse
+        An object containing a list of text chunks, or the document text
+        and the offsets of the chunks with the 'spans' response format.
+
+    """
+    cache = get_chunk_cache()
+    revisions = get_revision_store()
+    document_hash = hash_document(document) if cache.enabled or revisions.enabled or options.include_metadata else None
+    if cache.enabled:
+        key = cache_key(document_hash, document_type, **get_splitter_options(options))
+        response = cache.get(key)
+        if response is not None and (
+            not revisions.enabled
+            or revisions.touch(document_hash, document_type, revision_key(document_hash, document_type, options))
+        ):
+            return deduplicate_response(response, document_type, options)
+
+    content = extract_document(document, document_type, options)
+    content, boilerplate_characters_removed = clean_document(content, document_type, options)
+    with time_stage("split"):
+        text = get_document_text(content)
+        if options.previous_version:
+            spans, removed_chunk_indices = split_revision(content, document_type, options)
+        else:
+            spans = list(iter_document_spans(content, document_type, options))
+        if options.response_format == "spans":
+            response = build_model(SplitterResponse, text=text, spans=[[span["start"], span["end"]] for span in spans])
+        else:
+            response = build_model(SplitterResponse, chunks=[text[span["start"] : span["end"]] for span in spans])
+        if document_type == "ppt":
+            response.slide_numbers = [span["slide_number"] for span in spans]
+        elif document_type == "pdf":
+            response.page_numbers = [span["page_number"] for span in spans]
+        if options.previous_version:
+            response.previous_chunk_indices = [span["previous_index"] for span in spans]
+            response.removed_chunk_indices = removed_chunk_indices
+        if options.granularities:
+            response.granularities = split_granularities(content, document_type, options, spans)
+        if options.include_metadata:
+            response.document_hash = document_hash
+            response.spans = [[span["start"], span["end"]] for span in spans]
+            response.chunk_hashes = [hash_chunk(text[span["start"] : span["end"]]) for span in spans]
+            response.chunk_ids = [get_chunk_id(document_hash, span["start"], span["end"]) for span in spans]
+        if options.boilerplate != "keep":
+            response.boilerplate_characters_removed = boilerplate_characters_removed
+    CHUNK_COUNT.labels(document_type).observe(len(spans))
+
+    if revisions.enabled:
+        response.document_hash = document_hash
+        revisions.put(
+            document_hash,
+            document_type,
+            content,
+            revision_key(document_hash, document_type, options),
+            [[span["start"], span["end"]] for span in spans],
+        )
+    if cache.enabled:
+        cache.put(key, response)
+    return deduplicate_response(response, document_type, options)
+
+
+def split_revision(
+    content: str | list[str], document_type: str, options: SplitterRequest
+) -> tuple[list[dict], list[int]]:
+    """Split a revised document again only around its changes from its previous version.
+
+    The chunks of the previous version away from the changes are kept, and
+    the regions around the changes are split again. A chunk split again
+    with the same text as a replaced chunk of the previous version is
+    matched with it.
+
+    Parameters
+    ----------
+    content : str | list[str]
+        The text of the revision, or the text of each slide of a
+        PowerPoint document.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing 'chunk_size', 'chunk_overlap', the splitting
+        options, and the content hash of the previous version in
+        'previous_version'.
+
+    Returns
+    -------
+    tuple[list[dict], list[int]]
+        The 'start' and 'end' offset of each chunk in the document text,
+        with its 'page_number' or 'slide_number' and the 'previous_index'
+        of the same chunk in the previous version, or ``None`` for an added
+        chunk, followed by the indices of the removed chunks of the previous
+        version.
+
+    Raises
+    ------
+    HTTPException
+        If revisions are not stored or if the previous version is not in
+        the store.
+
+    """
+    revisions = get_revision_store()
+    if not revisions.enabled:
+        raise HTTPException(status_code=400, detail="Incremental splitting is not enabled")
+    previous_content = revisions.get_content(options.previous_version, document_type)
+    if previous_content is None:
+        raise HTTPException(status_code=404, detail=f"Previous version not found: {options.previous_version}")
+    previous_spans = revisions.get_spans(revision_key(options.previous_version, document_type, options))
+    if previous_spans is None:
+        previous_spans = [
+            [span["start"], span["end"]] for span in iter_document_spans(previous_content, document_type, options)
+        ]
+
+    # Slides split on their own are compared as a whole, the other documents line by line
+    by_slide = document_type == "ppt" and options.split_by_slide
+    text = get_document_text(content)
+    previous_text = get_document_text(previous_content)
+    if by_slide:
+        edits = diff_units(previous_content, content)
+    else:
+        edits = diff_units(previous_text.splitlines(keepends=True), text.splitlines(keepends=True))
+    regions, affected = plan_regions(previous_spans, edits, expand=not by_slide)
+
+    # Chunks that are not affected only move by the size of the changes before them
+    edit_ends = [previous_end for _, previous_end, _, _ in edits]
+    shifts = list(
+        itertools.accumulate(
+            ((end - start) - (previous_end - previous_start) for previous_start, previous_end, start, end in edits),
+            initial=0,
+        )
+    )
+    spans = []
+    for index, (start, end) in enumerate(previous_spans):
+        if index not in affected:
+            shift = shifts[bisect.bisect_right(edit_ends, start)]
+            spans.append({"start": start + shift, "end": end + shift, "previous_index": index})
+
+    replaced = {}
+    for index in sorted(affected):
+        start, end = previous_spans[index]
+        replaced.setdefault(previous_text[start:end], collections.deque()).append(index)
+    splitter = get_text_splitter(options, document_type)
+    slide_starts = list(itertools.accumulate(map(len, content), initial=0)) if by_slide else []
+    for region in regions:
+        if by_slide:
+            first_slide = bisect.bisect_left(slide_starts, region.start)
+            last_slide = bisect.bisect_left(slide_starts, region.end)
+            parts = [(slide_starts[index], slide_starts[index + 1]) for index in range(first_slide, last_slide)]
+        else:
+            parts = [(region.start, region.end)]
+        for part_start, part_end in parts:
+            for start, end in splitter.split_spans(text[part_start:part_end]):
+                indices = replaced.get(text[part_start + start : part_start + end])
+                previous_index = indices.popleft() if indices else None
+                spans.append({"start": part_start + start, "end": part_start + end, "previous_index": previous_index})
+    removed_chunk_indices = sorted(index for indices in replaced.values() for index in indices)
+
+    spans.sort(key=lambda span: (span["start"], span["end"]))
+    if document_type == "ppt":
+        slide_starts = list(itertools.accumulate((len(slide_text) for slide_text in content[:-1]), initial=0))
+        for span in spans:
+            span["slide_number"] = bisect.bisect_right(slide_starts, span["start"])
+    elif document_type == "pdf":
+        page_ends = [match.start() for match in PAGE_BREAK_PATTERN.finditer(text)]
+        for span in spans:
+            span["page_number"] = bisect.bisect_right(page_ends, span["start"]) + 1
+    return spans, removed_chunk_indices
+
+
+def split_granularities(
+    content: str | list[str], document_type: str, options: SplitterRequest, spans: list[dict]
+) -> list[GranularityChunks]:
+    """Split the extracted content of a document with each additional granularity of a request.
+
+    Parameters
+    ----------
+    content : str | list[str]
+        The text of the document, or the text of each slide of a
+        PowerPoint document.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing the 'granularities' and the splitting options.
+    spans : list[dict]
+        The chunks split with the chunk size and chunk overlap of the
+        request, reused by a granularity with the same ones.
+
+    Returns
+    -------
+    list[GranularityChunks]
+        The chunks of each granularity, linked to the chunks of their parent
+        granularity.
+
+    """
+    text = get_document_text(content)
+    granularity_spans = []
+    for granularity in options.granularities:
+        if not options.previous_version and (granularity.chunk_size, granularity.chunk_overlap) == (
+            options.chunk_size,
+            options.chunk_overlap,
+        ):
+            granularity_spans.append(spans)
+            continue
+        granularity_options = options.model_copy(
+            update={"chunk_size": granularity.chunk_size, "chunk_overlap": granularity.chunk_overlap}
+        )
+        granularity_spans.append(list(iter_document_spans(content, document_type, granularity_options)))
+
+    results = []
+    for index, granularity in enumerate(options.granularities):
+        # The parent granularity has the next larger chunk size
+        parent = min(
+            (
+                other
+                for other, other_granularity in enumerate(options.granularities)
+                if other_granularity.chunk_size > granularity.chunk_size
+            ),
+            key=lambda other: (options.granularities[other].chunk_size, other),
+            default=None,
+        )
+        result = build_model(
+            GranularityChunks,
+            chunk_size=granularity.chunk_size,
+            chunk_overlap=granularity.chunk_overlap,
+            parent_granularity=parent,
+        )
+        if options.response_format == "spans":
+            result.spans = [[span["start"], span["end"]] for span in granularity_spans[index]]
+        else:
+            result.chunks = [text[span["start"] : span["end"]] for span in granularity_spans[index]]
+        if document_type == "ppt":
+            result.slide_numbers = [span["slide_number"] for span in granularity_spans[index]]
+        elif document_type == "pdf":
+            result.page_numbers = [span["page_number"] for span in granularity_spans[index]]
+        if parent is not None:
+            result.parent_chunk_indices = find_parent_chunks(granularity_spans[index], granularity_spans[parent])
+        results.append(result)
+    return results
+
+
+def find_parent_chunks(spans: list[dict], parent_spans: list[dict]) -> list[int | None]:
+    """Find the parent chunk of each chunk, the chunk of a larger chunk size it overlaps the most.
+
+    Parameters
+    ----------
+    spans : list[dict]
+        The chunks with their 'start' and 'end' offsets, in document order.
+    parent_spans : list[dict]
+        The chunks of the larger chunk size, in document order.
+
+    Returns
+    -------
+    list[int | None]
+        The index of the parent chunk of each chunk, or ``None`` if it
+        overlaps none.
+
+    """
+    parent_ends = [span["end"] for span in parent_spans]
+    parents = []
+    for span in spans:
+        parent, parent_overlap = None, 0
+        index = bisect.bisect_right(parent_ends, span["start"])
+        while index < len(parent_spans) and parent_spans[index]["start"] < span["end"]:
+            overlap = min(span["end"], parent_spans[index]["end"]) - max(span["start"], parent_spans[index]["start"])
+            if overlap > parent_overlap:
+                parent, parent_overlap = index, overlap
+            index += 1
+        parents.append(parent)
+    return parents
+
+
+def hash_chunk(chunk: str) -> str:
+    """Compute the content hash of a chunk.
+
+    Parameters
+    ----------
+    chunk : str
+        The text of the chunk.
+
+    Returns
+    -------
+    str
+        The hexadecimal 128-bit BLAKE2b digest of the chunk in UTF-8.
+
+    """
+    return hashlib.blake2b(chunk.encode(), digest_size=CHUNK_DIGEST_SIZE).hexdigest()
+
+
+def get_chunk_id(document_hash: str, start: int, end: int) -> str:
+    """Compute the ID of a chunk, stable across requests for the same document.
+
+    Parameters
+    ----------
+    document_hash : str
+        The content hash of the document.
+    start : int
+        The start offset of the chunk in the document text.
+    end : int
+        The end offset of the chunk in the document text.
+
+    Returns
+    -------
+    str
+        The hexadecimal 128-bit BLAKE2b digest of the document hash and the
+        chunk offsets.
+
+    """
+    return hashlib.blake2b(f"{document_hash}:{start}:{end}".encode(), digest_size=CHUNK_DIGEST_SIZE).hexdigest()
+
+
+def deduplicate_response(response: SplitterResponse, document_type: str, options: SplitterRequest) -> SplitterResponse:
+    """Deduplicate the chunks of a response against the chunks already seen in its collection.
+
+    The chunks are added to the collection of the chunk index.
+
+    Parameters
+    ----------
+    response : SplitterResponse
+        The chunks of the document. It is not modified, since it may be cached.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing 'dedup_collection' and 'dedup_mode'.
+
+    Returns
+    -------
+    SplitterResponse
+        The response with the chunks already seen flagged or omitted, or the
+        same response if no dedup collection is requested.
+
+    """
+    if not options.dedup_collection:
+        return response
+
+    with time_stage("dedup"):
+        if response.chunk_hashes is not None:
+            chunk_hashes = response.chunk_hashes
+        elif response.chunks is not None:
+            chunk_hashes = [hash_chunk(chunk) for chunk in response.chunks]
+        else:
+            chunk_hashes = [hash_chunk(response.text[start:end]) for start, end in response.spans]
+        duplicates = get_chunk_index().add(options.dedup_collection, chunk_hashes)
+
+        response = response.model_copy()
+        response.duplicate_chunk_count = sum(duplicates)
+        if options.dedup_mode == "flag":
+            response.duplicate_chunks = duplicates
+            return response
+        for field in CHUNK_FIELDS:
+            values = getattr(response, field)
+            if values is not None:
+                setattr(response, field, [value for value, duplicate in zip(values, duplicates) if not duplicate])
+    return response
+
+
+def deduplicate_chunks(chunks: Iterable[dict], document_type: str, options: SplitterRequest) -> Iterator[dict]:
+    """Deduplicate chunks as they are produced against the chunks already seen in their collection.
+
+    The chunks are looked up and added to the collection of the chunk index
+    in batches.
+
+    Parameters
+    ----------
+    chunks : Iterable[dict]
+        The chunks under 'chunk' with their metadata.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing 'dedup_collection' and 'dedup_mode'.
+
+    Yields
+    ------
+    dict
+        Each chunk with whether it is a 'duplicate' with the 'flag' dedup
+        mode, or each chunk not seen yet with the 'omit' dedup mode.
+
+    """
+    chunks = iter(chunks)
+    while batch := list(itertools.islice(chunks, DEDUP_BATCH_SIZE)):
+        with time_stage("dedup"):
+            duplicates = get_chunk_index().add(
+                options.dedup_collection, [hash_chunk(chunk["chunk"]) for chunk in batch]
+            )
+        for chunk, duplicate in zip(batch, duplicates):
+            if options.dedup_mode == "flag":
+                yield {**chunk, "duplicate": duplicate}
+            elif not duplicate:
+                yield chunk
+
+
+def validate_deduplication(options: SplitterRequest):
+    """Validate that the chunks of a splitter request can be deduplicated.
+
+    Parameters
+    ----------
+    options : SplitterRequest
+        An object containing 'dedup_collection'.
+
+    Raises
+    ------
+    HTTPException
+        If a dedup collection is requested but the chunk index is not
+        enabled.
+
+    """
+    if options.dedup_collection is not None and not get_chunk_index().enabled:
+        raise HTTPException(status_code=400, detail="Chunk deduplication is not enabled")
+
+
+def revision_key(document_hash: str, document_type: str, options: SplitterRequest) -> str:
+    """Build the key of the chunk offsets of a document in the revision store.
+
+    Parameters
+    ----------
+    document_hash : str
+        The content hash of the document.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        The splitter request. Its previous version, response format,
+        metadata option, and granularities do not change the chunk offsets.
+
+    Returns
+    -------
+    str
+        The key.
+
+    """
+    splitter_options = get_splitter_options(options)
+    for option in (
+        "previous_version",
+        "response_format",
+        "include_metadata",
+        "granularities",
+    ):
+        del splitter_options[option]
+    return cache_key(document_hash, document_type, **splitter_options)
+
+
+def get_splitter_options(options: SplitterRequest) -> dict:
+    """Get the options of a splitter request that change its result.
+
+    Parameters
+    ----------
+    options : SplitterRequest
+        The splitter request.
+
+    Returns
+    -------
+    dict
+        The request fields, without the document content and type and the
+        dedup options applied to cached results, with the configured
+        defaults and the configuration settings that change the result.
+
+    """
+    splitter_options = options.model_dump(
+        mode="json", exclude={"document_content", "document_type", "dedup_collection", "dedup_mode"}
+    )
+    splitter_options["length_function"] = get_length_function(options)
+    if splitter_options["length_function"] == "tokens":
+        splitter_options["tokenizer"] = [CONFIG.tokenizer_vocabulary_file, CONFIG.tokenizer_lowercase]
+    if options.boilerplate != "keep":
+        splitter_options["boilerplate_thresholds"] = [CONFIG.boilerplate_min_pages, CONFIG.boilerplate_min_page_percent]
+    splitter_options["ppt_extraction_backend"] = CONFIG.ppt_extraction_backend
+    return splitter_options
+
+
+# Content extractor and request processor of each document type
+EXTRACTORS = {"pdf": extract_pdf_text, "ppt": extract_ppt_slides, "py": extract_python_code}
+PROCESSORS = {"pdf": process_pdf, "ppt": process_ppt, "py": process_python_code}
+
+
+def validate_api_key(api_key: str):
+    """Validate the API key of a request.
+
+    Parameters
+    ----------
+    api_key : str
+        The API key for authentication.
+
+    Raises
+    ------
+    HTTPException
+        If the API key is invalid.
+
+    """
+    # Check if the provided API key matches the expected API key
+    if api_key != CONFIG.flowkit_python_api_key:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+
+def validate_chunk_parameters(chunk_size: int | None, chunk_overlap: int | None):
+    """Validate the chunk size and chunk overlap of a request.
+
+    Parameters
+    ----------
+    chunk_size : int | None
+        The chunk size in tokens.
+    chunk_overlap : int | None
+        The chunk overlap in tokens.
+
+    Raises
+    ------
+    HTTPException
+        If any of the chunk parameters are invalid.
+
+    """
+    # Check if chunk size is provided
+    if not chunk_size:
+        raise HTTPException(status_code=400, detail="No chunk size provided")
+
+    # Check if chunk size is greater than 0
+    if chunk_size <= 0:
+        raise HTTPException(status_code=400, detail="Chunk size must be greater than 0")
+
+    # Check if chunk overlap is provided
+    if chunk_overlap is None:
+        raise HTTPException(status_code=400, detail="No chunk overlap provided")
+
+    # Check if chunk overlap is greater than or equal to 0
+    if chunk_overlap < 0:
+        raise HTTPException(status_code=400, detail="Chunk overlap must be greater than or equal to 0")
+
+
+def validate_request(request: SplitterRequest, api_key: str):
+    """Validate the splitter request and API key.
+
+    Parameters
+    ----------
+    request : SplitterRequest
+        An object containing 'document_content' in Base64,
+        'chunk_size', and 'chunk_overlap'
+    api_key : str
+        The API key for authentication.
+
+    Raises
+    ------
+    HTTPException
+        If the API key is invalid or if any of the request parameters are invalid.
+
+    """
+    validate_api_key(api_key)
+    validate_request_parameters(request)
+
+
+def validate_request_parameters(request: SplitterRequest):
+    """Validate the document content and chunk parameters of a splitter request.
+
+    Parameters
+    ----------
+    request : SplitterRequest
+        An object containing 'document_content' in Base64,
+        'chunk_size', and 'chunk_overlap'
+
+    Raises
+    ------
+    HTTPException
+        If any of the request parameters are invalid.
+
+    """
+    # Check if document content is provided
+    if not request.document_content:
+        raise HTTPException(status_code=400, detail="No document content provided")
+
+    validate_chunk_parameters(request.chunk_size, request.chunk_overlap)
+    for granularity in request.granularities or []:
+        validate_chunk_parameters(granularity.chunk_size, granularity.chunk_overlap)
+    validate_deduplication(request)
+
+
+def validate_streaming(options: SplitterRequest):
+    """Validate that the chunks of a splitter request can be streamed.
+
+    Parameters
+    ----------
+    options : SplitterRequest
+        An object containing 'response_format', 'previous_version',
+        'include_metadata', and 'granularities'.
+
+    Raises
+    ------
+    HTTPException
+        If the 'spans' response format is requested, since streamed chunks
+        carry their text, or if a previous version, chunk metadata, or
+        granularities are requested.
+
+    """
+    if options.response_format == "spans":
+        raise HTTPException(status_code=400, detail="The spans response format cannot be streamed")
+    if options.previous_version:
+        raise HTTPException(status_code=400, detail="Incremental splitting cannot be streamed")
+    if options.include_metadata:
+        raise HTTPException(status_code=400, detail="Chunk metadata cannot be streamed")
+    if options.granularities:
+        raise HTTPException(status_code=400, detail="Multiple granularities cannot be streamed")
+
+
+def validate_upload(upload: UploadedDocument) -> SplitterRequest:
+    """Validate an uploaded document and parse its splitting options.
+
+    Parameters
+    ----------
+    upload : UploadedDocument
+        The received document and its query and form parameters.
+
+    Returns
+    -------
+    SplitterRequest
+        An object containing 'chunk_size', 'chunk_overlap', and the
+        splitting options, without 'document_content'.
+
+    Raises
+    ------
+    HTTPException
+        If the document is empty or if any of the parameters are invalid.
+
+    """
+    # Check if document content is provided
+    if not upload.size:
+        raise HTTPException(status_code=400, detail="No document content provided")
+
+    # Check if chunk size and chunk overlap are provided
+    if not upload.parameters.get("chunk_size"):
+        raise HTTPException(status_code=400, detail="No chunk size provided")
+    if not upload.parameters.get("chunk_overlap"):
+        raise HTTPException(status_code=400, detail="No chunk overlap provided")
+
+    try:
+        options = SplitterRequest.model_validate({**upload.parameters, "document_content": b""})
+    except ValidationError as e:
+        errors = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+        raise HTTPException(status_code=400, detail=f"Invalid upload parameters: {errors}")
+
+    validate_chunk_parameters(options.chunk_size, options.chunk_overlap)
+    for granularity in options.granularities or []:
+        validate_chunk_parameters(granularity.chunk_size, granularity.chunk_overlap)
+    validate_deduplication(options)
+    return options
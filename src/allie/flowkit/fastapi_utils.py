@@ -22,12 +22,59 @@
 
 """Utils module for FastAPI related operations."""
 
+import hashlib
 import inspect
-from typing import Any, get_type_hints
+from typing import Any, TypeVar, get_type_hints
 
+from allie.flowkit.config._config import CONFIG
 from allie.flowkit.models.functions import EndpointInfo, ParameterInfo
+from fastapi.responses import ORJSONResponse
 from fastapi.routing import APIRoute
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+
+ENDPOINT_LIST_ADAPTER = TypeAdapter(list[EndpointInfo])
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """JSON response encoded with orjson, which also accepts a pydantic model.
+
+    Endpoints return it around their response model, so that FastAPI neither
+    validates the model again nor converts it with ``jsonable_encoder``
+    before encoding it, which dominates the time of responses with tens of
+    thousands of chunks. The response model of the route still documents it.
+    The optional fields left as None are omitted, so that a response only has
+    the fields the request asked for.
+
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Encode the content, dumping it first without its None fields if it is a pydantic model."""
+        if isinstance(content, BaseModel):
+            content = content.model_dump(exclude_none=True)
+        return super().render(content)
+
+
+def build_model(model_class: type[ModelT], **fields) -> ModelT:
+    """Build a response model from values produced by the service itself.
+
+    Parameters
+    ----------
+    model_class : type[ModelT]
+        The pydantic model class.
+    **fields
+        The values of the fields of the model.
+
+    Returns
+    -------
+    ModelT
+        The model, validated only if ``CONFIG.validate_responses`` is set.
+
+    """
+    if CONFIG.validate_responses:
+        return model_class(**fields)
+    return model_class.model_construct(**fields)
 
 
 def extract_field_type(field_info: dict):
@@ -44,6 +91,10 @@ def extract_field_type(field_info: dict):
         The extracted field type.
 
     """
+    if "anyOf" in field_info:
+        # Optional fields are a union with null, which is implied by the default value
+        types = [extract_field_type(option) for option in field_info["anyOf"] if option.get("type") != "null"]
+        return "|".join(types) if types else "null"
     field_type = field_info.get("type", "Unknown")
     if field_type == "array":
         items = field_info.get("items", {})
@@ -241,3 +292,70 @@ def extract_endpoint_info(function_map: dict[str, Any], routes: list[APIRoute])
                 )
                 endpoint_list.append(endpoint_info)
     return endpoint_list
+
+
+class EndpointCatalog:
+    """Serialized endpoint information, built once and rebuilt when the routes change.
+
+    Parameters
+    ----------
+    function_map : dict[str, Any]
+        A dictionary mapping function names to their implementations.
+    routes : list[APIRoute]
+        The routes of the application, which may still change.
+
+    """
+
+    def __init__(self, function_map: dict[str, Any], routes: list[APIRoute]):
+        """Initialize the catalog without building it."""
+        self.function_map = function_map
+        self.routes = routes
+        self._fingerprint = None
+        self._body = b""
+        self._etag = ""
+
+    def get(self) -> tuple[bytes, str]:
+        """Get the endpoint information as JSON and its entity tag.
+
+        Returns
+        -------
+        tuple[bytes, str]
+            The JSON list of EndpointInfo objects and its strong entity tag.
+
+        """
+        fingerprint = self.get_fingerprint()
+        if fingerprint != self._fingerprint:
+            endpoint_info = extract_endpoint_info(self.function_map, self.routes)
+            self._body = ENDPOINT_LIST_ADAPTER.dump_json(endpoint_info)
+            self._etag = f'"{hashlib.sha256(self._body).hexdigest()}"'
+            self._fingerprint = fingerprint
+        return self._body, self._etag
+
+    def get_fingerprint(self) -> tuple:
+        """Identify the current routes and functions without inspecting them."""
+        return (
+            tuple(id(route) for route in self.routes),
+            tuple((name, id(function)) for name, function in self.function_map.items()),
+        )
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check if an 'If-None-Match' header matches an entity tag.
+
+    Parameters
+    ----------
+    if_none_match : str | None
+        The 'If-None-Match' header of the request.
+    etag : str
+        The entity tag of the current representation.
+
+    Returns
+    -------
+    bool
+        Whether the header is '*' or lists the entity tag, compared weakly.
+
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
@@ -22,34 +22,60 @@
 
 """Module for the Allie Flowkit service."""
 
+from contextlib import asynccontextmanager
+
 from allie.flowkit.config._config import CONFIG
-from allie.flowkit.endpoints import splitter
-from allie.flowkit.fastapi_utils import extract_endpoint_info
+from allie.flowkit.endpoints import jobs, splitter
+from allie.flowkit.fastapi_utils import EndpointCatalog, FastJSONResponse, etag_matches
 from allie.flowkit.models.functions import EndpointInfo
-from fastapi import FastAPI, Header, HTTPException
+from allie.flowkit.utils.admission import AdmissionMiddleware
+from allie.flowkit.utils.decorators import FUNCTION_REGISTRY
+from allie.flowkit.utils.executor import shutdown_process_pool
+from allie.flowkit.utils.jobs import shutdown_job_runner
+from allie.flowkit.utils.metrics import METRICS_MEDIA_TYPE, MetricsMiddleware, generate_metrics, mark_process_dead
+from fastapi import FastAPI, Header, HTTPException, Response
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the endpoint catalog on startup and release the resources held by the service on shutdown."""
+    endpoint_catalog.get()
+    yield
+    shutdown_job_runner()
+    shutdown_process_pool()
+    mark_process_dead()
 
-flowkit_service = FastAPI()
+
+flowkit_service = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+# Middlewares run in reverse order of addition, so that rejected requests are still measured
+flowkit_service.add_middleware(AdmissionMiddleware, path_prefixes=("/splitter", "/jobs/splitter"))
+flowkit_service.add_middleware(MetricsMiddleware, routes=flowkit_service.routes)
 
 # Include routers from all endpoints
 flowkit_service.include_router(splitter.router, prefix="/splitter", tags=["splitter"])
+flowkit_service.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+
+# Map of function names to function objects, registered by their decorators
+function_map = FUNCTION_REGISTRY
 
-# Map of function names to function objects
-function_map = {
-    "split_ppt": splitter.split_ppt,
-    "split_pdf": splitter.split_pdf,
-    "split_py": splitter.split_py,
-}
+# Endpoint information served by list_functions, rebuilt only when the routes change
+endpoint_catalog = EndpointCatalog(function_map, flowkit_service.routes)
 
 
 # Endpoint to list all enpoint information
 @flowkit_service.get("/", response_model=list[EndpointInfo])
-async def list_functions(api_key: str = Header(...)) -> list[EndpointInfo]:
+async def list_functions(api_key: str = Header(...), if_none_match: str | None = Header(None)) -> list[EndpointInfo]:
     """List all available functions and their endpoints.
 
+    The list is served with an entity tag, and a request whose
+    'If-None-Match' header matches it gets a 304 response without a body.
+
     Parameters
     ----------
     api_key : str
         The API key for authentication.
+    if_none_match : str | None
+        The entity tags of the lists the client already has.
 
     Returns
     -------
@@ -61,4 +87,29 @@ async def list_functions(api_key: str = Header(...)) -> list[EndpointInfo]:
     if api_key != CONFIG.flowkit_python_api_key:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
-    return extract_endpoint_info(function_map, flowkit_service.routes)
+    body, etag = endpoint_catalog.get()
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+# Endpoint to expose the metrics of the service to Prometheus
+@flowkit_service.get("/metrics", include_in_schema=False)
+async def metrics(api_key: str | None = Header(None)) -> Response:
+    """Expose the metrics of the service in the Prometheus text format.
+
+    Parameters
+    ----------
+    api_key : str | None
+        The API key for authentication, unless ``CONFIG.metrics_require_api_key``
+        is disabled.
+
+    Returns
+    -------
+    Response
+        The metrics of all worker processes.
+
+    """
+    if CONFIG.metrics_require_api_key and api_key != CONFIG.flowkit_python_api_key:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    return Response(content=generate_metrics(), media_type=METRICS_MEDIA_TYPE)
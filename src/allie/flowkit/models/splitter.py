@@ -22,9 +22,26 @@
 
 """Model for the splitter endpoint."""
 
+from enum import Enum
+from typing import Literal
+
 from pydantic import BaseModel
 
 
+class ChunkGranularity(BaseModel):
+    """Chunk size and chunk overlap of an additional granularity of a splitter request.
+
+    Parameters
+    ----------
+    BaseModel : pydantic.BaseModel
+        The base model for the granularity.
+
+    """
+
+    chunk_size: int
+    chunk_overlap: int
+
+
 class SplitterRequest(BaseModel):
     """Request model for the splitter endpoint.
 
@@ -38,11 +55,152 @@ class SplitterRequest(BaseModel):
     document_content: bytes
     chunk_size: int
     chunk_overlap: int
+    split_by_slide: bool = False
+    ppt_backend: Literal["pptx", "xml"] | None = None
+    length_function: Literal["characters", "tokens"] | None = None
+    response_format: Literal["chunks", "spans"] = "chunks"
+    previous_version: str | None = None
+    include_metadata: bool = False
+    boilerplate: Literal["keep", "drop", "collapse"] = "keep"
+    dedup_collection: str | None = None
+    dedup_mode: Literal["flag", "omit"] = "flag"
+    granularities: list[ChunkGranularity] | None = None
+
+
+class GranularityChunks(BaseModel):
+    """Chunks of a document split with an additional granularity.
+
+    The chunks are in 'chunks', or are [start, end] offset pairs into the
+    'text' of the response in 'spans' with the 'spans' response format.
+    Each chunk is linked to the chunk of the parent granularity it overlaps
+    the most, the granularity with the next larger chunk size, by its index
+    in 'parent_chunk_indices'. Revisions, chunk metadata, and deduplication
+    only apply to the chunks of the chunk size of the request itself.
+
+    Parameters
+    ----------
+    BaseModel : pydantic.BaseModel
+        The base model for the granularity.
+
+    """
+
+    chunk_size: int
+    chunk_overlap: int
+    chunks: list[str] | None = None
+    spans: list[list[int]] | None = None
+    slide_numbers: list[int] | None = None
+    page_numbers: list[int] | None = None
+    parent_granularity: int | None = None
+    parent_chunk_indices: list[int | None] | None = None
 
 
 class SplitterResponse(BaseModel):
     """Response model for the splitter endpoint.
 
+    With the 'chunks' response format, the text of each chunk is in
+    'chunks'. With the 'spans' response format, the document text is in
+    'text' and each chunk is a [start, end] offset pair into it in 'spans'.
+
+    When revisions are stored, 'document_hash' identifies the document as
+    the 'previous_version' of a later request. The response to such a
+    request gives, for each chunk, the index of the same chunk in the
+    previous version, or null for an added chunk, and lists the indices of
+    the chunks of the previous version that were removed.
+
+    With 'include_metadata', the response also gives the [start, end]
+    offsets of the chunks in 'spans' with either response format, the
+    'document_hash', and for each chunk a content hash in 'chunk_hashes'
+    and an ID derived from the document hash and its offsets in 'chunk_ids'.
+
+    When the 'boilerplate' lines repeated on the pages or slides of a
+    document are dropped or collapsed before splitting, the number of
+    characters removed is in 'boilerplate_characters_removed'.
+
+    When the chunks are deduplicated against the chunks already seen in a
+    'dedup_collection', 'duplicate_chunks' flags each chunk already seen,
+    or the chunks already seen are omitted with the 'omit' dedup mode. The
+    number of chunks already seen is in 'duplicate_chunk_count'.
+
+    When additional 'granularities' are requested, the document is also
+    split with each of their chunk sizes and chunk overlaps, from the same
+    extracted text, in the 'granularities' of the response. The index of
+    the parent granularity of each one in this list is in its
+    'parent_granularity', or is null for the largest chunk size.
+
+    Parameters
+    ----------
+    BaseModel : pydantic.BaseModel
+        The base model for the response.
+
+    """
+
+    chunks: list[str] | None = None
+    slide_numbers: list[int] | None = None
+    page_numbers: list[int] | None = None
+    text: str | None = None
+    spans: list[list[int]] | None = None
+    document_hash: str | None = None
+    previous_chunk_indices: list[int | None] | None = None
+    removed_chunk_indices: list[int] | None = None
+    chunk_hashes: list[str] | None = None
+    chunk_ids: list[str] | None = None
+    boilerplate_characters_removed: int | None = None
+    duplicate_chunks: list[bool] | None = None
+    duplicate_chunk_count: int | None = None
+    granularities: list[GranularityChunks] | None = None
+
+
+class DocumentType(str, Enum):
+    """Enum for the document types supported by the splitter."""
+
+    PDF = "pdf"
+    PPT = "ppt"
+    PY = "py"
+
+
+class SplitterBatchItem(SplitterRequest):
+    """Document of a batch splitter request.
+
+    Parameters
+    ----------
+    SplitterRequest : SplitterRequest
+        The request for a single document.
+
+    """
+
+    document_type: DocumentType
+
+
+class SplitterBatchRequest(BaseModel):
+    """Request model for the batch splitter endpoint.
+
+    Parameters
+    ----------
+    BaseModel : pydantic.BaseModel
+        The base model for the request.
+
+    """
+
+    documents: list[SplitterBatchItem]
+
+
+class SplitterBatchResult(SplitterResponse):
+    """Result of a single document of a batch splitter request.
+
+    Parameters
+    ----------
+    SplitterResponse : SplitterResponse
+        The response for a single document.
+
+    """
+
+    status_code: int
+    error: str | None = None
+
+
+class SplitterBatchResponse(BaseModel):
+    """Response model for the batch splitter endpoint.
+
     Parameters
     ----------
     BaseModel : pydantic.BaseModel
@@ -50,4 +208,4 @@ class SplitterResponse(BaseModel):
 
     """
 
-    chunks: list[str]
+    results: list[SplitterBatchResult]
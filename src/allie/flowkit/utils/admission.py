@@ -0,0 +1,272 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for admission control of the requests of a worker process.
+
+Requests are admitted while the number of running jobs and the bytes of
+their bodies stay within limits. Other requests wait in a bounded FIFO
+queue, and are rejected with 429 when the queue is full or with 503 when
+they wait too long, both with a 'Retry-After' header.
+
+"""
+
+import asyncio
+from collections import deque
+import json
+
+from allie.flowkit.config._config import CONFIG
+from allie.flowkit.utils.metrics import ADMISSION_QUEUED_REQUESTS, ADMISSION_REJECTIONS
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is not admitted.
+
+    Parameters
+    ----------
+    status_code : int
+        429 if the wait queue is full, 503 if the request waited too long, or
+        411 if the size of the request body is unknown.
+    detail : str
+        The reason of the rejection.
+
+    """
+
+    def __init__(self, status_code: int, detail: str):
+        """Initialize the exception with its status code and reason."""
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AdmissionController:
+    """Limit the jobs and the request bytes in flight in a worker process.
+
+    Parameters
+    ----------
+    max_concurrent_jobs : int
+        Maximum number of requests handled at once. ``0`` means unlimited.
+    max_in_flight_bytes : int
+        Maximum total size of the bodies of the requests handled at once.
+        A larger request is still admitted when nothing else is in flight.
+        ``0`` means unlimited.
+    max_queue_size : int
+        Maximum number of requests waiting for admission. ``0`` rejects
+        requests as soon as the limits are reached.
+    queue_timeout : float
+        Maximum number of seconds a request waits for admission. ``0``
+        waits without limit.
+
+    """
+
+    def __init__(self, max_concurrent_jobs: int, max_in_flight_bytes: int, max_queue_size: int, queue_timeout: float):
+        """Initialize the controller with no job in flight."""
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.active_jobs = 0
+        self.in_flight_bytes = 0
+        self._waiters: deque[tuple[int, asyncio.Future]] = deque()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is set."""
+        return self.max_concurrent_jobs > 0 or self.max_in_flight_bytes > 0
+
+    @property
+    def queued_requests(self) -> int:
+        """Number of requests waiting for admission."""
+        return len(self._waiters)
+
+    async def acquire(self, size: int):
+        """Wait until a request can be handled.
+
+        Parameters
+        ----------
+        size : int
+            The size of the request body in bytes.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If the wait queue is full, or if the request waited longer than
+            the queue timeout.
+
+        """
+        if not self._waiters and self._can_admit(size):
+            self._admit(size)
+            return
+        if len(self._waiters) >= self.max_queue_size:
+            raise AdmissionRejectedError(429, "Too many requests in flight, retry later")
+
+        waiter = (size, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        ADMISSION_QUEUED_REQUESTS.inc()
+        try:
+            await asyncio.wait_for(waiter[1], self.queue_timeout or None)
+        except asyncio.TimeoutError:
+            # The request may have been admitted just as it timed out
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release(size)
+            raise AdmissionRejectedError(503, "Timed out waiting for admission, retry later")
+        except asyncio.CancelledError:
+            # The request may have been admitted just before it was cancelled
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release(size)
+            raise
+        finally:
+            ADMISSION_QUEUED_REQUESTS.dec()
+            if waiter[1].cancelled() and waiter in self._waiters:
+                self._waiters.remove(waiter)
+                # A larger request at the head may have been blocking smaller ones
+                self._wake_waiters()
+
+    def release(self, size: int):
+        """Release the job of a handled request and admit waiting requests.
+
+        Parameters
+        ----------
+        size : int
+            The size of the request body in bytes.
+
+        """
+        self.active_jobs -= 1
+        self.in_flight_bytes -= size
+        self._wake_waiters()
+
+    def _can_admit(self, size: int) -> bool:
+        if self.max_concurrent_jobs and self.active_jobs >= self.max_concurrent_jobs:
+            return False
+        if self.max_in_flight_bytes and self.active_jobs and self.in_flight_bytes + size > self.max_in_flight_bytes:
+            return False
+        return True
+
+    def _admit(self, size: int):
+        self.active_jobs += 1
+        self.in_flight_bytes += size
+
+    def _wake_waiters(self):
+        # Admit waiting requests in order, so that large requests are not starved
+        while self._waiters and self._can_admit(self._waiters[0][0]):
+            size, future = self._waiters.popleft()
+            if not future.done():
+                self._admit(size)
+                future.set_result(None)
+
+
+_admission_controller: AdmissionController | None = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the admission controller of the current process, configured on first use.
+
+    Returns
+    -------
+    AdmissionController
+        The admission controller.
+
+    """
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController(
+            CONFIG.admission_max_concurrent_jobs,
+            CONFIG.admission_max_in_flight_bytes,
+            CONFIG.admission_max_queue_size,
+            CONFIG.admission_queue_timeout,
+        )
+    return _admission_controller
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting requests before their body is read.
+
+    Only requests whose path starts with one of the given prefixes are
+    controlled. Their size is taken from the 'Content-Length' header, and
+    their job is released once the response is sent, including streamed
+    responses. When the in-flight bytes are limited, chunked request bodies
+    are rejected with 411, since their size is unknown before admission.
+
+    """
+
+    def __init__(self, app, path_prefixes: tuple[str, ...]):
+        """Initialize the middleware.
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The application to wrap.
+        path_prefixes : tuple[str, ...]
+            The path prefixes of the controlled requests.
+
+        """
+        self.app = app
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope, receive, send):
+        """Handle a request once it is admitted, or reject it."""
+        controller = get_admission_controller()
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes) or not controller.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        size = get_content_length(scope)
+        if size is None and controller.max_in_flight_bytes:
+            ADMISSION_REJECTIONS.labels("411").inc()
+            await send_rejection(send, AdmissionRejectedError(411, "A 'Content-Length' header is required"))
+            return
+        size = size or 0
+        try:
+            await controller.acquire(size)
+        except AdmissionRejectedError as e:
+            ADMISSION_REJECTIONS.labels(str(e.status_code)).inc()
+            await send_rejection(send, e)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(size)
+
+
+def get_content_length(scope) -> int | None:
+    """Get the 'Content-Length' of a request.
+
+    Returns 0 if it is invalid or if the request has no body, and ``None``
+    if the body is sent in chunks of unknown total size.
+
+    """
+    headers = dict(scope["headers"])
+    if b"content-length" in headers:
+        try:
+            return max(0, int(headers[b"content-length"]))
+        except ValueError:
+            return 0
+    return None if b"transfer-encoding" in headers else 0
+
+
+async def send_rejection(send, rejection: AdmissionRejectedError):
+    """Send the response of a rejected request, with a 'Retry-After' header if retrying can succeed."""
+    body = json.dumps({"detail": rejection.detail}).encode()
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    if rejection.status_code in (429, 503):
+        headers.append((b"retry-after", str(CONFIG.admission_retry_after).encode()))
+    await send({"type": "http.response.start", "status": rejection.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,140 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for removing boilerplate repeated on the pages of a document.
+
+Running headers, footers, legal notices, and page numbers are lines that
+recur on many pages, often with only a page number changing. Lines, or the
+paragraphs of slides, are compared after normalizing their whitespace,
+case, and page numbers, in one pass over the document, and the lines found on
+enough pages are dropped, or kept only where they first appear. A page is
+never emptied: a page made only of boilerplate is kept whole.
+
+"""
+
+from collections import Counter
+import re
+
+# Page numbers, in normalized lines: "N of M", "page N", and a number ending the line such as "Slide N"
+PAGE_COUNT_PATTERN = re.compile(r"\b\d+ of \d+\b")
+PAGE_NUMBER_PATTERN = re.compile(r"\bpage \d+\b")
+TRAILING_NUMBER_PATTERN = re.compile(r"(?<!\S)\d+$")
+
+
+def normalize_line(line: str) -> str:
+    """Normalize a line for comparison, ignoring its whitespace, case, and page numbers.
+
+    Other numbers are kept, so that lines such as the rows of a table are
+    not taken for boilerplate when only their values differ.
+
+    Parameters
+    ----------
+    line : str
+        The line.
+
+    Returns
+    -------
+    str
+        The normalized line, empty for a blank line.
+
+    """
+    line = " ".join(line.split()).lower()
+    line = PAGE_COUNT_PATTERN.sub("0 of 0", line)
+    line = PAGE_NUMBER_PATTERN.sub("page 0", line)
+    return TRAILING_NUMBER_PATTERN.sub("0", line)
+
+
+def find_boilerplate(pages: list[str], min_pages: int, min_page_percent: int) -> set[str]:
+    """Find the normalized lines repeated on enough pages to be boilerplate.
+
+    Parameters
+    ----------
+    pages : list[str]
+        The text of each page.
+    min_pages : int
+        The minimum number of pages a line must be on.
+    min_page_percent : int
+        The minimum percentage of the pages with text a line must be on.
+
+    Returns
+    -------
+    set[str]
+        The normalized boilerplate lines.
+
+    """
+    page_counts = Counter()
+    for page in pages:
+        page_counts.update({normalize_line(line) for line in page.splitlines()})
+    page_counts.pop("", None)
+    # Blank pages, such as the one after the last page break, do not count
+    text_page_count = sum(1 for page in pages if page.strip())
+    threshold = max(min_pages, text_page_count * min_page_percent / 100)
+    return {line for line, count in page_counts.items() if count >= threshold}
+
+
+def remove_boilerplate(pages: list[str], mode: str, min_pages: int, min_page_percent: int) -> tuple[list[str], int]:
+    """Remove the boilerplate lines of the pages of a document.
+
+    Parameters
+    ----------
+    pages : list[str]
+        The text of each page.
+    mode : str
+        'drop' to remove every occurrence of the boilerplate lines, or
+        'collapse' to keep the first one.
+    min_pages : int
+        The minimum number of pages a line must be on to be boilerplate.
+    min_page_percent : int
+        The minimum percentage of the pages a line must be on to be
+        boilerplate.
+
+    Returns
+    -------
+    tuple[list[str], int]
+        The text of each page without the boilerplate, and the number of
+        characters removed.
+
+    """
+    boilerplate = find_boilerplate(pages, min_pages, min_page_percent)
+    if not boilerplate:
+        return pages, 0
+
+    seen = set()
+    cleaned_pages = []
+    removed = 0
+    for page in pages:
+        lines = page.splitlines(keepends=True)
+        kept_lines = []
+        for line in lines:
+            normalized = normalize_line(line)
+            if normalized in boilerplate:
+                if mode == "drop" or normalized in seen:
+                    continue
+                seen.add(normalized)
+            kept_lines.append(line)
+        if page.strip() and not "".join(kept_lines).strip():
+            # The page has nothing but boilerplate, so it is kept whole
+            kept_lines = lines
+        cleaned_page = "".join(kept_lines)
+        removed += len(page) - len(cleaned_page)
+        cleaned_pages.append(cleaned_page)
+    return cleaned_pages, removed
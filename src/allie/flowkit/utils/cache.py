@@ -0,0 +1,278 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for caching splitter results by document content."""
+
+from collections import OrderedDict
+import hashlib
+import json
+from pathlib import Path
+import threading
+import time
+import zlib
+
+from allie.flowkit.config._config import CONFIG
+from allie.flowkit.models.splitter import SplitterResponse
+from allie.flowkit.utils.database import SQLiteDatabase
+
+HASH_READ_SIZE = 1024 * 1024
+CACHE_DATABASE_NAME = "splitter_cache.sqlite3"
+CACHE_DATABASE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS chunks "
+    "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS chunks_accessed ON chunks (accessed)",
+)
+
+
+def hash_document(document: bytes | Path) -> str:
+    """Compute the SHA-256 content hash of a document.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+
+    Returns
+    -------
+    str
+        The hexadecimal digest of the document content.
+
+    """
+    if isinstance(document, Path):
+        digest = hashlib.sha256()
+        with document.open("rb") as file:
+            while data := file.read(HASH_READ_SIZE):
+                digest.update(data)
+        return digest.hexdigest()
+    return hashlib.sha256(document).hexdigest()
+
+
+def cache_key(document_hash: str, document_type: str, chunk_size: int, chunk_overlap: int, **options) -> str:
+    """Build the cache key of a splitter result.
+
+    Parameters
+    ----------
+    document_hash : str
+        The content hash of the document.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    chunk_size : int
+        The chunk size in tokens.
+    chunk_overlap : int
+        The chunk overlap in tokens.
+    **options
+        JSON-serializable extraction and splitting options that change the result.
+
+    Returns
+    -------
+    str
+        The cache key.
+
+    """
+    parameters = json.dumps([document_type, chunk_size, chunk_overlap, options], sort_keys=True, separators=(",", ":"))
+    return f"{document_hash}:{hashlib.sha256(parameters.encode()).hexdigest()}"
+
+
+class ChunkCache:
+    """Two-tier cache of splitter results.
+
+    The first tier is an in-process LRU bounded by the size of the
+    serialized results. The optional second tier is a SQLite database
+    that all worker processes on the host share.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups served by either tier.
+    misses : int
+        Number of lookups served by neither tier.
+    evictions : int
+        Number of entries evicted from either tier to respect its size limit.
+
+    """
+
+    def __init__(self, max_size: int, directory: str = "", disk_max_size: int = 0):
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum size in bytes of the in-process tier. ``0`` disables it.
+        directory : str
+            Directory of the SQLite database. Empty disables the on-disk tier.
+        disk_max_size : int
+            Maximum size in bytes of the on-disk tier. ``0`` means unbounded.
+
+        """
+        self.max_size = max_size
+        self.directory = directory
+        self.disk_max_size = disk_max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[SplitterResponse, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._database = SQLiteDatabase(Path(directory) / CACHE_DATABASE_NAME, CACHE_DATABASE_SCHEMA)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any tier of the cache is enabled."""
+        return self.max_size > 0 or bool(self.directory)
+
+    def get(self, key: str) -> SplitterResponse | None:
+        """Get a cached result.
+
+        Parameters
+        ----------
+        key : str
+            The cache key built with ``cache_key``.
+
+        Returns
+        -------
+        SplitterResponse | None
+            The cached result, or ``None`` if it is not in the cache.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            value = self._get_from_disk(key)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            response = SplitterResponse.model_validate_json(value)
+            self._put_in_memory(key, response, len(value))
+            return response
+
+    def put(self, key: str, response: SplitterResponse):
+        """Store a result in the cache.
+
+        Parameters
+        ----------
+        key : str
+            The cache key built with ``cache_key``.
+        response : SplitterResponse
+            The result to store.
+
+        """
+        value = response.model_dump_json().encode()
+        with self._lock:
+            self._put_in_memory(key, response, len(value))
+            self._put_on_disk(key, value)
+
+    def stats(self) -> dict[str, int]:
+        """Get the counters and the current size of the in-process tier.
+
+        Returns
+        -------
+        dict[str, int]
+            The hits, misses, evictions, entries and size in bytes.
+
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+            }
+
+    def clear(self):
+        """Remove all entries from the in-process tier and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def _put_in_memory(self, key: str, response: SplitterResponse, size: int):
+        if size > self.max_size:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= previous[1]
+        self._entries[key] = (response, size)
+        self._size += size
+        while self._size > self.max_size:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            self.evictions += 1
+
+    def _get_from_disk(self, key: str) -> bytes | None:
+        if not self.directory:
+            return None
+        connection = self._database.connect()
+        row = connection.execute("SELECT value FROM chunks WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        connection.execute("UPDATE chunks SET accessed = ? WHERE key = ?", (time.time(), key))
+        return zlib.decompress(row[0])
+
+    def _put_on_disk(self, key: str, value: bytes):
+        if not self.directory:
+            return
+        connection = self._database.connect()
+        compressed = zlib.compress(value, 1)
+        connection.execute(
+            "INSERT OR REPLACE INTO chunks (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+            (key, compressed, len(compressed), time.time()),
+        )
+        if self.disk_max_size <= 0:
+            return
+        (total_size,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM chunks").fetchone()
+        if total_size <= self.disk_max_size:
+            return
+        for evicted_key, size in connection.execute("SELECT key, size FROM chunks ORDER BY accessed").fetchall():
+            connection.execute("DELETE FROM chunks WHERE key = ?", (evicted_key,))
+            self.evictions += 1
+            total_size -= size
+            if total_size <= self.disk_max_size:
+                break
+
+
+_chunk_cache: ChunkCache | None = None
+
+
+def get_chunk_cache() -> ChunkCache:
+    """Get the chunk cache of the current process, creating it on first use.
+
+    Returns
+    -------
+    ChunkCache
+        The cache configured from ``CONFIG``.
+
+    """
+    global _chunk_cache
+    if _chunk_cache is None:
+        _chunk_cache = ChunkCache(
+            max_size=CONFIG.splitter_cache_max_size,
+            directory=CONFIG.splitter_cache_directory,
+            disk_max_size=CONFIG.splitter_cache_disk_max_size,
+        )
+    return _chunk_cache
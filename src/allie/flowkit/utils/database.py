@@ -0,0 +1,72 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for the local SQLite databases shared by the worker processes."""
+
+import os
+from pathlib import Path
+import sqlite3
+
+
+class SQLiteDatabase:
+    """SQLite database in a local directory, shared by all worker processes on the host.
+
+    Each process opens its own connection on first use, in write-ahead
+    logging mode so that readers do not block the writer. The connection
+    can be used from any thread, under a lock of the caller.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the database file. Its directory is created if needed.
+    schema : tuple[str, ...]
+        Statements creating the tables and indexes if they do not exist.
+
+    """
+
+    def __init__(self, path: Path, schema: tuple[str, ...]):
+        """Initialize the database without connecting to it."""
+        self.path = path
+        self.schema = schema
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+
+    def connect(self) -> sqlite3.Connection:
+        """Get the connection of the current process, opening it on first use.
+
+        Returns
+        -------
+        sqlite3.Connection
+            The connection, in autocommit mode.
+
+        """
+        # A connection must not be shared with a forked process
+        if self._connection is None or self._connection_pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.schema:
+                connection.execute(statement)
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
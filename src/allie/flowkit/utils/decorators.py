@@ -20,45 +20,60 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-"""Decorators module for function definitions."""
+"""Decorators module for function definitions.
 
-import asyncio
-from functools import wraps
+The decorators set the metadata of an endpoint as attributes of the function
+and register it in ``FUNCTION_REGISTRY``, which ``list_functions`` lists.
+They return the function itself, so that they add nothing to its calls.
+
+"""
+
+from typing import Callable
+
+# Functions listed by the service, by name
+FUNCTION_REGISTRY: dict[str, Callable] = {}
+
+
+def register_function(func: Callable) -> Callable:
+    """Register a function to list it in the service.
+
+    Parameters
+    ----------
+    func : Callable
+        The endpoint function.
+
+    Returns
+    -------
+    Callable
+        The function itself.
+
+    Raises
+    ------
+    ValueError
+        If another function with the same name is registered.
+
+    """
+    registered = FUNCTION_REGISTRY.setdefault(func.__name__, func)
+    if registered is not func:
+        raise ValueError(f"Another function named {func.__name__} is already registered")
+    return func
 
 
 def category(value: str):
-    """Decorator to add a category to the function."""
+    """Decorator to add a category to the function and register it."""
 
     def decorator(func):
         func.category = value
-
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            # Check if function is async
-            if asyncio.iscoroutinefunction(func):
-                return await func(*args, **kwargs)
-            else:
-                return func(*args, **kwargs)
-
-        return async_wrapper
+        return register_function(func)
 
     return decorator
 
 
 def display_name(value: str):
-    """Decorator to add a display name to the function."""
+    """Decorator to add a display name to the function and register it."""
 
     def decorator(func):
         func.display_name = value
-
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            # Check if function is async
-            if asyncio.iscoroutinefunction(func):
-                return await func(*args, **kwargs)
-            else:
-                return func(*args, **kwargs)
-
-        return async_wrapper
+        return register_function(func)
 
     return decorator
@@ -0,0 +1,140 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Module for finding the chunks already seen in a collection of documents.
+
+The content hashes of the chunks of each collection, such as the documents
+of a tenant, are kept in a local SQLite index shared by all worker
+processes. The hashes of a document are looked up and added in batches in a
+single transaction, so deduplication costs a few queries per request.
+
+"""
+
+from pathlib import Path
+import threading
+
+from allie.flowkit.config._config import CONFIG
+from allie.flowkit.utils.database import SQLiteDatabase
+
+DEDUP_DATABASE_NAME = "chunks.sqlite3"
+DEDUP_DATABASE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS chunks "
+    "(collection TEXT NOT NULL, hash BLOB NOT NULL, PRIMARY KEY (collection, hash)) WITHOUT ROWID",
+)
+
+# Maximum number of hashes looked up by a query, below the SQLite parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+
+class ChunkIndex:
+    """Index of the content hashes of the chunks seen in each collection.
+
+    All worker processes on the host share it through a SQLite database.
+
+    """
+
+    def __init__(self, directory: str = ""):
+        """Initialize the index.
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the SQLite database. Empty disables the index.
+
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._database = SQLiteDatabase(Path(directory) / DEDUP_DATABASE_NAME, DEDUP_DATABASE_SCHEMA)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the index is enabled."""
+        return bool(self.directory)
+
+    def add(self, collection: str, hashes: list[str]) -> list[bool]:
+        """Add chunk hashes to a collection, finding those already seen.
+
+        Parameters
+        ----------
+        collection : str
+            The name of the collection.
+        hashes : list[str]
+            The hexadecimal content hashes of the chunks.
+
+        Returns
+        -------
+        list[bool]
+            Whether each chunk was already in the collection, or earlier in
+            ``hashes``.
+
+        """
+        keys = [bytes.fromhex(chunk_hash) for chunk_hash in hashes]
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            connection = self._database.connect()
+            # Lookups and inserts of concurrent requests must not interleave
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                seen = set()
+                for start in range(0, len(unique_keys), LOOKUP_BATCH_SIZE):
+                    batch = unique_keys[start : start + LOOKUP_BATCH_SIZE]
+                    placeholders = ", ".join("?" * len(batch))
+                    seen.update(
+                        row[0]
+                        for row in connection.execute(
+                            f"SELECT hash FROM chunks WHERE collection = ? AND hash IN ({placeholders})",
+                            (collection, *batch),
+                        )
+                    )
+                connection.executemany(
+                    "INSERT INTO chunks (collection, hash) VALUES (?, ?)",
+                    ((collection, key) for key in unique_keys if key not in seen),
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+        duplicates = []
+        for key in keys:
+            duplicates.append(key in seen)
+            seen.add(key)
+        return duplicates
+
+
+_chunk_index: ChunkIndex | None = None
+
+
+def get_chunk_index() -> ChunkIndex:
+    """Get the chunk index of the current process, creating it on first use.
+
+    Returns
+    -------
+    ChunkIndex
+        The index configured from ``CONFIG``.
+
+    """
+    global _chunk_index
+    if _chunk_index is None:
+        _chunk_index = ChunkIndex(directory=CONFIG.dedup_index_directory)
+    return _chunk_index
@@ -0,0 +1,258 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for running CPU-bound work off the event loop."""
+
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import util
+import os
+import sys
+import threading
+from typing import Any, Callable
+
+from allie.flowkit.config._config import CONFIG, EXECUTION_MODES
+from allie.flowkit.utils.metrics import current_endpoint
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+# Above the priority of the finalizer closing the queues of the pools, which
+# the shutdown still needs to stop the worker processes
+EXTRACTION_POOL_EXIT_PRIORITY = 100
+
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_pid: int | None = None
+# Tasks submitted to the process pool and not done yet
+_process_pool_tasks: set[Future] = set()
+_extraction_pool: ProcessPoolExecutor | None = None
+_extraction_pool_pid: int | None = None
+
+# Number of request worker processes sharing the CPUs, set in each of them
+_request_worker_count = 0
+
+
+class RemoteHTTPError(Exception):
+    """Picklable carrier for an ``HTTPException`` raised in a worker process.
+
+    ``HTTPException`` is built with keyword arguments, so it cannot be
+    unpickled in the parent process. Its status code and detail are
+    transported with this exception instead.
+
+    """
+
+    def __init__(self, status_code: int, detail: Any):
+        """Initialize the exception with the original status code and detail."""
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _call_in_worker(endpoint: str, func: Callable, *args) -> Any:
+    """Call the function in a worker process for a request to the endpoint, and make its errors picklable."""
+    current_endpoint.set(endpoint)
+    try:
+        return func(*args)
+    except HTTPException as e:
+        raise RemoteHTTPError(e.status_code, e.detail) from None
+
+
+def _get_cpu_share() -> int:
+    """Get the number of CPUs of each service worker, so that together they use each CPU once.
+
+    Returns
+    -------
+    int
+        The number of CPUs divided by the number of service workers, at
+        least one.
+
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, CONFIG.flowkit_python_workers))
+
+
+def _init_request_worker(worker_count: int):
+    """Record in a request worker process how many request worker processes share the CPUs."""
+    global _request_worker_count
+    _request_worker_count = worker_count
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the process pool of the current worker, creating it on first use.
+
+    Returns
+    -------
+    ProcessPoolExecutor
+        The process pool configured from ``CONFIG``.
+
+    Raises
+    ------
+    ValueError
+        If a maximum number of tasks per child is configured on a Python
+        version that does not support it.
+
+    """
+    global _process_pool, _process_pool_pid
+    # A pool inherited from the parent of a forked process cannot be used
+    if _process_pool is None or _process_pool_pid != os.getpid():
+        kwargs = {}
+        if CONFIG.process_pool_max_tasks_per_child > 0:
+            if sys.version_info < (3, 11):
+                raise ValueError("PROCESS_POOL_MAX_TASKS_PER_CHILD requires Python 3.11 or later.")
+            kwargs["max_tasks_per_child"] = CONFIG.process_pool_max_tasks_per_child
+        max_workers = CONFIG.process_pool_size or _get_cpu_share()
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_request_worker, initargs=(max_workers,), **kwargs
+        )
+        _process_pool_pid = os.getpid()
+    return _process_pool
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Get the process pool used to extract parts of a document in parallel.
+
+    This pool is separate from the request process pool, so that a task
+    running in a request worker process can fan out to it. By default, it
+    has the share of the CPUs of the service worker. In a request
+    worker process, its size is divided by the number of request worker
+    processes, so that they share the CPUs instead of each starting a
+    process per CPU.
+
+    Returns
+    -------
+    ProcessPoolExecutor
+        The process pool configured from ``CONFIG``.
+
+    """
+    global _extraction_pool, _extraction_pool_pid
+    # A pool inherited from the parent of a forked process cannot be used
+    if _extraction_pool is None or _extraction_pool_pid != os.getpid():
+        max_workers = CONFIG.extraction_pool_size or _get_cpu_share()
+        if _request_worker_count:
+            max_workers = max(1, max_workers // _request_worker_count)
+        _extraction_pool = ProcessPoolExecutor(max_workers=max_workers)
+        _extraction_pool_pid = os.getpid()
+        # A request worker process joins its child processes when it exits,
+        # so the pool must be shut down before
+        util.Finalize(None, _extraction_pool.shutdown, exitpriority=EXTRACTION_POOL_EXIT_PRIORITY)
+    return _extraction_pool
+
+
+def retire_process_pool(runaway_task: Future):
+    """Replace the process pool after a task timed out, and kill its processes once its other tasks are done.
+
+    A running task cannot be cancelled, so the process running it stays
+    busy until it is killed. The other tasks of the pool get the task
+    timeout to finish before.
+
+    Parameters
+    ----------
+    runaway_task : Future
+        The task that timed out.
+
+    """
+    global _process_pool, _process_pool_tasks
+    pool, tasks = _process_pool, _process_pool_tasks
+    if pool is None or _process_pool_pid != os.getpid() or runaway_task not in tasks:
+        # The pool was already retired by another timed out task
+        return
+    _process_pool, _process_pool_tasks = None, set()
+    threading.Thread(
+        target=_kill_process_pool,
+        args=(pool, tasks - {runaway_task}),
+        name="allie-flowkit-pool-retirement",
+        daemon=True,
+    ).start()
+
+
+def _kill_process_pool(pool: ProcessPoolExecutor, tasks: set[Future]):
+    wait(tasks, timeout=CONFIG.process_pool_task_timeout or None)
+    # ProcessPoolExecutor has no public way to stop a running task before Python 3.14
+    for process in list(pool._processes.values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pool():
+    """Shut down the process pools of the current worker, if they were created."""
+    global _process_pool, _process_pool_tasks, _extraction_pool
+    # Pools inherited from the parent of a forked process are only dropped
+    if _process_pool is not None and _process_pool_pid == os.getpid():
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+    _process_pool, _process_pool_tasks = None, set()
+    if _extraction_pool is not None and _extraction_pool_pid == os.getpid():
+        _extraction_pool.shutdown(wait=False, cancel_futures=True)
+    _extraction_pool = None
+
+
+async def run_in_executor(func: Callable, *args) -> Any:
+    """Run a CPU-bound function according to the configured execution mode.
+
+    Parameters
+    ----------
+    func : Callable
+        A module-level function, so that it can be sent to a worker process.
+    *args
+        Picklable positional arguments for the function.
+
+    Returns
+    -------
+    Any
+        The return value of the function.
+
+    Raises
+    ------
+    HTTPException
+        If the function raises one, if the task times out, or if the
+        process pool is broken. The process pool is replaced when a task
+        times out, since the task keeps running in its worker process.
+
+    """
+    mode = CONFIG.splitter_execution_mode
+    if mode == "inline":
+        return func(*args)
+    if mode == "thread":
+        return await run_in_threadpool(func, *args)
+    if mode != "process":
+        raise ValueError(f"Unsupported execution mode: {mode}. Expected one of {', '.join(EXECUTION_MODES)}.")
+
+    timeout = CONFIG.process_pool_task_timeout or None
+    # The stage timings of the task are labelled with the endpoint of the request
+    task = (_call_in_worker, current_endpoint.get(), func, *args)
+    try:
+        future = get_process_pool().submit(*task)
+    except BrokenProcessPool:
+        shutdown_process_pool()
+        future = get_process_pool().submit(*task)
+    tasks = _process_pool_tasks
+    tasks.add(future)
+    future.add_done_callback(tasks.discard)
+
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+    except RemoteHTTPError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except asyncio.TimeoutError:
+        retire_process_pool(future)
+        raise HTTPException(status_code=504, detail=f"Task exceeded the timeout of {timeout} seconds")
+    except BrokenProcessPool:
+        shutdown_process_pool()
+        raise HTTPException(status_code=503, detail="Worker process terminated unexpectedly")
@@ -0,0 +1,445 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for running splitter jobs in the background and storing their results on disk.
+
+Each job has a directory holding its document, its splitting options, its
+status, and once it succeeded its chunks as JSON lines with an index of
+their offsets, so that any worker process sharing the job directory can
+report the status of a job and serve its chunks page by page. Jobs run in
+a process pool of the worker that submitted them, which keeps touching
+their heartbeat file until they finish.
+
+"""
+
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from allie.flowkit.config._config import CONFIG
+from allie.flowkit.models.jobs import JobChunksResponse, JobInfo, JobStatus
+from allie.flowkit.models.splitter import SplitterRequest
+from allie.flowkit.utils.executor import get_extraction_pool
+from allie.flowkit.utils.metrics import current_endpoint, time_stage
+from allie.flowkit.utils.pdf import count_pdf_pages, extract_pdf_pages
+
+# Pages extracted at once when the PDF partition size is not configured, which sets the progress granularity
+DEFAULT_PROGRESS_PARTITION_SIZE = 20
+
+# Seconds between heartbeats of the unfinished jobs of a worker, and without a heartbeat before a job is failed
+HEARTBEAT_INTERVAL = 5
+HEARTBEAT_TIMEOUT = 60
+
+# Seconds between deletions of the expired jobs by each worker
+EXPIRY_INTERVAL = 10 * 60
+
+DOCUMENT_FILE = "document"
+REQUEST_FILE = "request.json"
+STATUS_FILE = "status.json"
+CHUNKS_FILE = "chunks.jsonl"
+INDEX_FILE = "chunks.idx"
+HEARTBEAT_FILE = "heartbeat"
+
+
+class JobStore:
+    """Directory of the jobs, shared by all worker processes.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory holding a subdirectory per job.
+
+    """
+
+    def __init__(self, directory: Path):
+        """Initialize the store, creating its directory."""
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def create(self, document: bytes, document_type: str, options: SplitterRequest) -> JobInfo:
+        """Store the document and options of a new queued job.
+
+        Parameters
+        ----------
+        document : bytes
+            The document content.
+        document_type : str
+            The type of the document: 'pdf', 'ppt', or 'py'.
+        options : SplitterRequest
+            An object containing 'chunk_size', 'chunk_overlap', and the
+            splitting options. Its 'document_content' is not stored.
+
+        Returns
+        -------
+        JobInfo
+            The status of the job.
+
+        """
+        job_id = uuid.uuid4().hex
+        job_directory = self.directory / job_id
+        job_directory.mkdir()
+        (job_directory / DOCUMENT_FILE).write_bytes(document)
+        # The document is stored on its own, not in Base64 with the options
+        options = options.model_copy(update={"document_content": b""})
+        (job_directory / REQUEST_FILE).write_text(options.model_dump_json())
+        (job_directory / HEARTBEAT_FILE).touch()
+        now = time.time()
+        job = JobInfo(
+            job_id=job_id, document_type=document_type, status=JobStatus.QUEUED, created_at=now, updated_at=now
+        )
+        self.save(job)
+        return job
+
+    def get(self, job_id: str) -> JobInfo | None:
+        """Get the status of a job.
+
+        A queued or running job without a recent heartbeat is reported as
+        failed, since the worker process that submitted it is gone and it
+        will never finish.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the job.
+
+        Returns
+        -------
+        JobInfo | None
+            The status of the job, or ``None`` if there is no such job.
+
+        """
+        if not is_job_id(job_id):
+            return None
+        try:
+            status = json.loads((self.directory / job_id / STATUS_FILE).read_text())
+        except FileNotFoundError:
+            return None
+        job = JobInfo.model_validate(status)
+        if job.status in (JobStatus.QUEUED, JobStatus.RUNNING) and not self.is_alive(job_id):
+            job.status = JobStatus.FAILED
+            job.error = "Job interrupted by a restart of the service"
+        return job
+
+    def save(self, job: JobInfo):
+        """Save the status of a job atomically."""
+        job.updated_at = time.time()
+        status_path = self.directory / job.job_id / STATUS_FILE
+        temporary_path = status_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary_path.write_text(job.model_dump_json())
+        temporary_path.replace(status_path)
+
+    def touch(self, job_id: str):
+        """Record a heartbeat of an unfinished job."""
+        try:
+            (self.directory / job_id / HEARTBEAT_FILE).touch()
+        except FileNotFoundError:
+            # The job was deleted
+            pass
+
+    def is_alive(self, job_id: str) -> bool:
+        """Check if an unfinished job had a heartbeat recently."""
+        try:
+            heartbeat = (self.directory / job_id / HEARTBEAT_FILE).stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return time.time() - heartbeat < HEARTBEAT_TIMEOUT
+
+    def delete(self, job_id: str) -> bool:
+        """Delete a job and its results.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the job.
+
+        Returns
+        -------
+        bool
+            Whether the job existed.
+
+        """
+        if not is_job_id(job_id) or not (self.directory / job_id).is_dir():
+            return False
+        shutil.rmtree(self.directory / job_id, ignore_errors=True)
+        return True
+
+    def delete_expired(self, retention: int):
+        """Delete the finished jobs not updated for longer than the retention, in seconds."""
+        expiry = time.time() - retention
+        for job_directory in self.directory.iterdir():
+            job = self.get(job_directory.name)
+            if job and job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED) and job.updated_at < expiry:
+                self.delete(job.job_id)
+
+    def get_chunks(self, job: JobInfo, offset: int, limit: int) -> JobChunksResponse:
+        """Read a page of the chunks of a succeeded job.
+
+        Parameters
+        ----------
+        job : JobInfo
+            The status of the job.
+        offset : int
+            The index of the first chunk.
+        limit : int
+            The maximum number of chunks.
+
+        Returns
+        -------
+        JobChunksResponse
+            The chunks, with the offset of the next page if any.
+
+        """
+        job_directory = self.directory / job.job_id
+        index = array("Q")
+        index.frombytes((job_directory / INDEX_FILE).read_bytes())
+        total = len(index) - 1
+        start = min(offset, total)
+        stop = min(offset + limit, total)
+        with (job_directory / CHUNKS_FILE).open("rb") as chunks_file:
+            chunks_file.seek(index[start])
+            lines = chunks_file.read(index[stop] - index[start]).splitlines()
+        chunks = [json.loads(line) for line in lines]
+
+        response = JobChunksResponse(
+            job_id=job.job_id,
+            offset=start,
+            total=total,
+            next_offset=stop if stop < total else None,
+            chunks=[chunk["chunk"] for chunk in chunks],
+        )
+        if job.document_type == "ppt":
+            response.slide_numbers = [chunk["slide_number"] for chunk in chunks]
+        elif job.document_type == "pdf":
+            response.page_numbers = [chunk["page_number"] for chunk in chunks]
+        if chunks and "duplicate" in chunks[0]:
+            response.duplicate_chunks = [chunk["duplicate"] for chunk in chunks]
+        return response
+
+    def run(self, job_id: str):
+        """Extract and split the document of a job, saving its progress and chunks.
+
+        Parameters
+        ----------
+        job_id : str
+            The ID of the job.
+
+        """
+        # Imported here, since the splitter endpoints submit jobs
+        from allie.flowkit.endpoints.splitter import clean_document, extract_document, iter_document_chunks
+
+        job = self.get(job_id)
+        job_directory = self.directory / job_id
+        job.status = JobStatus.RUNNING
+        self.save(job)
+        try:
+            options = SplitterRequest.model_validate_json((job_directory / REQUEST_FILE).read_text())
+            document_path = job_directory / DOCUMENT_FILE
+            if job.document_type == "pdf":
+                content = self.extract_pdf(job, document_path)
+            else:
+                content = extract_document(document_path, job.document_type, options)
+            content = clean_document(content, job.document_type, options)[0]
+
+            index = array("Q", [0])
+            with (job_directory / CHUNKS_FILE).open("wb") as chunks_file:
+                for chunk in iter_document_chunks(content, job.document_type, options):
+                    index.append(index[-1] + chunks_file.write(json.dumps(chunk).encode() + b"\n"))
+            (job_directory / INDEX_FILE).write_bytes(index.tobytes())
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = str(getattr(e, "detail", e))
+        else:
+            job.status = JobStatus.SUCCEEDED
+            job.progress = 1.0
+            job.chunk_count = len(index) - 1
+        self.save(job)
+
+    def extract_pdf(self, job: JobInfo, document_path: Path) -> str:
+        """Extract the text of a PDF document range by range in the extraction pool, saving the progress."""
+        try:
+            with document_path.open("rb") as document_stream:
+                page_count = count_pdf_pages(document_stream)
+        except Exception as e:
+            raise ValueError(f"Error processing PDF file: {str(e)}")
+        partition_size = CONFIG.pdf_partition_size or DEFAULT_PROGRESS_PARTITION_SIZE
+        starts = range(0, page_count, partition_size)
+        stops = [min(start + partition_size, page_count) for start in starts]
+        page_texts = []
+        try:
+            with time_stage("extract"):
+                ranges = get_extraction_pool().map(extract_pdf_pages, [document_path] * len(starts), starts, stops)
+                for stop, text in zip(stops, ranges):
+                    page_texts.append(text)
+                    job.progress = stop / page_count
+                    self.save(job)
+        except Exception as e:
+            raise ValueError(f"Error processing PDF file: {str(e)}")
+        pdf_text = "".join(page_texts)
+        if not pdf_text:
+            raise ValueError("No text found in PDF document")
+        return pdf_text
+
+
+def is_job_id(job_id: str) -> bool:
+    """Check that a job ID is a UUID in hexadecimal, so that it is a safe directory name."""
+    return len(job_id) == 32 and all(character in "0123456789abcdef" for character in job_id)
+
+
+def run_job(directory: Path, job_id: str, endpoint: str):
+    """Run a job in a process of the job runner, for a request to the endpoint."""
+    current_endpoint.set(endpoint)
+    JobStore(directory).run(job_id)
+
+
+_job_store: JobStore | None = None
+_job_runner: ProcessPoolExecutor | None = None
+_job_runner_pid: int | None = None
+_job_monitor: threading.Thread | None = None
+_job_monitor_stop = threading.Event()
+
+# IDs of the unfinished jobs submitted by the current worker process
+_active_jobs: set[str] = set()
+
+
+def get_job_store() -> JobStore:
+    """Get the job store, configured on first use.
+
+    Returns
+    -------
+    JobStore
+        The job store in ``CONFIG.job_directory``, or in the temporary
+        directory if it is not set.
+
+    """
+    global _job_store
+    if _job_store is None:
+        directory = CONFIG.job_directory or Path(tempfile.gettempdir()) / "allie-flowkit-jobs"
+        _job_store = JobStore(Path(directory))
+    return _job_store
+
+
+def get_job_runner() -> ProcessPoolExecutor:
+    """Get the process pool running the jobs of the current worker, creating it on first use.
+
+    Returns
+    -------
+    ProcessPoolExecutor
+        The process pool running ``CONFIG.job_workers`` jobs at once.
+
+    """
+    global _job_runner, _job_runner_pid
+    # A runner inherited from the parent of a forked process cannot be used
+    if _job_runner is None or _job_runner_pid != os.getpid():
+        _job_runner = ProcessPoolExecutor(max_workers=CONFIG.job_workers)
+        _job_runner_pid = os.getpid()
+    return _job_runner
+
+
+def monitor_jobs(stop: threading.Event):
+    """Touch the heartbeats of the unfinished jobs and delete the expired jobs periodically, until stopped."""
+    expired_at = None
+    while True:
+        store = get_job_store()
+        for job_id in list(_active_jobs):
+            store.touch(job_id)
+        if expired_at is None or time.monotonic() - expired_at >= EXPIRY_INTERVAL:
+            store.delete_expired(CONFIG.job_retention)
+            expired_at = time.monotonic()
+        if stop.wait(HEARTBEAT_INTERVAL):
+            return
+
+
+def finish_job(store: JobStore, job_id: str, future: Future):
+    """Stop the heartbeats of a job and fail it if its process could not run it."""
+    _active_jobs.discard(job_id)
+    error = "Job interrupted by a restart of the service" if future.cancelled() else future.exception()
+    if error is None:
+        return
+    job = store.get(job_id)
+    if job is not None and job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+        job.status = JobStatus.FAILED
+        job.error = str(error)
+        store.save(job)
+
+
+def submit_job(document: bytes, document_type: str, options: SplitterRequest) -> JobInfo:
+    """Store a new job and queue it to run in the background.
+
+    This function writes the document to the job directory, so it must not
+    be called on the event loop.
+
+    Parameters
+    ----------
+    document : bytes
+        The document content.
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    options : SplitterRequest
+        An object containing 'chunk_size', 'chunk_overlap', and the
+        splitting options.
+
+    Returns
+    -------
+    JobInfo
+        The status of the queued job.
+
+    """
+    global _job_runner, _job_monitor
+    store = get_job_store()
+    job = store.create(document, document_type, options)
+    if _job_monitor is None or not _job_monitor.is_alive():
+        _job_monitor_stop.clear()
+        _job_monitor = threading.Thread(
+            target=monitor_jobs, args=(_job_monitor_stop,), name="allie-flowkit-job-monitor", daemon=True
+        )
+        _job_monitor.start()
+    _active_jobs.add(job.job_id)
+    task = (run_job, store.directory, job.job_id, current_endpoint.get())
+    try:
+        future = get_job_runner().submit(*task)
+    except BrokenProcessPool:
+        # A process of the runner died, which failed its jobs
+        _job_runner = None
+        future = get_job_runner().submit(*task)
+    future.add_done_callback(partial(finish_job, store, job.job_id))
+    return job
+
+
+def shutdown_job_runner():
+    """Stop running jobs of the current worker process, if any were submitted."""
+    global _job_runner, _job_monitor
+    if _job_monitor is not None:
+        _job_monitor_stop.set()
+        _job_monitor = None
+    # A runner inherited from the parent of a forked process is only dropped
+    if _job_runner is not None and _job_runner_pid == os.getpid():
+        _job_runner.shutdown(wait=False, cancel_futures=True)
+    _job_runner = None
@@ -0,0 +1,197 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for the Prometheus metrics of the service.
+
+When the ``PROMETHEUS_MULTIPROC_DIR`` environment variable is set before
+this module is imported, every process writes its metrics to that
+directory and the metrics endpoint aggregates them, so that the metrics of
+all uvicorn workers and process pool workers are reported together. A
+process which imported the Prometheus client before the variable was set
+keeps its metrics in memory and reports only its own.
+
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    values,
+)
+from starlette.routing import Match
+
+MULTIPROCESS_DIRECTORY_VARIABLE = "PROMETHEUS_MULTIPROC_DIR"
+# Whether the values of the metrics are kept in the directory, which the client chose when it was first imported
+MULTIPROCESS_MODE = values.ValueClass is not values.MutexValue
+METRICS_MEDIA_TYPE = CONTENT_TYPE_LATEST
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+DOCUMENT_SIZE_BUCKETS = tuple(1024 * 4**exponent for exponent in range(10))
+CHUNK_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000)
+
+REQUESTS = Counter("flowkit_requests", "Number of requests handled.", ["endpoint", "status_code"])
+REQUESTS_IN_FLIGHT = Gauge(
+    "flowkit_requests_in_flight", "Number of requests being handled.", ["endpoint"], multiprocess_mode="livesum"
+)
+REQUEST_DURATION = Histogram(
+    "flowkit_request_duration_seconds",
+    "Time to handle a request, until the end of the response body.",
+    ["endpoint"],
+    buckets=DURATION_BUCKETS,
+)
+STAGE_DURATION = Histogram(
+    "flowkit_splitter_stage_duration_seconds",
+    "Time spent in each stage of splitting a document: decode, extract, split, and serialize.",
+    ["endpoint", "stage"],
+    buckets=DURATION_BUCKETS,
+)
+DOCUMENT_SIZE = Histogram(
+    "flowkit_splitter_document_size_bytes",
+    "Size of the split documents.",
+    ["document_type"],
+    buckets=DOCUMENT_SIZE_BUCKETS,
+)
+CHUNK_COUNT = Histogram(
+    "flowkit_splitter_chunks",
+    "Number of chunks a document is split into.",
+    ["document_type"],
+    buckets=CHUNK_COUNT_BUCKETS,
+)
+ADMISSION_QUEUED_REQUESTS = Gauge(
+    "flowkit_admission_queued_requests", "Number of requests waiting for admission.", multiprocess_mode="livesum"
+)
+ADMISSION_REJECTIONS = Counter(
+    "flowkit_admission_rejections", "Number of requests rejected by admission control.", ["status_code"]
+)
+
+# Path of the route of the request being handled, which labels the stage timings like the request metrics
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="unmatched")
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Record the time spent in a stage of splitting a document, for the endpoint of the current request.
+
+    Parameters
+    ----------
+    stage : str
+        The stage: 'decode', 'extract', 'boilerplate', 'split', 'dedup', or
+        'serialize'.
+
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_DURATION.labels(current_endpoint.get(), stage).observe(time.perf_counter() - start)
+
+
+def generate_metrics() -> bytes:
+    """Generate the metrics of the service in the Prometheus text format.
+
+    Returns
+    -------
+    bytes
+        The metrics of all processes in multiprocess mode, or of the
+        current process otherwise.
+
+    """
+    if not MULTIPROCESS_MODE:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def mark_process_dead():
+    """Discard the live gauges of the current process when it exits in multiprocess mode."""
+    if MULTIPROCESS_MODE:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the count, concurrency, and duration of requests.
+
+    Requests are labelled by the path of the route they match, so that path
+    parameters do not create new series. Requests matching no route are
+    labelled 'unmatched'. The path is also set as the current endpoint, for
+    the stage timings of the request.
+
+    """
+
+    def __init__(self, app, routes: list):
+        """Initialize the middleware.
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The application to wrap.
+        routes : list
+            The routes of the application.
+
+        """
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        """Handle a request, recording its metrics."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = self.get_endpoint(scope)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_metrics(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.labels(endpoint).inc()
+        token = current_endpoint.set(endpoint)
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            current_endpoint.reset(token)
+            REQUESTS_IN_FLIGHT.labels(endpoint).dec()
+            REQUEST_DURATION.labels(endpoint).observe(time.perf_counter() - start)
+            REQUESTS.labels(endpoint, str(status_code)).inc()
+
+    def get_endpoint(self, scope) -> str:
+        """Get the path of the route matching a request."""
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "unmatched"
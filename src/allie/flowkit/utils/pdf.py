@@ -0,0 +1,118 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for extracting the text of PDF documents page range by page range."""
+
+from io import StringIO
+from pathlib import Path
+from typing import BinaryIO
+
+from allie.flowkit.utils.executor import get_extraction_pool
+from allie.flowkit.utils.uploads import open_document, spool_document
+
+
+def count_pdf_pages(document_stream: BinaryIO) -> int:
+    """Count the pages of a PDF document without interpreting them.
+
+    Parameters
+    ----------
+    document_stream : BinaryIO
+        A binary stream over the document.
+
+    Returns
+    -------
+    int
+        The number of pages.
+
+    """
+    from pdfminer.pdfpage import PDFPage
+
+    return sum(1 for _ in PDFPage.get_pages(document_stream))
+
+
+def extract_pdf_pages(document: bytes | Path, start: int, stop: int) -> str:
+    """Extract the text of a range of pages of a PDF document.
+
+    The text of each page is the same as the one ``pdfminer.high_level.extract_text``
+    produces for that page, so the ranges of a document can be concatenated.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    start : int
+        The index of the first page to extract.
+    stop : int
+        The index after the last page to extract.
+
+    Returns
+    -------
+    str
+        The text of the pages.
+
+    """
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    with open_document(document) as document_stream, StringIO() as output_string:
+        resource_manager = PDFResourceManager(caching=True)
+        device = TextConverter(resource_manager, output_string, codec="utf-8", laparams=LAParams())
+        interpreter = PDFPageInterpreter(resource_manager, device)
+        pages = PDFPage.get_pages(document_stream, pagenos=range(start, stop), caching=True)
+        for _, page in zip(range(start, stop), pages):
+            interpreter.process_page(page)
+        return output_string.getvalue()
+
+
+def extract_pdf_text_parallel(document: bytes | Path, page_count: int, partition_size: int) -> str:
+    """Extract the text of a PDF document in parallel worker processes.
+
+    The pages are partitioned in ranges of ``partition_size`` pages, each
+    range is extracted by a worker process of the extraction pool, and the
+    texts are joined in page order. A document held in memory is written
+    to a temporary file first, so that it is not sent to every worker.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    page_count : int
+        The number of pages of the document.
+    partition_size : int
+        The number of pages of each range.
+
+    Returns
+    -------
+    str
+        The text of the document.
+
+    """
+    if isinstance(document, bytes):
+        with spool_document(document, "allie-pdf-") as path:
+            return extract_pdf_text_parallel(path, page_count, partition_size)
+
+    starts = range(0, page_count, partition_size)
+    stops = [min(start + partition_size, page_count) for start in starts]
+    pool = get_extraction_pool()
+    return "".join(pool.map(extract_pdf_pages, [document] * len(starts), starts, stops))
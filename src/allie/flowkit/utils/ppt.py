@@ -0,0 +1,210 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for extracting the text of PowerPoint documents straight from their XML parts."""
+
+from pathlib import Path
+import posixpath
+from typing import BinaryIO, Iterator
+from xml.etree.ElementTree import iterparse
+import zipfile
+
+from allie.flowkit.utils.executor import get_extraction_pool
+from allie.flowkit.utils.uploads import open_document, spool_document
+
+P_NAMESPACE = "http://schemas.openxmlformats.org/presentationml/2006/main"
+A_NAMESPACE = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+RELS_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+PRESENTATION_PART = "ppt/presentation.xml"
+PRESENTATION_RELS_PART = "ppt/_rels/presentation.xml.rels"
+
+# Path of the text of a run in a top-level shape, which is the text python-pptx reads
+RUN_TEXT_PATH = [
+    f"{{{P_NAMESPACE}}}sld",
+    f"{{{P_NAMESPACE}}}cSld",
+    f"{{{P_NAMESPACE}}}spTree",
+    f"{{{P_NAMESPACE}}}sp",
+    f"{{{P_NAMESPACE}}}txBody",
+    f"{{{A_NAMESPACE}}}p",
+    f"{{{A_NAMESPACE}}}r",
+    f"{{{A_NAMESPACE}}}t",
+]
+PARAGRAPH_PATH = RUN_TEXT_PATH[:6]
+SHAPE_DEPTH = 4
+
+
+def get_slide_part_names(archive: zipfile.ZipFile) -> list[str]:
+    """Get the names of the slide parts of a PowerPoint document, in slide order.
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        The PowerPoint document.
+
+    Returns
+    -------
+    list[str]
+        The names of the slide parts in the archive.
+
+    """
+    targets = {}
+    with archive.open(PRESENTATION_RELS_PART) as rels_stream:
+        for _, element in iterparse(rels_stream):
+            if element.tag == f"{{{RELS_NAMESPACE}}}Relationship":
+                targets[element.get("Id")] = element.get("Target")
+
+    part_names = []
+    with archive.open(PRESENTATION_PART) as presentation_stream:
+        for _, element in iterparse(presentation_stream):
+            if element.tag == f"{{{P_NAMESPACE}}}sldId":
+                target = targets[element.get(f"{{{R_NAMESPACE}}}id")]
+                if target.startswith("/"):
+                    part_names.append(target.lstrip("/"))
+                else:
+                    part_names.append(posixpath.normpath(posixpath.join("ppt", target)))
+    return part_names
+
+
+def iter_paragraph_runs(slide_stream: BinaryIO) -> Iterator[list[str]]:
+    """Iterate over the paragraphs of the top-level shapes of a slide.
+
+    The slide XML is parsed incrementally, and each shape is discarded once
+    it has been read.
+
+    Parameters
+    ----------
+    slide_stream : BinaryIO
+        A binary stream over the slide part.
+
+    Yields
+    ------
+    list[str]
+        The text of each run of a paragraph, for each paragraph in document
+        order.
+
+    """
+    path = []
+    runs = []
+    for event, element in iterparse(slide_stream, events=("start", "end")):
+        if event == "start":
+            path.append(element.tag)
+            continue
+        if path == RUN_TEXT_PATH:
+            runs.append(element.text or "")
+        elif path == PARAGRAPH_PATH:
+            yield runs
+            runs = []
+        elif len(path) == SHAPE_DEPTH:
+            element.clear()
+        path.pop()
+
+
+def read_slide_text(archive: zipfile.ZipFile, part_name: str, paragraph_end: str = "") -> str:
+    """Read the text of a slide part.
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        The PowerPoint document.
+    part_name : str
+        The name of the slide part in the archive.
+    paragraph_end : str
+        The text appended to each paragraph, such as a newline to keep the
+        paragraphs apart.
+
+    Returns
+    -------
+    str
+        The text of all runs of the slide, each followed by a space.
+
+    """
+    with archive.open(part_name) as slide_stream:
+        return "".join(
+            "".join(f"{text} " for text in runs) + paragraph_end for runs in iter_paragraph_runs(slide_stream)
+        )
+
+
+def extract_slide_texts(document: bytes | Path, part_names: list[str], paragraph_end: str = "") -> list[str]:
+    """Extract the text of some slides of a PowerPoint document.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    part_names : list[str]
+        The names of the slide parts to read.
+    paragraph_end : str
+        The text appended to each paragraph.
+
+    Returns
+    -------
+    list[str]
+        The text of each slide.
+
+    """
+    with open_document(document) as document_stream, zipfile.ZipFile(document_stream) as archive:
+        return [read_slide_text(archive, part_name, paragraph_end) for part_name in part_names]
+
+
+def extract_ppt_slides_from_xml(document: bytes | Path, partition_size: int = 0, paragraph_end: str = "") -> list[str]:
+    """Extract the text of each slide of a PowerPoint document from its XML parts.
+
+    This gives the same text as the python-pptx object model, without
+    loading the shapes, layouts, and masters of the document.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file holding it.
+    partition_size : int
+        Number of slides parsed by each worker process of the extraction
+        pool. ``0`` parses all slides in the current process.
+    paragraph_end : str
+        The text appended to each paragraph, such as a newline to keep the
+        paragraphs apart.
+
+    Returns
+    -------
+    list[str]
+        The text of each slide, in slide order.
+
+    """
+    with open_document(document) as document_stream, zipfile.ZipFile(document_stream) as archive:
+        part_names = get_slide_part_names(archive)
+        if not 0 < partition_size < len(part_names):
+            return [read_slide_text(archive, part_name, paragraph_end) for part_name in part_names]
+
+    if isinstance(document, bytes):
+        with spool_document(document, "allie-ppt-") as path:
+            return extract_ppt_slides_from_xml(path, partition_size, paragraph_end)
+
+    partitions = [part_names[start : start + partition_size] for start in range(0, len(part_names), partition_size)]
+    pool = get_extraction_pool()
+    return [
+        text
+        for texts in pool.map(
+            extract_slide_texts, [document] * len(partitions), partitions, [paragraph_end] * len(partitions)
+        )
+        for text in texts
+    ]
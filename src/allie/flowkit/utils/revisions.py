@@ -0,0 +1,337 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for splitting revised documents incrementally against a previous version.
+
+The extracted content of each split document and the offsets of its chunks
+are kept in a local SQLite store, by document content hash. A revision is
+compared with the previous version line by line, or slide by slide when
+slides are split on their own, and only the regions around the changes are
+split again.
+
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+import difflib
+import itertools
+import json
+from pathlib import Path
+import threading
+import time
+import zlib
+
+from allie.flowkit.config._config import CONFIG
+from allie.flowkit.utils.database import SQLiteDatabase
+
+REVISION_DATABASE_NAME = "revisions.sqlite3"
+REVISION_DATABASE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS revisions "
+    "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS revisions_accessed ON revisions (accessed)",
+)
+
+
+@dataclass
+class Region:
+    """Region of a revision split again, with the matching region of the previous version.
+
+    Attributes
+    ----------
+    previous_start : int
+        The start offset of the region in the text of the previous version.
+    previous_end : int
+        The end offset of the region in the text of the previous version.
+    start : int
+        The start offset of the region in the text of the revision.
+    end : int
+        The end offset of the region in the text of the revision.
+
+    """
+
+    previous_start: int
+    previous_end: int
+    start: int
+    end: int
+
+
+class RevisionStore:
+    """Store of the extracted content and chunk offsets of split documents.
+
+    All worker processes on the host share it through a SQLite database.
+
+    """
+
+    def __init__(self, directory: str = "", max_size: int = 0):
+        """Initialize the store.
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the SQLite database. Empty disables the store.
+        max_size : int
+            Maximum size in bytes of the store. ``0`` means unbounded.
+
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._database = SQLiteDatabase(Path(directory) / REVISION_DATABASE_NAME, REVISION_DATABASE_SCHEMA)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the store is enabled."""
+        return bool(self.directory)
+
+    def get_content(self, document_hash: str, document_type: str) -> str | list[str] | None:
+        """Get the extracted content of a document.
+
+        Parameters
+        ----------
+        document_hash : str
+            The content hash of the document.
+        document_type : str
+            The type of the document: 'pdf', 'ppt', or 'py'.
+
+        Returns
+        -------
+        str | list[str] | None
+            The text of the document, or the text of each slide of a
+            PowerPoint document, or ``None`` if it is not in the store.
+
+        """
+        return self._get(f"content:{document_type}:{document_hash}")
+
+    def get_spans(self, key: str) -> list[list[int]] | None:
+        """Get the chunk offsets of a document split with some options.
+
+        Parameters
+        ----------
+        key : str
+            The cache key of the document and its splitting options.
+
+        Returns
+        -------
+        list[list[int]] | None
+            The [start, end] offsets of the chunks, or ``None`` if they are
+            not in the store.
+
+        """
+        return self._get(f"spans:{key}")
+
+    def put(self, document_hash: str, document_type: str, content: str | list[str], key: str, spans: list[list[int]]):
+        """Store the extracted content of a document and its chunk offsets.
+
+        Parameters
+        ----------
+        document_hash : str
+            The content hash of the document.
+        document_type : str
+            The type of the document: 'pdf', 'ppt', or 'py'.
+        content : str | list[str]
+            The text of the document, or the text of each slide of a
+            PowerPoint document.
+        key : str
+            The cache key of the document and its splitting options.
+        spans : list[list[int]]
+            The [start, end] offsets of the chunks.
+
+        """
+        self._put(f"content:{document_type}:{document_hash}", content)
+        self._put(f"spans:{key}", spans)
+
+    def touch(self, document_hash: str, document_type: str, key: str) -> bool:
+        """Mark the extracted content of a document and its chunk offsets as used, so that they are evicted last.
+
+        Parameters
+        ----------
+        document_hash : str
+            The content hash of the document.
+        document_type : str
+            The type of the document: 'pdf', 'ppt', or 'py'.
+        key : str
+            The cache key of the document and its splitting options.
+
+        Returns
+        -------
+        bool
+            Whether both are in the store.
+
+        """
+        keys = (f"content:{document_type}:{document_hash}", f"spans:{key}")
+        with self._lock:
+            cursor = self._database.connect().execute(
+                "UPDATE revisions SET accessed = ? WHERE key IN (?, ?)", (time.time(), *keys)
+            )
+        return cursor.rowcount == len(keys)
+
+    def _get(self, key: str):
+        with self._lock:
+            connection = self._database.connect()
+            row = connection.execute("SELECT value FROM revisions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE revisions SET accessed = ? WHERE key = ?", (time.time(), key))
+        return json.loads(zlib.decompress(row[0]))
+
+    def _put(self, key: str, value):
+        compressed = zlib.compress(json.dumps(value).encode(), 1)
+        with self._lock:
+            connection = self._database.connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO revisions (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, compressed, len(compressed), time.time()),
+            )
+            if self.max_size <= 0:
+                return
+            (total_size,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM revisions").fetchone()
+            for evicted_key, size in connection.execute("SELECT key, size FROM revisions ORDER BY accessed"):
+                if total_size <= self.max_size:
+                    break
+                connection.execute("DELETE FROM revisions WHERE key = ?", (evicted_key,))
+                total_size -= size
+
+
+def diff_units(previous_units: list[str], units: list[str]) -> list[tuple[int, int, int, int]]:
+    """Find the changed regions between two versions of a text cut into units.
+
+    The common units at both ends are skipped before the remaining units
+    are compared, so that small edits of long documents are cheap to find.
+
+    Parameters
+    ----------
+    previous_units : list[str]
+        The units of the previous version, such as its lines or slides.
+    units : list[str]
+        The units of the revision.
+
+    Returns
+    -------
+    list[tuple[int, int, int, int]]
+        The start and end offset of each changed region in the text of the
+        previous version, followed by its start and end offset in the text
+        of the revision.
+
+    """
+    prefix = 0
+    for previous_unit, unit in zip(previous_units, units):
+        if previous_unit != unit:
+            break
+        prefix += 1
+    suffix = 0
+    for previous_unit, unit in zip(reversed(previous_units[prefix:]), reversed(units[prefix:])):
+        if previous_unit != unit:
+            break
+        suffix += 1
+
+    previous_offsets = list(itertools.accumulate(map(len, previous_units), initial=0))
+    offsets = list(itertools.accumulate(map(len, units), initial=0))
+    matcher = difflib.SequenceMatcher(
+        None, previous_units[prefix : len(previous_units) - suffix], units[prefix : len(units) - suffix]
+    )
+    return [
+        (
+            previous_offsets[prefix + previous_start],
+            previous_offsets[prefix + previous_end],
+            offsets[prefix + start],
+            offsets[prefix + end],
+        )
+        for tag, previous_start, previous_end, start, end in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def plan_regions(
+    spans: list[list[int]], edits: list[tuple[int, int, int, int]], expand: bool
+) -> tuple[list[Region], set[int]]:
+    """Plan the regions of a revision to split again.
+
+    Parameters
+    ----------
+    spans : list[list[int]]
+        The [start, end] offsets of the chunks of the previous version.
+    edits : list[tuple[int, int, int, int]]
+        The changed regions found by ``diff_units``.
+    expand : bool
+        Whether to extend each region to the chunks of the previous version
+        it touches, so that they are split again as a whole. Otherwise only
+        the chunks overlapping a changed region are affected, which suits
+        units split on their own like slides.
+
+    Returns
+    -------
+    tuple[list[Region], set[int]]
+        The regions, in order, and the indices of the chunks of the previous
+        version that they replace.
+
+    """
+    starts = [start for start, _ in spans]
+    # Chunk ends are not sorted when a chunk is stripped shorter than the previous one
+    max_ends = list(itertools.accumulate((end for _, end in spans), max))
+    affected = set()
+    intervals = []
+    for edit in edits:
+        previous_start, previous_end = edit[:2]
+        if expand:
+            candidates = range(bisect_left(max_ends, previous_start), bisect_right(starts, previous_end))
+            touched = [index for index in candidates if spans[index][1] >= previous_start]
+        else:
+            candidates = range(bisect_right(max_ends, previous_start), bisect_left(starts, previous_end))
+            touched = [index for index in candidates if spans[index][1] > previous_start]
+        affected.update(touched)
+        low, high = previous_start, previous_end
+        if expand and touched:
+            low = min(low, spans[touched[0]][0])
+            high = max(high, max(spans[index][1] for index in touched))
+        if intervals and low <= intervals[-1][1]:
+            intervals[-1][1] = max(intervals[-1][1], high)
+            intervals[-1][2].append(edit)
+        else:
+            intervals.append([low, high, [edit]])
+
+    regions = []
+    shift = 0
+    for low, high, region_edits in intervals:
+        region_shift = sum((edit[3] - edit[2]) - (edit[1] - edit[0]) for edit in region_edits)
+        regions.append(Region(low, high, low + shift, high + shift + region_shift))
+        shift += region_shift
+    return regions, affected
+
+
+_revision_store: RevisionStore | None = None
+
+
+def get_revision_store() -> RevisionStore:
+    """Get the revision store of the current process, creating it on first use.
+
+    Returns
+    -------
+    RevisionStore
+        The store configured from ``CONFIG``.
+
+    """
+    global _revision_store
+    if _revision_store is None:
+        _revision_store = RevisionStore(
+            directory=CONFIG.revision_store_directory, max_size=CONFIG.revision_store_max_size
+        )
+    return _revision_store
@@ -0,0 +1,98 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for streaming chunks to the client as they are produced."""
+
+import json
+from typing import Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+STREAM_MEDIA_TYPES = (NDJSON_MEDIA_TYPE, EVENT_STREAM_MEDIA_TYPE)
+
+
+def get_stream_media_type(accept: str | None) -> str | None:
+    """Get the streaming media type requested in an ``Accept`` header.
+
+    Parameters
+    ----------
+    accept : str | None
+        The value of the ``Accept`` header.
+
+    Returns
+    -------
+    str | None
+        ``application/x-ndjson`` or ``text/event-stream`` if the client
+        accepts one of them, otherwise ``None``.
+
+    """
+    if not accept:
+        return None
+    for media_range in accept.split(","):
+        media_type = media_range.split(";")[0].strip().lower()
+        if media_type in STREAM_MEDIA_TYPES:
+            return media_type
+    return None
+
+
+def _encode_ndjson(chunks: Iterable[dict]) -> Iterator[str]:
+    """Encode each chunk as one JSON object per line."""
+    for index, chunk in enumerate(chunks):
+        yield json.dumps({"index": index, **chunk}) + "\n"
+
+
+def _encode_event_stream(chunks: Iterable[dict]) -> Iterator[str]:
+    """Encode each chunk as a server-sent event, followed by a final ``done`` event."""
+    count = 0
+    for index, chunk in enumerate(chunks):
+        yield f"event: chunk\ndata: {json.dumps({'index': index, **chunk})}\n\n"
+        count += 1
+    yield f"event: done\ndata: {json.dumps({'count': count})}\n\n"
+
+
+def stream_chunks(chunks: Iterable[dict], media_type: str) -> StreamingResponse:
+    """Create a response that sends the chunks as soon as they are produced.
+
+    The chunks are consumed in a thread pool by Starlette, so a lazy
+    splitter never blocks the event loop.
+
+    Parameters
+    ----------
+    chunks : Iterable[dict]
+        The text chunks under 'chunk' with their metadata, typically
+        from a generator.
+    media_type : str
+        ``application/x-ndjson`` or ``text/event-stream``.
+
+    Returns
+    -------
+    StreamingResponse
+        The streaming response.
+
+    """
+    if media_type == EVENT_STREAM_MEDIA_TYPE:
+        return StreamingResponse(
+            _encode_event_stream(chunks), media_type=media_type, headers={"Cache-Control": "no-cache"}
+        )
+    return StreamingResponse(_encode_ndjson(chunks), media_type=media_type)
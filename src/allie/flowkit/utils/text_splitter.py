@@ -0,0 +1,211 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for splitting text into chunks recursively on a list of separators.
+
+The splitter follows the semantics of the langchain
+``RecursiveCharacterTextSplitter`` with separators kept at the start of
+each split, but works on character offsets into the original text: splits
+are never copied or joined, and the text of a chunk is only sliced once it
+is final.
+
+"""
+
+import functools
+import re
+from typing import Callable
+
+# Separators of plain text and of Python code, from the coarsest to the finest
+TEXT_SEPARATORS = ("\n\n", "\n", " ", "")
+PYTHON_SEPARATORS = ("\nclass ", "\ndef ", "\n\tdef ", "\n\n", "\n", " ", "")
+
+
+@functools.lru_cache(maxsize=None)
+def compile_separators(separators: tuple[str, ...]) -> tuple[re.Pattern | None, ...]:
+    """Compile separators into patterns, once per process.
+
+    Parameters
+    ----------
+    separators : tuple[str, ...]
+        The separators, from the coarsest to the finest. The empty separator
+        splits between every character.
+
+    Returns
+    -------
+    tuple[re.Pattern | None, ...]
+        The pattern of each separator, or ``None`` for the empty separator.
+
+    """
+    return tuple(re.compile(re.escape(separator)) if separator else None for separator in separators)
+
+
+class RecursiveTextSplitter:
+    """Split text into chunks on the coarsest separator that fits the chunk size.
+
+    The text is split on the first separator it contains. Consecutive
+    splits shorter than the chunk size are merged into chunks, with the last
+    splits of a chunk repeated at the start of the next one up to the chunk
+    overlap. Splits that are too long are split again on the next separators.
+    Chunks are stripped of surrounding whitespace.
+
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int,
+        separators: tuple[str, ...] = TEXT_SEPARATORS,
+        length_function: Callable[[str], int] | None = None,
+    ):
+        """Initialize the splitter.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The maximum length of a chunk.
+        chunk_overlap : int
+            The maximum length of text shared by consecutive chunks.
+        separators : tuple[str, ...]
+            The separators, from the coarsest to the finest.
+        length_function : Callable[[str], int] | None
+            The function measuring the length of a text. ``None`` measures it
+            in characters, without slicing the text.
+
+        Raises
+        ------
+        ValueError
+            If the chunk size is not positive or the chunk overlap is negative
+            or larger than the chunk size.
+
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+        if chunk_overlap < 0:
+            raise ValueError(f"chunk_overlap must be >= 0, got {chunk_overlap}")
+        if chunk_overlap > chunk_size:
+            raise ValueError(f"Got a larger chunk overlap ({chunk_overlap}) than chunk size ({chunk_size})")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.length_function = length_function
+        self._patterns = compile_separators(tuple(separators))
+
+    def split_text(self, text: str) -> list[str]:
+        """Split text into chunks.
+
+        Parameters
+        ----------
+        text : str
+            The text to split.
+
+        Returns
+        -------
+        list[str]
+            The chunks, in text order.
+
+        """
+        return [text[start:end] for start, end in self.split_spans(text)]
+
+    def split_spans(self, text: str) -> list[tuple[int, int]]:
+        """Split text into chunks and return their offsets.
+
+        Parameters
+        ----------
+        text : str
+            The text to split.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The start and end offset of each chunk in the text, in text order.
+
+        """
+        spans = []
+        self._split(text, 0, len(text), 0, spans)
+        return spans
+
+    def _split(self, text: str, start: int, end: int, level: int, spans: list[tuple[int, int]]):
+        # Find the first separator the text contains. Without one, the text
+        # is split on the last separator and its splits are not split again.
+        patterns = self._patterns
+        pattern = patterns[-1]
+        next_level = len(patterns)
+        for index in range(level, len(patterns)):
+            if patterns[index] is None:
+                pattern = None
+                break
+            if patterns[index].search(text, start, end):
+                pattern = patterns[index]
+                next_level = index + 1
+                break
+
+        # Splits start at each separator occurrence, so they are contiguous
+        # and split i spans from bounds[i] to bounds[i + 1]
+        if pattern is None:
+            bounds = list(range(start, end + 1))
+        else:
+            bounds = [start, *(match.start() for match in pattern.finditer(text, start, end)), end]
+            bounds = [bound for bound, next_bound in zip(bounds, bounds[1:]) if next_bound > bound] + [end]
+        if self.length_function is None:
+            lengths = [next_bound - bound for bound, next_bound in zip(bounds, bounds[1:])]
+        else:
+            lengths = [self.length_function(text[bound:next_bound]) for bound, next_bound in zip(bounds, bounds[1:])]
+
+        first = 0
+        for index, length in enumerate(lengths):
+            if length < self.chunk_size:
+                continue
+            if first < index:
+                self._merge(text, bounds, lengths, first, index, spans)
+            if next_level < len(patterns):
+                self._split(text, bounds[index], bounds[index + 1], next_level, spans)
+            else:
+                spans.append((bounds[index], bounds[index + 1]))
+            first = index + 1
+        if first < len(lengths):
+            self._merge(text, bounds, lengths, first, len(lengths), spans)
+
+    def _merge(self, text: str, bounds: list[int], lengths: list[int], first: int, stop: int, spans: list):
+        # Merge splits first to stop - 1 with a sliding window of splits
+        # low to high - 1, which spans from bounds[low] to bounds[high]
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        low = first
+        total = 0
+        for high in range(first, stop):
+            length = lengths[high]
+            if total + length > chunk_size and low < high:
+                self._add_chunk(text, bounds[low], bounds[high], spans)
+                while total > chunk_overlap or (total + length > chunk_size and total > 0):
+                    total -= lengths[low]
+                    low += 1
+            total += length
+        if low < stop:
+            self._add_chunk(text, bounds[low], bounds[stop], spans)
+
+    @staticmethod
+    def _add_chunk(text: str, start: int, end: int, spans: list[tuple[int, int]]):
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            spans.append((start, end))
@@ -0,0 +1,164 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for counting tokens with a tokenizer loaded from a local vocabulary file."""
+
+import functools
+from pathlib import Path
+import re
+import unicodedata
+
+from allie.flowkit.config._config import CONFIG
+
+UNKNOWN_TOKEN = "[UNK]"
+MAX_WORD_CHARACTERS = 100
+WORD_CACHE_SIZE = 65536
+SEGMENT_CACHE_SIZE = 8192
+
+# CJK ideographs are tokens on their own, like in the BERT basic tokenizer
+CJK_RANGES = (
+    "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+    "\U00020000-\U0002a6df\U0002a700-\U0002b73f\U0002b740-\U0002b81f\U0002b820-\U0002ceaf\U0002f800-\U0002fa1f"
+)
+PRE_TOKEN_PATTERN = re.compile(rf"[{CJK_RANGES}]|[^\W_{CJK_RANGES}]+|\S")
+
+
+class WordPieceTokenizer:
+    """WordPiece tokenizer, as used by BERT-style embedding models.
+
+    Text is split into words, punctuation marks, and CJK ideographs, then
+    each word is split greedily into the longest pieces of the vocabulary.
+    Token counts are memoized per word and per segment, so that counting
+    the many overlapping segments of a recursive split stays cheap.
+
+    """
+
+    def __init__(self, vocabulary: set[str], lowercase: bool = True):
+        """Initialize the tokenizer.
+
+        Parameters
+        ----------
+        vocabulary : set[str]
+            The tokens of the vocabulary. Word continuations start with '##'.
+        lowercase : bool
+            Whether to lowercase and strip accents before tokenizing, for
+            uncased models.
+
+        """
+        self.vocabulary = vocabulary
+        self.lowercase = lowercase
+        self._count_word = functools.lru_cache(maxsize=WORD_CACHE_SIZE)(self._count_word_pieces)
+        self.count_tokens = functools.lru_cache(maxsize=SEGMENT_CACHE_SIZE)(self._count_tokens)
+
+    @classmethod
+    def from_file(cls, path: str, lowercase: bool = True) -> "WordPieceTokenizer":
+        """Load a tokenizer from a vocabulary file with one token per line.
+
+        Parameters
+        ----------
+        path : str
+            The path of the vocabulary file, such as the 'vocab.txt' of a
+            BERT-style model.
+        lowercase : bool
+            Whether to lowercase and strip accents before tokenizing.
+
+        Returns
+        -------
+        WordPieceTokenizer
+            The tokenizer.
+
+        """
+        with Path(path).open("r", encoding="utf-8") as file:
+            vocabulary = {line.rstrip("\n") for line in file if line.strip()}
+        return cls(vocabulary, lowercase)
+
+    def normalize(self, text: str) -> str:
+        """Lowercase the text and strip its accents for uncased models."""
+        if not self.lowercase:
+            return text
+        text = unicodedata.normalize("NFD", text.lower())
+        return "".join(character for character in text if unicodedata.category(character) != "Mn")
+
+    def tokenize(self, text: str) -> list[str]:
+        """Split text into the tokens of the vocabulary.
+
+        Parameters
+        ----------
+        text : str
+            The text to tokenize.
+
+        Returns
+        -------
+        list[str]
+            The tokens.
+
+        """
+        return [piece for word in PRE_TOKEN_PATTERN.findall(self.normalize(text)) for piece in self._word_pieces(word)]
+
+    def _count_tokens(self, text: str) -> int:
+        return sum(self._count_word(word) for word in PRE_TOKEN_PATTERN.findall(self.normalize(text)))
+
+    def _count_word_pieces(self, word: str) -> int:
+        return len(self._word_pieces(word))
+
+    def _word_pieces(self, word: str) -> list[str]:
+        if len(word) > MAX_WORD_CHARACTERS:
+            return [UNKNOWN_TOKEN]
+        pieces = []
+        start = 0
+        while start < len(word):
+            for end in range(len(word), start, -1):
+                piece = word[start:end] if start == 0 else f"##{word[start:end]}"
+                if piece in self.vocabulary:
+                    break
+            else:
+                return [UNKNOWN_TOKEN]
+            pieces.append(piece)
+            start = end
+        return pieces
+
+
+_tokenizer: WordPieceTokenizer | None = None
+
+
+def get_tokenizer() -> WordPieceTokenizer:
+    """Get the tokenizer of the current process, loading it on first use.
+
+    Returns
+    -------
+    WordPieceTokenizer
+        The tokenizer loaded from ``CONFIG.tokenizer_vocabulary_file``.
+
+    Raises
+    ------
+    ValueError
+        If no vocabulary file is configured.
+    OSError
+        If the vocabulary file cannot be read.
+
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        if not CONFIG.tokenizer_vocabulary_file:
+            raise ValueError("TOKENIZER_VOCABULARY_FILE is missing in the configuration file.")
+        _tokenizer = WordPieceTokenizer.from_file(CONFIG.tokenizer_vocabulary_file, CONFIG.tokenizer_lowercase)
+    return _tokenizer
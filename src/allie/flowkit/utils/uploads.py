@@ -0,0 +1,311 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for receiving raw and multipart document uploads."""
+
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+import io
+from pathlib import Path
+import tempfile
+from typing import AsyncIterator, BinaryIO, Iterator
+
+from allie.flowkit.config._config import CONFIG
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# Bytes of a spooled body written to disk at once
+UPLOAD_READ_SIZE = 1024 * 1024
+UPLOAD_FILE_FIELD = "file"
+# Maximum size of the fields of a multipart body other than the document, like Starlette
+MAX_FORM_FIELD_SIZE = 1024 * 1024
+
+
+@dataclass
+class UploadedDocument:
+    """A document received in the body of an upload request.
+
+    Attributes
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file it was spooled to.
+    size : int
+        The size of the document in bytes.
+    parameters : dict[str, str]
+        The query string parameters, updated with the form fields.
+
+    """
+
+    document: bytes | Path
+    size: int
+    parameters: dict[str, str]
+
+
+def open_document(document: bytes | Path) -> BinaryIO:
+    """Open a document held in memory or spooled to disk as a binary stream.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file it was spooled to.
+
+    Returns
+    -------
+    BinaryIO
+        A binary stream over the document.
+
+    """
+    if isinstance(document, Path):
+        return document.open("rb")
+    return io.BytesIO(document)
+
+
+def read_document(document: bytes | Path) -> bytes:
+    """Read the content of a document held in memory or spooled to disk.
+
+    Parameters
+    ----------
+    document : bytes | Path
+        The document content, or the path of the file it was spooled to.
+
+    Returns
+    -------
+    bytes
+        The document content.
+
+    """
+    if isinstance(document, Path):
+        return document.read_bytes()
+    return document
+
+
+@contextmanager
+def spool_document(document: bytes, prefix: str) -> Iterator[Path]:
+    """Write a document held in memory to a temporary file that other processes can open.
+
+    The file is closed before it is used and removed when the context exits,
+    since an open temporary file cannot be opened again on Windows.
+
+    Parameters
+    ----------
+    document : bytes
+        The document content.
+    prefix : str
+        The prefix of the name of the temporary file.
+
+    Yields
+    ------
+    Path
+        The path of the temporary file.
+
+    """
+    with tempfile.NamedTemporaryFile(prefix=prefix, dir=CONFIG.upload_spool_directory or None, delete=False) as file:
+        path = Path(file.name)
+        file.write(document)
+    try:
+        yield path
+    finally:
+        path.unlink(missing_ok=True)
+
+
+class _Spool:
+    """Accumulate a body in memory and move it to disk past the size limit.
+
+    Once on disk, the body is written in batches in the thread pool, so
+    that the event loop never waits for the disk.
+
+    """
+
+    def __init__(self):
+        self.size = 0
+        self._parts: list[bytes] = []
+        self._buffered_size = 0
+        self._file = None
+
+    async def write(self, data: bytes):
+        self.size += len(data)
+        self._parts.append(data)
+        self._buffered_size += len(data)
+        if self._file is None and self.size > CONFIG.upload_spool_max_size:
+            self._file = await run_in_threadpool(
+                tempfile.NamedTemporaryFile,
+                prefix="allie-upload-",
+                dir=CONFIG.upload_spool_directory or None,
+                delete=False,
+            )
+        if self._file is not None and self._buffered_size >= UPLOAD_READ_SIZE:
+            await self._flush()
+
+    async def document(self) -> bytes | Path:
+        if self._file is not None:
+            await self._flush()
+            await run_in_threadpool(self._file.flush)
+            return Path(self._file.name)
+        return b"".join(self._parts)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            Path(self._file.name).unlink(missing_ok=True)
+
+    async def _flush(self):
+        parts, self._parts, self._buffered_size = self._parts, [], 0
+        await run_in_threadpool(self._file.writelines, parts)
+
+
+class _MultipartReceiver:
+    """Parse a multipart body as it arrives, writing the document in the 'file' field to a spool.
+
+    The document is not spooled again by Starlette, as it would be when the
+    body is read with ``Request.form``. The other fields are decoded as text.
+
+    """
+
+    def __init__(self, content_type: str, spool: _Spool):
+        _, options = parse_options_header(content_type)
+        if b"boundary" not in options:
+            raise HTTPException(status_code=400, detail="Missing boundary in multipart body")
+        charset = options.get(b"charset", b"utf-8")
+        self.charset = charset.decode("latin-1") if isinstance(charset, bytes) else charset
+        self.spool = spool
+        self.fields: dict[str, str] = {}
+        self.has_document = False
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._field_name = ""
+        self._field_data = bytearray()
+        self._in_document = False
+        self._document_parts: list[bytes] = []
+        callbacks = {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+        self._parser = MultipartParser(options[b"boundary"], callbacks)
+
+    async def write(self, data: bytes):
+        try:
+            self._parser.write(data)
+        except MultipartParseError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid multipart body: {str(e)}")
+        # The parser callbacks are synchronous, so the document is spooled after each piece of the body
+        parts, self._document_parts = self._document_parts, []
+        for part in parts:
+            await self.spool.write(part)
+
+    def finalize(self):
+        try:
+            self._parser.finalize()
+        except MultipartParseError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid multipart body: {str(e)}")
+
+    def on_part_begin(self):
+        self._disposition = b""
+        self._field_data = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        if b"name" not in options:
+            raise HTTPException(status_code=400, detail="Missing field name in multipart body")
+        self._field_name = options[b"name"].decode(self.charset, errors="replace")
+        # Like Starlette, only a part with a file name is a file
+        self._in_document = self._field_name == UPLOAD_FILE_FIELD and b"filename" in options
+        if self._in_document:
+            if self.has_document:
+                raise HTTPException(status_code=400, detail=f"Several '{UPLOAD_FILE_FIELD}' fields in multipart body")
+            self.has_document = True
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_document:
+            self._document_parts.append(data[start:end])
+            return
+        if len(self._field_data) + end - start > MAX_FORM_FIELD_SIZE:
+            raise HTTPException(status_code=400, detail=f"Multipart field '{self._field_name}' is too large")
+        self._field_data += data[start:end]
+
+    def on_part_end(self):
+        if not self._in_document:
+            self.fields[self._field_name] = self._field_data.decode(self.charset, errors="replace")
+
+
+@asynccontextmanager
+async def receive_upload(request: Request) -> AsyncIterator[UploadedDocument]:
+    """Receive the document of a raw or multipart upload request.
+
+    Bodies larger than ``CONFIG.upload_spool_max_size`` bytes are spooled to a
+    temporary file that is removed when the context exits, so only about one
+    copy of the document is ever held in memory. Multipart bodies are parsed
+    as they arrive, so the document is spooled only once.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming request. A ``multipart/form-data`` body must contain the
+        document in the ``file`` field, and its other fields are added to the
+        query string parameters. Any other body is taken as the raw document.
+
+    Yields
+    ------
+    UploadedDocument
+        The received document and its parameters.
+
+    """
+    spool = _Spool()
+    parameters = dict(request.query_params)
+    try:
+        content_type = request.headers.get("content-type", "")
+        if content_type.startswith("multipart/form-data"):
+            receiver = _MultipartReceiver(content_type, spool)
+            async for data in request.stream():
+                if data:
+                    await receiver.write(data)
+            receiver.finalize()
+            if not receiver.has_document:
+                raise HTTPException(status_code=400, detail=f"No '{UPLOAD_FILE_FIELD}' field in multipart body")
+            parameters.update(receiver.fields)
+        else:
+            async for data in request.stream():
+                if data:
+                    await spool.write(data)
+
+        yield UploadedDocument(document=await spool.document(), size=spool.size, parameters=parameters)
+    finally:
+        spool.close()
@@ -0,0 +1,103 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Benchmark of the import and boot time of the service.
+
+Each measurement runs in a fresh interpreter, like a new worker process.
+Run it from the repository root with::
+
+    python -m tests.benchmarks.bench_boot --runs 10
+
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# Statement that boots the service like a worker does: import it and run its startup
+BOOT_STATEMENT = (
+    "from fastapi.testclient import TestClient; "
+    "from allie.flowkit import flowkit_service; "
+    "TestClient(flowkit_service).__enter__()"
+)
+
+
+def measure_import(module: str = "allie.flowkit") -> tuple[float, dict[str, float]]:
+    """Import a module in a fresh interpreter with ``-X importtime``.
+
+    Parameters
+    ----------
+    module : str
+        The module to import.
+
+    Returns
+    -------
+    tuple[float, dict[str, float]]
+        The cumulative import time of the module in seconds, and the
+        cumulative import time of every module it imported.
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        import_times[name.strip()] = int(cumulative) / 1e6
+    return import_times[module], import_times
+
+
+def measure_boot() -> float:
+    """Boot the service in a fresh interpreter and return the wall time in seconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", BOOT_STATEMENT], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print the median times and the slowest imports."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest top-level imports to list")
+    args = parser.parse_args()
+
+    import_time = statistics.median(measure_import()[0] for _ in range(args.runs))
+    boot_time = statistics.median(measure_boot() for _ in range(args.runs))
+    print(f"import allie.flowkit: {import_time * 1000:.0f} ms (median of {args.runs})")
+    print(f"boot until ready:     {boot_time * 1000:.0f} ms (median of {args.runs}, with interpreter startup)")
+
+    _, import_times = measure_import()
+    packages = {}
+    for name, cumulative in import_times.items():
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0), cumulative)
+    print("\nslowest packages (cumulative ms):")
+    for package, cumulative in sorted(packages.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {package:<24} {cumulative * 1000:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Benchmark of building and encoding splitter responses with many chunks.
+
+It compares FastAPI's default path for a returned model, which validates it
+against the response model and converts it with ``jsonable_encoder`` before
+encoding it with the standard library, pydantic's ``model_dump_json``, and
+``FastJSONResponse`` with and without the validation of the built model.
+Run it from the repository root with::
+
+    python -m tests.benchmarks.bench_json_response --chunks 1000 10000 50000
+
+"""
+
+import argparse
+import time
+from unittest.mock import patch
+
+from allie.flowkit.fastapi_utils import FastJSONResponse, build_model
+from allie.flowkit.models.splitter import SplitterResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from tests.benchmarks.corpus import make_text
+
+
+def fastapi_default(chunks: list[str], page_numbers: list[int]) -> bytes:
+    """Build, validate, and encode a response like FastAPI does for a returned model."""
+    response = SplitterResponse(chunks=chunks, page_numbers=page_numbers)
+    validated = SplitterResponse.model_validate(response.model_dump())
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def pydantic_json(chunks: list[str], page_numbers: list[int]) -> bytes:
+    """Build a response and encode it with pydantic."""
+    return SplitterResponse(chunks=chunks, page_numbers=page_numbers).model_dump_json().encode()
+
+
+def fast_json(chunks: list[str], page_numbers: list[int]) -> bytes:
+    """Build a response, validated or not depending on the configuration, and encode it with orjson."""
+    return FastJSONResponse(build_model(SplitterResponse, chunks=chunks, page_numbers=page_numbers)).body
+
+
+def best_time(func, *args, repeat: int) -> float:
+    """Return the best wall time of a function over several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark and print a table of timings."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--chunk-length", type=int, default=2000, help="Characters of each chunk")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_text(args.chunk_length * 100)
+    print(
+        f"{'chunks':>7} {'fastapi (ms)':>13} {'pydantic (ms)':>14} {'orjson (ms)':>12} "
+        f"{'no validation (ms)':>19} {'speed-up':>9}"
+    )
+    for chunk_count in args.chunks:
+        chunks = [
+            text[start : start + args.chunk_length]
+            for start in (index % 99 * args.chunk_length for index in range(chunk_count))
+        ]
+        page_numbers = [index // 20 + 1 for index in range(chunk_count)]
+        default_time = best_time(fastapi_default, chunks, page_numbers, repeat=args.repeat)
+        pydantic_time = best_time(pydantic_json, chunks, page_numbers, repeat=args.repeat)
+        with patch("allie.flowkit.config.CONFIG.validate_responses", True):
+            fast_time = best_time(fast_json, chunks, page_numbers, repeat=args.repeat)
+        with patch("allie.flowkit.config.CONFIG.validate_responses", False):
+            unvalidated_time = best_time(fast_json, chunks, page_numbers, repeat=args.repeat)
+        print(
+            f"{chunk_count:>7} {default_time * 1000:>13.1f} {pydantic_time * 1000:>14.1f} {fast_time * 1000:>12.1f} "
+            f"{unvalidated_time * 1000:>19.1f} {default_time / unvalidated_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
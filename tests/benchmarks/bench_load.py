@@ -0,0 +1,159 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""End-to-end load test of the splitter endpoints through the ASGI application, in process.
+
+Concurrent clients post documents of the synthetic corpus to the splitter
+endpoints of the service, with its middlewares and startup, without a
+network or a server in between. The chunk cache is disabled unless asked
+for, so that every request splits its document. Run it from the
+repository root with::
+
+    python -m tests.benchmarks.bench_load --types pdf ppt py --size 64K --requests 200 --concurrency 8
+
+"""
+
+import argparse
+import asyncio
+import base64
+from pathlib import Path
+import statistics
+import time
+from unittest.mock import patch
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.config._config import CONFIG
+from allie.flowkit.utils.cache import ChunkCache
+from allie.flowkit.utils.executor import EXECUTION_MODES
+import httpx
+
+from tests.benchmarks.corpus import DOCUMENT_EXTENSIONS, make_document, parse_size
+from tests.benchmarks.results import format_ratio, load_baseline, percentile, save_results
+
+
+async def run_load(payloads: list[tuple[str, dict]], request_count: int, concurrency: int) -> dict:
+    """Post splitter requests with concurrent clients and measure their latency.
+
+    Parameters
+    ----------
+    payloads : list[tuple[str, dict]]
+        The endpoint path and JSON body of each request, sent in turn.
+    request_count : int
+        The total number of requests.
+    concurrency : int
+        The number of clients sending requests at once.
+
+    Returns
+    -------
+    dict
+        The latency percentiles in seconds, the documents split per second,
+        and the number of failed requests.
+
+    """
+    latencies = []
+    failures = 0
+    next_request = iter(range(request_count))
+    headers = {"api-key": CONFIG.flowkit_python_api_key}
+
+    async def send_requests(client: httpx.AsyncClient):
+        nonlocal failures
+        for index in next_request:
+            path, payload = payloads[index % len(payloads)]
+            start = time.perf_counter()
+            response = await client.post(path, json=payload, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            failures += response.status_code != 200
+
+    transport = httpx.ASGITransport(app=flowkit_service)
+    async with flowkit_service.router.lifespan_context(flowkit_service):
+        async with httpx.AsyncClient(transport=transport, base_url="http://flowkit", timeout=None) as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(send_requests(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "mean": statistics.mean(latencies),
+        "docs_per_second": request_count / elapsed,
+        "failures": failures,
+    }
+
+
+def main():
+    """Run the load test and print the latency percentiles and the throughput."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--types", nargs="+", default=list(DOCUMENT_EXTENSIONS), choices=list(DOCUMENT_EXTENSIONS))
+    parser.add_argument("--size", default="64K", help="Document size such as 16K or 1M")
+    parser.add_argument("--documents", type=int, default=4, help="Distinct documents of each type")
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8], help="Concurrent clients of each run")
+    parser.add_argument("--execution-mode", choices=EXECUTION_MODES, default=CONFIG.splitter_execution_mode)
+    parser.add_argument("--chunk-size", type=int, default=500, help="Chunk size in tokens")
+    parser.add_argument("--chunk-overlap", type=int, default=50, help="Chunk overlap in tokens")
+    parser.add_argument("--cache", action="store_true", help="Keep the configured chunk cache")
+    parser.add_argument("--output", type=Path, help="JSON file to save the results to")
+    parser.add_argument("--baseline", type=Path, help="JSON file of a previous run to compare with")
+    args = parser.parse_args()
+
+    payloads = [
+        (
+            f"/splitter/{document_type}",
+            {
+                "document_content": base64.b64encode(
+                    make_document(document_type, parse_size(args.size), seed)
+                ).decode(),
+                "chunk_size": args.chunk_size,
+                "chunk_overlap": args.chunk_overlap,
+            },
+        )
+        for seed in range(args.documents)
+        for document_type in args.types
+    ]
+
+    baseline = load_baseline(args.baseline, ("concurrency",))
+    rows = []
+    print(f"{args.requests} requests of {args.size} {'/'.join(args.types)} documents, {args.execution_mode} execution")
+    print(
+        f"{'clients':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'docs/s':>8} {'failed':>7} {'p95 ratio':>10}"
+    )
+    chunk_cache = None if args.cache else ChunkCache(max_size=0)
+    with (
+        patch("allie.flowkit.config.CONFIG.splitter_execution_mode", args.execution_mode),
+        patch("allie.flowkit.utils.cache._chunk_cache", chunk_cache),
+    ):
+        for concurrency in args.concurrency:
+            result = asyncio.run(run_load(payloads, args.requests, concurrency))
+            rows.append({"concurrency": concurrency, "size": args.size, "types": args.types, **result})
+            ratio = format_ratio(result["p95"], baseline.get((concurrency,)), "p95")
+            print(
+                f"{concurrency:>7} {result['p50'] * 1000:>9.1f} {result['p95'] * 1000:>9.1f} "
+                f"{result['p99'] * 1000:>9.1f} {result['docs_per_second']:>8.1f} {result['failures']:>7} {ratio:>10}"
+            )
+
+    if args.output:
+        save_results(args.output, "load", rows)
+
+
+if __name__ == "__main__":
+    main()
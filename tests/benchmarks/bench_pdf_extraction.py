@@ -0,0 +1,76 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Benchmark of page-parallel PDF extraction against sequential extraction.
+
+Run it from the repository root with::
+
+    python -m tests.benchmarks.bench_pdf_extraction --pages 10 50 100 200 --partition-size 10
+
+"""
+
+import argparse
+import io
+import os
+import time
+
+from allie.flowkit.utils.executor import get_extraction_pool, shutdown_process_pool
+from allie.flowkit.utils.pdf import extract_pdf_text_parallel
+from pdfminer.high_level import extract_text
+
+from tests.benchmarks.corpus import make_pdf
+
+
+def measure(func, *args, repeat: int = 1) -> float:
+    """Measure the best wall time of a function over several runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Run the benchmark and print a table of timings."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--partition-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    pool = get_extraction_pool()
+    # Start the worker processes before timing
+    list(pool.map(abs, range(os.cpu_count() or 1)))
+
+    print(f"{'pages':>6} {'sequential (s)':>15} {'parallel (s)':>13} {'speed-up':>9}")
+    for page_count in args.pages:
+        document = make_pdf(page_count)
+        sequential = measure(lambda: extract_text(io.BytesIO(document)), repeat=args.repeat)
+        parallel = measure(extract_pdf_text_parallel, document, page_count, args.partition_size, repeat=args.repeat)
+        print(f"{page_count:>6} {sequential:>15.3f} {parallel:>13.3f} {sequential / parallel:>8.2f}x")
+
+    shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    main()
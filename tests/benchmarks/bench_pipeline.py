@@ -0,0 +1,152 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Micro-benchmarks of the splitter pipeline, stage by stage, for every document type.
+
+Each document of the synthetic corpus is split with the chunk cache
+disabled. The stages are the Base64 decoding, the extraction, the
+splitting, and the serialization of the response, followed by the whole
+``process_*`` function of the document type. Run it from the repository
+root and compare against a previous run with::
+
+    python -m tests.benchmarks.bench_pipeline --sizes 16K 1M --output pipeline.json
+    python -m tests.benchmarks.bench_pipeline --sizes 16K 1M --baseline pipeline.json
+
+"""
+
+import argparse
+import base64
+from pathlib import Path
+import statistics
+import time
+from unittest.mock import patch
+
+from allie.flowkit.endpoints.splitter import (
+    PROCESSORS,
+    decode_document_content,
+    extract_document,
+    iter_document_chunks,
+    serialize_response,
+)
+from allie.flowkit.models.splitter import SplitterRequest
+from allie.flowkit.utils.cache import ChunkCache
+
+from tests.benchmarks.corpus import DOCUMENT_EXTENSIONS, make_document, parse_size
+from tests.benchmarks.results import format_ratio, load_baseline, save_results
+
+STAGES = ("decode", "extract", "split", "serialize", "process")
+
+
+def measure(func, *args, repeat: int) -> tuple[list[float], object]:
+    """Run a function several times and return its wall times and its last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def run_pipeline(document_type: str, document: bytes, request: SplitterRequest, repeat: int) -> dict[str, list[float]]:
+    """Time each stage of the pipeline on a document.
+
+    Parameters
+    ----------
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    document : bytes
+        The document content.
+    request : SplitterRequest
+        The splitter request of the document, with its content in Base64.
+    repeat : int
+        The number of runs of each stage.
+
+    Returns
+    -------
+    dict[str, list[float]]
+        The wall times of each stage.
+
+    """
+    timings = {}
+    timings["decode"], _ = measure(decode_document_content, request, repeat=repeat)
+    timings["extract"], content = measure(extract_document, document, document_type, request, repeat=repeat)
+    timings["split"], _ = measure(lambda: list(iter_document_chunks(content, document_type, request)), repeat=repeat)
+    response = PROCESSORS[document_type](request)
+    timings["serialize"], _ = measure(serialize_response, response, repeat=repeat)
+    timings["process"], _ = measure(PROCESSORS[document_type], request, repeat=repeat)
+    return timings
+
+
+def make_request(document_type: str, size: int, args: argparse.Namespace) -> tuple[bytes, SplitterRequest]:
+    """Make a document of the corpus and its splitter request."""
+    document = make_document(document_type, size)
+    request = SplitterRequest(
+        document_content=base64.b64encode(document), chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap
+    )
+    return document, request
+
+
+def main():
+    """Run the benchmark and print a table of median timings."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--types", nargs="+", default=list(DOCUMENT_EXTENSIONS), choices=list(DOCUMENT_EXTENSIONS))
+    parser.add_argument("--sizes", nargs="+", default=["16K", "256K", "1M"], help="Sizes such as 16K or 1M")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Chunk size in tokens")
+    parser.add_argument("--chunk-overlap", type=int, default=50, help="Chunk overlap in tokens")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="JSON file to save the results to")
+    parser.add_argument("--baseline", type=Path, help="JSON file of a previous run to compare with")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline, ("document_type", "size", "stage"))
+    rows = []
+    print(f"{'type':>4} {'size':>6} {'stage':>9} {'median (ms)':>12} {'min (ms)':>9} {'MiB/s':>8} {'baseline':>9}")
+    # Without the cache, every run splits the document again
+    with patch("allie.flowkit.utils.cache._chunk_cache", ChunkCache(max_size=0)):
+        for document_type in args.types:
+            # Warm up the imports and compiled patterns on a small document
+            run_pipeline(document_type, *make_request(document_type, 1024, args), repeat=1)
+            for size in args.sizes:
+                document, request = make_request(document_type, parse_size(size), args)
+                for stage, timings in run_pipeline(document_type, document, request, args.repeat).items():
+                    median = statistics.median(timings)
+                    row = {
+                        "document_type": document_type,
+                        "size": size,
+                        "bytes": len(document),
+                        "stage": stage,
+                        "median": median,
+                        "min": min(timings),
+                    }
+                    rows.append(row)
+                    ratio = format_ratio(median, baseline.get((document_type, size, stage)), "median")
+                    print(
+                        f"{document_type:>4} {size:>6} {stage:>9} {median * 1000:>12.2f} {min(timings) * 1000:>9.2f} "
+                        f"{len(document) / 1024**2 / median:>8.1f} {ratio:>9}"
+                    )
+
+    if args.output:
+        save_results(args.output, "pipeline", rows)
+
+
+if __name__ == "__main__":
+    main()
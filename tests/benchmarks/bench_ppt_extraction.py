@@ -0,0 +1,80 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Benchmark of the XML PowerPoint extraction backend against python-pptx.
+
+Each measurement runs in a fresh process, so that the peak resident memory
+reported is the one of that extraction alone. Run it from the repository
+root with::
+
+    python -m tests.benchmarks.bench_ppt_extraction --slides 50 200 1000
+
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import resource
+import time
+
+from allie.flowkit.endpoints.splitter import extract_ppt_slides
+from allie.flowkit.models.splitter import SplitterRequest
+
+from tests.benchmarks.corpus import make_pptx
+
+
+def run_extraction(document: bytes, backend: str) -> tuple[float, float]:
+    """Extract a document and return the wall time and the peak memory growth in MiB."""
+    options = SplitterRequest(document_content=b"", chunk_size=1, chunk_overlap=0, ppt_backend=backend)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    extract_ppt_slides(document, options)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (peak - baseline) / 1024
+
+
+def measure(document: bytes, backend: str) -> tuple[float, float]:
+    """Run an extraction in a fresh process."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_extraction, document, backend).result()
+
+
+def main():
+    """Run the benchmark and print a table of timings and memory."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slides", type=int, nargs="+", default=[50, 200, 1000])
+    args = parser.parse_args()
+
+    print(f"{'slides':>6} {'pptx (s)':>9} {'xml (s)':>8} {'speed-up':>9} {'pptx (MiB)':>11} {'xml (MiB)':>10}")
+    for slide_count in args.slides:
+        document = make_pptx(slide_count)
+        pptx_time, pptx_memory = measure(document, "pptx")
+        xml_time, xml_memory = measure(document, "xml")
+        print(
+            f"{slide_count:>6} {pptx_time:>9.3f} {xml_time:>8.3f} {pptx_time / xml_time:>8.1f}x "
+            f"{pptx_memory:>11.1f} {xml_memory:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
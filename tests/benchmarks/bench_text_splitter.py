@@ -0,0 +1,86 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Benchmark of the recursive text splitter against the langchain splitters.
+
+Run it from the repository root with::
+
+    python -m tests.benchmarks.bench_text_splitter --sizes 1 4 16
+
+"""
+
+import argparse
+import time
+
+from allie.flowkit.utils.text_splitter import PYTHON_SEPARATORS, TEXT_SEPARATORS, RecursiveTextSplitter
+from langchain.text_splitter import PythonCodeTextSplitter, RecursiveCharacterTextSplitter
+
+from tests.benchmarks.corpus import make_python_code, make_text
+
+
+def make_flat_text(size: int) -> str:
+    """Make text without line breaks, which is split down to words."""
+    return make_text(size).replace("\n", " ")
+
+
+def best_time(split, text: str, repeat: int) -> tuple[float, list[str]]:
+    """Return the best wall time of splitting a text and the chunks."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = split(text)
+        best = min(best, time.perf_counter() - start)
+    return best, chunks
+
+
+def main():
+    """Run the benchmark and print a table of timings."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16], help="Text sizes in MiB")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Chunk size in characters")
+    parser.add_argument("--chunk-overlap", type=int, default=200, help="Chunk overlap in characters")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = [
+        ("text", make_text, RecursiveCharacterTextSplitter, TEXT_SEPARATORS),
+        ("flat", make_flat_text, RecursiveCharacterTextSplitter, TEXT_SEPARATORS),
+        ("python", make_python_code, PythonCodeTextSplitter, PYTHON_SEPARATORS),
+    ]
+    print(f"{'kind':>6} {'MiB':>4} {'chunks':>7} {'langchain (s)':>14} {'native (s)':>11} {'speed-up':>9}")
+    for kind, make, langchain_class, separators in cases:
+        for size in args.sizes:
+            text = make(size * 1024 * 1024)
+            langchain_splitter = langchain_class(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+            native_splitter = RecursiveTextSplitter(args.chunk_size, args.chunk_overlap, separators)
+            langchain_time, langchain_chunks = best_time(langchain_splitter.split_text, text, args.repeat)
+            native_time, native_chunks = best_time(native_splitter.split_text, text, args.repeat)
+            if native_chunks != langchain_chunks:
+                raise AssertionError(f"Chunks differ from langchain for {kind} text of {size} MiB")
+            print(
+                f"{kind:>6} {size:>4} {len(native_chunks):>7} {langchain_time:>14.3f} {native_time:>11.3f} "
+                f"{langchain_time / native_time:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
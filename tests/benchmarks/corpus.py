@@ -0,0 +1,305 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for generating a deterministic synthetic document corpus.
+
+The same arguments always generate the same documents, so that benchmark
+results are comparable across commits. Write a corpus to disk from the
+repository root with::
+
+    python -m tests.benchmarks.corpus --output .corpus --sizes 16K 1M 16M
+
+"""
+
+import argparse
+import functools
+import io
+from pathlib import Path
+import random
+import re
+import zipfile
+
+from pptx import Presentation
+from pptx.util import Inches
+
+WORDS = (
+    "mesh solver boundary condition element node stress strain thermal fluid structural "
+    "convergence residual iteration material property load step contact geometry simulation "
+    "analysis result displacement pressure velocity temperature turbulence model parameter"
+).split()
+
+
+def make_sentence(rng: random.Random, word_count: int = 12) -> str:
+    """Make a sentence of random simulation words."""
+    return " ".join(rng.choice(WORDS) for _ in range(word_count)).capitalize() + "."
+
+
+def make_text(size: int, seed: int = 0) -> str:
+    """Make plain text of paragraphs of random sentences.
+
+    Parameters
+    ----------
+    size : int
+        The approximate number of characters.
+    seed : int
+        The seed of the random text.
+
+    Returns
+    -------
+    str
+        The text.
+
+    """
+    rng = random.Random(seed)
+    paragraphs = []
+    length = 0
+    while length < size:
+        lines = [" ".join(make_sentence(rng) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        paragraphs.append("\n".join(lines))
+        length += len(paragraphs[-1]) + 2
+    return "\n\n".join(paragraphs)
+
+
+def make_python_code(size: int, seed: int = 0) -> str:
+    """Make Python code of classes and functions with random names.
+
+    Parameters
+    ----------
+    size : int
+        The approximate number of characters.
+    seed : int
+        The seed of the random code.
+
+    Returns
+    -------
+    str
+        The code.
+
+    """
+    rng = random.Random(seed)
+    blocks = []
+    length = 0
+    while length < size:
+        name = "_".join(rng.choice(WORDS) for _ in range(2))
+        body = "\n".join(
+            f"    {rng.choice(WORDS)} = {rng.randint(0, 1000)}  # {make_sentence(rng, 6)}" for _ in range(8)
+        )
+        if rng.random() < 0.3:
+            blocks.append(f"class {name.title().replace('_', '')}:\n    def run(self):\n    {body}\n")
+        else:
+            blocks.append(f"def {name}():\n{body}\n    return {rng.choice(WORDS)}\n")
+        length += len(blocks[-1]) + 1
+    return "\n".join(blocks)
+
+
+def make_pdf(page_count: int, lines_per_page: int = 40, seed: int = 0) -> bytes:
+    """Make a PDF document with text on every page.
+
+    Parameters
+    ----------
+    page_count : int
+        The number of pages.
+    lines_per_page : int
+        The number of text lines on each page.
+    seed : int
+        The seed of the random text.
+
+    Returns
+    -------
+    bytes
+        The PDF document.
+
+    """
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page_number in range(page_count):
+        lines = [f"Page {page_number + 1}"] + [make_sentence(rng) for _ in range(lines_per_page)]
+        text = " T* ".join(f"({line}) Tj" for line in lines)
+        stream = f"BT /F1 9 Tf 11 TL 40 800 Td {text} ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, page_count)
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(pdf)
+
+
+def clear_zip_timestamps(archive: bytes) -> bytes:
+    """Write a ZIP archive again with the same timestamp for every file, so that it does not depend on the time."""
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(archive)) as source, zipfile.ZipFile(output, "w") as target:
+        for info in source.infolist():
+            target.writestr(zipfile.ZipInfo(info.filename), source.read(info), zipfile.ZIP_DEFLATED)
+    return output.getvalue()
+
+
+def make_pptx(slide_count: int, paragraphs_per_slide: int = 5, seed: int = 0) -> bytes:
+    """Make a PowerPoint document with a title and a text box on every slide.
+
+    Parameters
+    ----------
+    slide_count : int
+        The number of slides.
+    paragraphs_per_slide : int
+        The number of paragraphs in the text box of each slide.
+    seed : int
+        The seed of the random text.
+
+    Returns
+    -------
+    bytes
+        The PowerPoint document.
+
+    """
+    rng = random.Random(seed)
+    presentation = Presentation()
+    layout = presentation.slide_layouts[5]
+    for slide_number in range(slide_count):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {slide_number + 1}"
+        text_frame = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(8), Inches(4)).text_frame
+        text_frame.text = make_sentence(rng)
+        for _ in range(paragraphs_per_slide - 1):
+            text_frame.add_paragraph().text = make_sentence(rng)
+    output = io.BytesIO()
+    presentation.save(output)
+    return clear_zip_timestamps(output.getvalue())
+
+
+# Document types of the corpus and their file extensions
+DOCUMENT_EXTENSIONS = {"pdf": "pdf", "ppt": "pptx", "py": "py"}
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(size: str) -> int:
+    """Parse a size in bytes with an optional K, M, or G suffix, such as '16K'."""
+    match = re.fullmatch(r"(\d+)([KMG]?)B?", size.strip().upper())
+    if not match:
+        raise ValueError(f"Invalid size: {size}")
+    return int(match.group(1)) * SIZE_UNITS[match.group(2)]
+
+
+@functools.lru_cache
+def get_unit_sizes(document_type: str) -> tuple[int, int]:
+    """Measure the size of an empty document of a type and the size of each page or slide."""
+    make = make_pdf if document_type == "pdf" else make_pptx
+    one, eleven = len(make(1)), len(make(11))
+    unit_size = (eleven - one) // 10
+    return one - unit_size, unit_size
+
+
+def make_document(document_type: str, size: int, seed: int = 0) -> bytes:
+    """Make a document of a type of approximately a size.
+
+    Parameters
+    ----------
+    document_type : str
+        The type of the document: 'pdf', 'ppt', or 'py'.
+    size : int
+        The approximate number of bytes. PDF and PowerPoint documents have
+        at least one page or slide.
+    seed : int
+        The seed of the random text.
+
+    Returns
+    -------
+    bytes
+        The document.
+
+    """
+    if document_type == "py":
+        return make_python_code(size, seed).encode()
+    base_size, unit_size = get_unit_sizes(document_type)
+    unit_count = max(1, round((size - base_size) / unit_size))
+    if document_type == "pdf":
+        return make_pdf(unit_count, seed=seed)
+    return make_pptx(unit_count, seed=seed)
+
+
+def write_corpus(directory: Path, document_types: list[str], sizes: list[str], seed: int = 0) -> list[Path]:
+    """Write the documents of every type and size to a directory.
+
+    Documents already written are kept, since generating the largest ones
+    takes a while.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory of the corpus.
+    document_types : list[str]
+        The types of the documents: 'pdf', 'ppt', or 'py'.
+    sizes : list[str]
+        The sizes of the documents, such as '16K' or '100M'.
+    seed : int
+        The seed of the random text.
+
+    Returns
+    -------
+    list[Path]
+        The paths of the documents.
+
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for document_type in document_types:
+        for size in sizes:
+            path = directory / f"{document_type}-{size.upper()}-{seed}.{DOCUMENT_EXTENSIONS[document_type]}"
+            if not path.exists():
+                path.write_bytes(make_document(document_type, parse_size(size), seed))
+            paths.append(path)
+    return paths
+
+
+def main():
+    """Write a corpus and print the size of each document."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", type=Path, default=Path(".corpus"), help="Directory of the corpus")
+    parser.add_argument("--types", nargs="+", default=list(DOCUMENT_EXTENSIONS), choices=list(DOCUMENT_EXTENSIONS))
+    parser.add_argument("--sizes", nargs="+", default=["16K", "1M", "16M"], help="Sizes such as 16K, 1M, or 200M")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for path in write_corpus(args.output, args.types, args.sizes, args.seed):
+        print(f"{path}  {path.stat().st_size / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
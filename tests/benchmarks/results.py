@@ -0,0 +1,110 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Module for summarizing benchmark timings and comparing them across commits.
+
+Benchmarks save their results as JSON with the commit and the machine they
+ran on. Passing the file of a previous run as a baseline prints the ratio
+of each timing to the one of the baseline.
+
+"""
+
+import json
+import os
+from pathlib import Path
+import platform
+import subprocess
+import sys
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Compute a percentile of values with linear interpolation between the closest ranks.
+
+    Parameters
+    ----------
+    values : list[float]
+        The values, in any order.
+    percent : float
+        The percentile, between 0 and 100.
+
+    Returns
+    -------
+    float
+        The percentile of the values.
+
+    """
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def get_environment() -> dict:
+    """Describe the commit and the machine that benchmarks run on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(path: Path, benchmark: str, rows: list[dict]):
+    """Save the rows of results of a benchmark as JSON, with the environment it ran in."""
+    path.write_text(json.dumps({"benchmark": benchmark, **get_environment(), "rows": rows}, indent=2))
+
+
+def load_baseline(path: Path | None, keys: tuple[str, ...]) -> dict[tuple, dict]:
+    """Load the rows of results of a previous run, by the values of their key fields.
+
+    Parameters
+    ----------
+    path : Path | None
+        The JSON file saved by the previous run, if any.
+    keys : tuple[str, ...]
+        The fields identifying a row, such as the document type and size.
+
+    Returns
+    -------
+    dict[tuple, dict]
+        The rows by key, empty without a baseline.
+
+    """
+    if path is None:
+        return {}
+    results = json.loads(path.read_text())
+    print(f"baseline: commit {results['commit']} on {results['platform']}")
+    return {tuple(row[key] for key in keys): row for row in results["rows"]}
+
+
+def format_ratio(value: float, baseline: dict | None, field: str) -> str:
+    """Format the ratio of a timing to the same timing of the baseline, such as '0.85x'."""
+    if not baseline or not baseline.get(field):
+        return ""
+    return f"{value / baseline[field]:.2f}x"
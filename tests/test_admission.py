@@ -0,0 +1,169 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the admission control of splitter requests."""
+
+import asyncio
+import base64
+from unittest.mock import patch
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.utils.admission import AdmissionController, AdmissionRejectedError
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+
+client = TestClient(flowkit_service)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_jobs_limit():
+    """Test that requests over the concurrency limit wait, then are rejected when the queue is full."""
+    controller = AdmissionController(max_concurrent_jobs=1, max_in_flight_bytes=0, max_queue_size=1, queue_timeout=0)
+    await controller.acquire(10)
+    waiting = asyncio.create_task(controller.acquire(10))
+    await asyncio.sleep(0)
+    assert controller.queued_requests == 1
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await controller.acquire(10)
+    assert exc_info.value.status_code == 429
+
+    controller.release(10)
+    await waiting
+    assert controller.active_jobs == 1
+    assert controller.queued_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout():
+    """Test that a request waiting too long is rejected and leaves the queue."""
+    controller = AdmissionController(max_concurrent_jobs=1, max_in_flight_bytes=0, max_queue_size=1, queue_timeout=0.05)
+    await controller.acquire(0)
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await controller.acquire(0)
+    assert exc_info.value.status_code == 503
+    assert controller.queued_requests == 0
+
+    controller.release(0)
+    assert controller.active_jobs == 0
+
+
+@pytest.mark.asyncio
+async def test_in_flight_bytes_limit():
+    """Test that requests wait for in-flight bytes, in order, and that a large request runs alone."""
+    controller = AdmissionController(max_concurrent_jobs=0, max_in_flight_bytes=100, max_queue_size=10, queue_timeout=0)
+    await controller.acquire(500)
+    small = asyncio.create_task(controller.acquire(10))
+    await asyncio.sleep(0)
+    assert not small.done()
+
+    controller.release(500)
+    await small
+    assert controller.in_flight_bytes == 10
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request():
+    """Test that a cancelled waiting request leaves the queue without holding a job."""
+    controller = AdmissionController(max_concurrent_jobs=1, max_in_flight_bytes=0, max_queue_size=1, queue_timeout=0)
+    await controller.acquire(0)
+    waiting = asyncio.create_task(controller.acquire(0))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert controller.queued_requests == 0
+
+    controller.release(0)
+    assert controller.active_jobs == 0
+
+
+@pytest.mark.asyncio
+async def test_request_admitted_on_timeout():
+    """Test that a request admitted just as it times out does not keep its job."""
+    controller = AdmissionController(max_concurrent_jobs=1, max_in_flight_bytes=0, max_queue_size=1, queue_timeout=1)
+    await controller.acquire(10)
+
+    async def admit_then_time_out(future, timeout):
+        controller.release(10)
+        assert future.done()
+        raise asyncio.TimeoutError
+
+    with patch("asyncio.wait_for", admit_then_time_out):
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire(10)
+    assert exc_info.value.status_code == 503
+    assert controller.queued_requests == 0
+    assert controller.active_jobs == 0
+    assert controller.in_flight_bytes == 0
+
+
+def test_splitter_request_rejected():
+    """Test that a saturated worker rejects splitter requests with a 'Retry-After' header."""
+    controller = AdmissionController(max_concurrent_jobs=1, max_in_flight_bytes=0, max_queue_size=0, queue_timeout=0)
+    request_payload = {
+        "document_content": base64.b64encode(b"print('hello')").decode(),
+        "chunk_size": 10,
+        "chunk_overlap": 0,
+    }
+    with patch("allie.flowkit.utils.admission._admission_controller", controller):
+        controller.active_jobs = 1
+        response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
+        assert response.json() == {"detail": "Too many requests in flight, retry later"}
+
+        # Other endpoints are not controlled
+        assert client.get("/", headers={"api-key": MOCK_API_KEY}).status_code == 200
+
+        controller.active_jobs = 0
+        response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        assert response.status_code == 200
+        assert controller.active_jobs == 0
+        assert controller.in_flight_bytes == 0
+
+
+def test_job_request_rejected():
+    """Test that job submissions are controlled like splitter requests."""
+    controller = AdmissionController(max_concurrent_jobs=1, max_in_flight_bytes=0, max_queue_size=0, queue_timeout=0)
+    request_payload = {"document_content": "ZGF0YQ==", "chunk_size": 10, "chunk_overlap": 0}
+    with patch("allie.flowkit.utils.admission._admission_controller", controller):
+        controller.active_jobs = 1
+        response = client.post("/jobs/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        assert response.status_code == 429
+
+
+def test_chunked_request_rejected():
+    """Test that chunked bodies are rejected when the in-flight bytes are limited, since their size is unknown."""
+    controller = AdmissionController(max_concurrent_jobs=0, max_in_flight_bytes=100, max_queue_size=0, queue_timeout=0)
+    headers = {"api-key": MOCK_API_KEY, "content-type": "application/octet-stream"}
+    with patch("allie.flowkit.utils.admission._admission_controller", controller):
+        response = client.post("/splitter/py/upload", content=iter([b"print(1)\n"] * 3), headers=headers)
+        assert response.status_code == 411
+        assert "retry-after" not in response.headers
+        assert controller.active_jobs == 0
+
+        response = client.post("/splitter/py/upload", content=b"print(1)\n", headers=headers)
+        assert response.status_code != 411
+        assert controller.in_flight_bytes == 0
@@ -0,0 +1,77 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the benchmark corpus and the load test, so that they keep running."""
+
+import asyncio
+import base64
+
+from allie.flowkit.utils.cache import ChunkCache
+import pytest
+
+from tests.benchmarks.bench_load import run_load
+from tests.benchmarks.corpus import make_document, parse_size, write_corpus
+from tests.benchmarks.results import percentile
+
+
+@pytest.mark.parametrize("document_type", ["pdf", "ppt", "py"])
+def test_make_document(document_type):
+    """Test that documents are deterministic and of approximately the requested size."""
+    document = make_document(document_type, 64 * 1024)
+    assert document == make_document(document_type, 64 * 1024)
+    assert document != make_document(document_type, 64 * 1024, seed=1)
+    assert 0.8 < len(document) / (64 * 1024) < 1.2
+
+
+def test_write_corpus(tmp_path):
+    """Test that a corpus is written once per document type and size."""
+    paths = write_corpus(tmp_path, ["py", "pdf"], ["4K", "8k"])
+    assert [path.name for path in paths] == ["py-4K-0.py", "py-8K-0.py", "pdf-4K-0.pdf", "pdf-8K-0.pdf"]
+    assert paths[0].read_bytes() == make_document("py", 4096)
+
+
+@pytest.mark.parametrize("size, expected", [("512", 512), ("16K", 16384), ("1m", 1024**2), ("2GB", 2 * 1024**3)])
+def test_parse_size(size, expected):
+    """Test parsing document sizes."""
+    assert parse_size(size) == expected
+
+
+def test_percentile():
+    """Test percentiles interpolated between ranks."""
+    values = [4.0, 1.0, 3.0, 2.0, 5.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 95) == pytest.approx(4.8)
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_run_load(monkeypatch):
+    """Test that the load test splits every document."""
+    monkeypatch.setattr("allie.flowkit.utils.cache._chunk_cache", ChunkCache(max_size=0))
+    payload = {
+        "document_content": base64.b64encode(make_document("py", 4096)).decode(),
+        "chunk_size": 100,
+        "chunk_overlap": 10,
+    }
+    result = asyncio.run(run_load([("/splitter/py", payload)], request_count=6, concurrency=3))
+    assert result["failures"] == 0
+    assert result["p50"] <= result["p95"] <= result["p99"]
+    assert result["docs_per_second"] > 0
@@ -0,0 +1,189 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the removal of boilerplate repeated on the pages of a document."""
+
+import base64
+import io
+import json
+import re
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.utils.boilerplate import find_boilerplate, normalize_line, remove_boilerplate
+from fastapi.testclient import TestClient
+from pptx import Presentation
+import pytest
+
+from tests.benchmarks.corpus import make_pdf, make_pptx
+from tests.conftest import MOCK_API_KEY
+
+client = TestClient(flowkit_service)
+
+PAGES = [
+    f"ACME Simulation Manual\n{text}\nConfidential - Page {number} of 4\n"
+    for number, text in enumerate(["Meshing basics.", "Solver settings.", "Contact models.", "Post-processing."], 1)
+]
+
+
+def test_normalize_line():
+    """Test that lines differing only by whitespace, case, or page numbers are the same."""
+    assert normalize_line("  Page 12   of 40 ") == normalize_line("page 3 of 40")
+    assert normalize_line("Page 12 - Manual") == normalize_line("page 3 - manual")
+    assert normalize_line("Slide 12") == normalize_line("slide 3")
+    assert normalize_line("Step 3: mesh the part") != normalize_line("Step 7: mesh the part")
+    assert normalize_line("Width 12.5 mm") != normalize_line("Width 10.5 mm")
+    assert normalize_line(" \t") == ""
+
+
+def test_find_boilerplate():
+    """Test that only the lines on enough pages are boilerplate."""
+    assert find_boilerplate(PAGES, min_pages=3, min_page_percent=50) == {
+        "acme simulation manual",
+        "confidential - page 0 of 0",
+    }
+    assert find_boilerplate(PAGES[:2], min_pages=3, min_page_percent=50) == set()
+    assert find_boilerplate(PAGES + ["Other\n"] * 6, min_pages=3, min_page_percent=50) == {"other"}
+
+
+def test_find_boilerplate_ignores_blank_pages():
+    """Test that blank pages, such as the one after the last page break, do not raise the threshold."""
+    assert find_boilerplate(PAGES + ["", " \n"], min_pages=3, min_page_percent=100) == {
+        "acme simulation manual",
+        "confidential - page 0 of 0",
+    }
+
+
+@pytest.mark.parametrize("mode", ["drop", "collapse"])
+def test_remove_boilerplate(mode):
+    """Test dropping or collapsing the boilerplate lines of every page."""
+    pages = [page + "A unique line.\n" if number == 2 else page for number, page in enumerate(PAGES)]
+    cleaned_pages, removed = remove_boilerplate(pages, mode, min_pages=3, min_page_percent=75)
+    if mode == "drop":
+        assert cleaned_pages == [
+            "Meshing basics.\n",
+            "Solver settings.\n",
+            "Contact models.\nA unique line.\n",
+            "Post-processing.\n",
+        ]
+    else:
+        assert cleaned_pages == [
+            PAGES[0],
+            "Solver settings.\n",
+            "Contact models.\nA unique line.\n",
+            "Post-processing.\n",
+        ]
+    assert removed == sum(map(len, pages)) - sum(map(len, cleaned_pages))
+
+
+@pytest.mark.parametrize("mode", ["drop", "collapse"])
+def test_remove_boilerplate_keeps_pages(mode):
+    """Test that a page made only of boilerplate is kept whole."""
+    pages = [f"Header {number}\n" for number in range(1, 4)] + ["Header 4\nText\n"]
+    cleaned_pages, removed = remove_boilerplate(pages, mode, min_pages=3, min_page_percent=50)
+    assert cleaned_pages == pages[:3] + ["Text\n"]
+    assert removed == len("Header 4\n")
+
+
+def test_remove_boilerplate_keeps_table_rows():
+    """Test that the rows of a table repeated on every page with different values are kept."""
+    pages = [
+        f"ACME Simulation Manual\nCase {case}: {case * 10} {case * 15} kN at {case * 2}.5 mm\n" for case in range(1, 5)
+    ]
+    cleaned_pages, _ = remove_boilerplate(pages, "drop", min_pages=3, min_page_percent=50)
+    assert cleaned_pages == [page.removeprefix("ACME Simulation Manual\n") for page in pages]
+
+
+def make_title_pptx(slide_count: int) -> bytes:
+    """Make a PowerPoint document with only a numbered title on every slide."""
+    presentation = Presentation()
+    for slide_number in range(1, slide_count + 1):
+        presentation.slides.add_slide(presentation.slide_layouts[5]).shapes.title.text = f"Slide {slide_number}"
+    output = io.BytesIO()
+    presentation.save(output)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("ppt_backend", ["pptx", "xml"])
+def test_split_ppt_boilerplate(ppt_backend):
+    """Test that the slide titles repeated with only their number changing are removed, paragraph by paragraph."""
+    payload = {
+        "document_content": base64.b64encode(make_pptx(6)).decode(),
+        "chunk_size": 500,
+        "chunk_overlap": 0,
+        "split_by_slide": True,
+        "ppt_backend": ppt_backend,
+        "boilerplate": "drop",
+    }
+    response = client.post("/splitter/ppt", json=payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    dropped = response.json()
+    assert dropped["chunks"]
+    assert not any(re.search(r"Slide \d", chunk) for chunk in dropped["chunks"])
+    assert dropped["boilerplate_characters_removed"] == sum(len(f"Slide {number} \n") for number in range(1, 7))
+    assert sorted(set(dropped["slide_numbers"])) == [1, 2, 3, 4, 5, 6]
+
+    # Slides with nothing but boilerplate are kept
+    payload["document_content"] = base64.b64encode(make_title_pptx(6)).decode()
+    response = client.post("/splitter/ppt", json=payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    assert response.json()["boilerplate_characters_removed"] == 0
+    assert all(f"Slide {number}" in " ".join(response.json()["chunks"]) for number in range(1, 7))
+
+
+def test_split_pdf_boilerplate():
+    """Test that the page headers of a PDF document are removed before splitting, keeping the page numbers."""
+    payload = {
+        "document_content": base64.b64encode(make_pdf(5, lines_per_page=4)).decode(),
+        "chunk_size": 200,
+        "chunk_overlap": 0,
+    }
+    kept = client.post("/splitter/pdf", json=payload, headers={"api-key": MOCK_API_KEY}).json()
+    assert any("Page 2" in chunk for chunk in kept["chunks"])
+    assert "boilerplate_characters_removed" not in kept
+
+    payload["boilerplate"] = "drop"
+    response = client.post("/splitter/pdf", json=payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    dropped = response.json()
+    assert not any("Page " in chunk for chunk in dropped["chunks"])
+    assert dropped["boilerplate_characters_removed"] == sum(len(f"Page {number}\n") for number in range(1, 6))
+    assert dropped["page_numbers"][-1] == 5
+
+
+@pytest.mark.parametrize("multipart", [False, True])
+def test_split_pdf_upload_streaming_boilerplate(multipart):
+    """Test that the chunks of an uploaded PDF document are streamed without its page headers."""
+    document = make_pdf(5, lines_per_page=4)
+    parameters = {"chunk_size": 200, "chunk_overlap": 0, "boilerplate": "drop"}
+    headers = {"api-key": MOCK_API_KEY, "accept": "application/x-ndjson"}
+    if multipart:
+        kwargs = {"files": {"file": ("document.pdf", document)}, "data": parameters}
+    else:
+        kwargs = {"content": document, "params": parameters}
+    response = client.post("/splitter/pdf/upload", headers=headers, **kwargs)
+    assert response.status_code == 200
+    chunks = [json.loads(line)["chunk"] for line in response.text.splitlines()]
+
+    payload = {"document_content": base64.b64encode(document).decode(), **parameters}
+    expected = client.post("/splitter/pdf", json=payload, headers={"api-key": MOCK_API_KEY}).json()
+    assert chunks == expected["chunks"]
+    assert not any("Page " in chunk for chunk in chunks)
@@ -0,0 +1,175 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the splitter result cache."""
+
+import base64
+from pathlib import Path
+from unittest.mock import patch
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.endpoints.splitter import get_splitter_options
+from allie.flowkit.models.splitter import SplitterRequest, SplitterResponse
+from allie.flowkit.utils import revisions
+from allie.flowkit.utils.cache import ChunkCache, cache_key, get_chunk_cache, hash_document
+from fastapi.testclient import TestClient
+
+from tests.conftest import MOCK_API_KEY
+
+client = TestClient(flowkit_service)
+
+
+def make_response(text: str) -> SplitterResponse:
+    """Create a splitter response with a single chunk."""
+    return SplitterResponse(chunks=[text])
+
+
+def test_hash_document(tmp_path):
+    """Test that a document has the same hash in memory and on disk."""
+    path = tmp_path / "document.bin"
+    path.write_bytes(b"content")
+    assert hash_document(path) == hash_document(b"content")
+
+
+def test_cache_key():
+    """Test that every parameter is part of the cache key."""
+    key = cache_key("hash", "pdf", 100, 10)
+    assert key == cache_key("hash", "pdf", 100, 10)
+    assert key != cache_key("other", "pdf", 100, 10)
+    assert key != cache_key("hash", "ppt", 100, 10)
+    assert key != cache_key("hash", "pdf", 200, 10)
+    assert key != cache_key("hash", "pdf", 100, 20)
+    assert key != cache_key("hash", "pdf", 100, 10, backend="xml")
+
+
+def test_splitter_options():
+    """Test that the configuration settings changing a result are in its options, and the dedup options are not."""
+    request = SplitterRequest(document_content=b"", chunk_size=50, chunk_overlap=5, boilerplate="drop")
+    options = get_splitter_options(request)
+    with patch("allie.flowkit.config.CONFIG.boilerplate_min_pages", 10):
+        assert get_splitter_options(request) != options
+    with patch("allie.flowkit.config.CONFIG.ppt_extraction_backend", "python-pptx"):
+        assert get_splitter_options(request) != options
+    assert (
+        get_splitter_options(request.model_copy(update={"dedup_collection": "docs", "dedup_mode": "omit"})) == options
+    )
+
+
+def test_memory_tier_eviction():
+    """Test that the least recently used entries are evicted past the size limit."""
+    entry_size = len(make_response("a" * 10).model_dump_json())
+    cache = ChunkCache(max_size=2 * entry_size)
+    cache.put("a", make_response("a" * 10))
+    cache.put("b", make_response("b" * 10))
+    assert cache.get("a") is not None
+    cache.put("c", make_response("c" * 10))
+
+    assert cache.get("b") is None
+    assert cache.get("a").chunks == ["a" * 10]
+    assert cache.get("c").chunks == ["c" * 10]
+    assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "entries": 2, "size": 2 * entry_size}
+
+
+def test_disk_tier_is_shared(tmp_path):
+    """Test that results stored by one process are found by another."""
+    ChunkCache(max_size=0, directory=str(tmp_path)).put("key", make_response("shared"))
+
+    cache = ChunkCache(max_size=1024, directory=str(tmp_path))
+    assert cache.get("key").chunks == ["shared"]
+    assert cache.get("key").chunks == ["shared"]
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_disk_tier_eviction(tmp_path):
+    """Test that the on-disk tier evicts the least recently accessed entries."""
+    cache = ChunkCache(max_size=0, directory=str(tmp_path), disk_max_size=1)
+    cache.put("old", make_response("old"))
+    cache.put("new", make_response("new"))
+    assert cache.get("old") is None
+    assert cache.evictions >= 1
+
+
+def test_split_py_uses_cache():
+    """Test that resubmitting a document is served from the cache."""
+    cache = get_chunk_cache()
+    cache.clear()
+    request_payload = {
+        "document_content": base64.b64encode(b"def cached():\n    return 1\n").decode(),
+        "chunk_size": 50,
+        "chunk_overlap": 5,
+    }
+    first = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    with patch("allie.flowkit.endpoints.splitter.extract_python_code") as extract:
+        second = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        extract.assert_not_called()
+    assert first.json() == second.json()
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_split_pdf_upload_shares_cache_with_json():
+    """Test that an uploaded document hits the result cached for its Base64 form."""
+    cache = get_chunk_cache()
+    cache.clear()
+    pdf_content = Path("./tests/test_files/test_document.pdf").read_bytes()
+    request_payload = {
+        "document_content": base64.b64encode(pdf_content).decode(),
+        "chunk_size": 200,
+        "chunk_overlap": 20,
+    }
+    client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    response = client.post(
+        "/splitter/pdf/upload",
+        params={"chunk_size": 200, "chunk_overlap": 20},
+        content=pdf_content,
+        headers={"api-key": MOCK_API_KEY},
+    )
+    assert response.status_code == 200
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_hit_refreshes_revisions(tmp_path):
+    """Test that a cached result is only used while the revision store still holds its document."""
+    cache = ChunkCache(max_size=1024 * 1024)
+    store = revisions.RevisionStore(str(tmp_path))
+    request_payload = {
+        "document_content": base64.b64encode(b"def cached():\n    return 1\n").decode(),
+        "chunk_size": 50,
+        "chunk_overlap": 5,
+    }
+    with (
+        patch("allie.flowkit.utils.cache._chunk_cache", cache),
+        patch.object(revisions, "_revision_store", store),
+    ):
+        client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        with patch.object(store, "touch", wraps=store.touch) as touch:
+            client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        touch.assert_called_once()
+        assert cache.stats()["hits"] == 1
+
+        # Once evicted from the revision store, the document is split again to store it
+        store._database.connect().execute("DELETE FROM revisions")
+        client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        assert (
+            store.get_content(hash_document(b"def cached():\n    return 1\n"), "py") == "def cached():\n    return 1\n"
+        )
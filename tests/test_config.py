@@ -0,0 +1,143 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the configuration settings."""
+
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from allie.flowkit.config._config import KEY_VAULT_SECRETS_VARIABLE, WORKER_COUNT_VARIABLE, Config, LazyConfig
+import pytest
+
+
+class FakeSecretClient:
+    """In-memory stand-in for an Azure Key Vault SecretClient."""
+
+    def __init__(self, secrets: dict[str, str], delay: float = 0):
+        """Initialize the client with its secrets and the latency of each request."""
+        self.secrets = secrets
+        self.delay = delay
+        self.fetched = []
+        self.concurrent_requests = 0
+        self.max_concurrent_requests = 0
+        self._lock = threading.Lock()
+
+    def list_properties_of_secrets(self):
+        """List the properties of all secrets."""
+        return [SimpleNamespace(name=name) for name in self.secrets]
+
+    def get_secret(self, name: str):
+        """Get a secret, recording the number of concurrent requests."""
+        with self._lock:
+            self.fetched.append(name)
+            self.concurrent_requests += 1
+            self.max_concurrent_requests = max(self.max_concurrent_requests, self.concurrent_requests)
+        time.sleep(self.delay)
+        with self._lock:
+            self.concurrent_requests -= 1
+        return SimpleNamespace(value=self.secrets[name])
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """Write a configuration file reading from Azure Key Vault and point the configuration at it."""
+    path = tmp_path / "config.yaml"
+    path.write_text("FLOWKIT_PYTHON_API_KEY: file_api_key\nEXTRACT_CONFIG_FROM_AZURE_KEY_VAULT: True\n")
+    monkeypatch.setenv("ALLIE_CONFIG_PATH", str(path))
+    monkeypatch.setenv(KEY_VAULT_SECRETS_VARIABLE, "")
+    return path
+
+
+SECRETS = {
+    "FLOWKITPYTHONAPIKEY": "vault_api_key",
+    "PROCESS_POOL_SIZE": "3",
+    "USESSL": "True",
+    "UNRELATED-SECRET": "unrelated",
+    "ANOTHER-SECRET": "unrelated",
+}
+
+
+def test_key_vault_secrets(config_file):
+    """Test that only the secrets matching fields are fetched, concurrently, and converted."""
+    client = FakeSecretClient(SECRETS, delay=0.05)
+    with patch.object(
+        Config, "_get_config_from_azure_key_vault", lambda self: self._get_config_from_secret_client(client)
+    ):
+        config = Config()
+    assert sorted(client.fetched) == ["FLOWKITPYTHONAPIKEY", "PROCESS_POOL_SIZE", "USESSL"]
+    assert client.max_concurrent_requests > 1
+    assert config.flowkit_python_api_key == "vault_api_key"
+    assert config.process_pool_size == 3
+    assert config.use_ssl is True
+
+
+def test_shared_key_vault_secrets(config_file):
+    """Test that worker processes use the secrets shared by the parent process instead of the Key Vault."""
+    client = FakeSecretClient(SECRETS)
+    with patch.object(
+        Config, "_get_config_from_azure_key_vault", lambda self: self._get_config_from_secret_client(client)
+    ):
+        Config().share_key_vault_secrets()
+    secrets_path = Path(os.environ[KEY_VAULT_SECRETS_VARIABLE])
+    assert json.loads(secrets_path.read_text())["process_pool_size"] == "3"
+    assert "vault_api_key" not in os.environ.values()
+    if os.name == "posix":
+        assert secrets_path.stat().st_mode & 0o777 == 0o600
+
+    with patch.object(Config, "_get_config_from_azure_key_vault", side_effect=AssertionError("Key Vault was read")):
+        config = Config()
+    assert config.flowkit_python_api_key == "vault_api_key"
+    assert config.process_pool_size == 3
+    secrets_path.unlink()
+
+
+def test_lazy_config(config_file):
+    """Test that the configuration is read on first use."""
+    config_file.write_text("FLOWKIT_PYTHON_API_KEY: file_api_key\nPROCESS_POOL_SIZE: 2\n")
+    config = LazyConfig()
+    assert not config.loaded
+    assert config.process_pool_size == 2
+    assert config.loaded
+    config.process_pool_size = 5
+    assert config.load().process_pool_size == 5
+
+
+def test_worker_count_from_command_line(config_file, monkeypatch):
+    """Test that worker processes use the number of workers given on the command line of the parent process."""
+    config_file.write_text("FLOWKIT_PYTHON_API_KEY: file_api_key\nFLOWKIT_PYTHON_WORKERS: 2\n")
+    assert Config().flowkit_python_workers == 2
+    monkeypatch.setenv(WORKER_COUNT_VARIABLE, "6")
+    assert Config().flowkit_python_workers == 6
+
+
+def test_invalid_execution_mode(tmp_path, monkeypatch):
+    """Test that an unknown splitter execution mode is rejected when the configuration is read."""
+    path = tmp_path / "config.yaml"
+    path.write_text("FLOWKIT_PYTHON_API_KEY: file_api_key\nSPLITTER_EXECUTION_MODE: cluster\n")
+    monkeypatch.setenv("ALLIE_CONFIG_PATH", str(path))
+    with pytest.raises(ValueError, match="SPLITTER_EXECUTION_MODE"):
+        Config()
@@ -0,0 +1,44 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the SQLite databases shared by the worker processes."""
+
+from unittest.mock import patch
+
+from allie.flowkit.utils.database import SQLiteDatabase
+
+SCHEMA = ("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY)",)
+
+
+def test_connect(tmp_path):
+    """Test that the database is created in write-ahead logging mode, with one connection per process."""
+    database = SQLiteDatabase(tmp_path / "nested" / "test.sqlite3", SCHEMA)
+    connection = database.connect()
+    assert database.connect() is connection
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    connection.execute("INSERT INTO entries (key) VALUES ('a')")
+
+    # A forked process opens its own connection to the same database
+    with patch("os.getpid", return_value=-1):
+        forked_connection = database.connect()
+    assert forked_connection is not connection
+    assert forked_connection.execute("SELECT key FROM entries").fetchall() == [("a",)]
@@ -0,0 +1,156 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the deduplication of chunks against the chunks already seen in a collection."""
+
+import base64
+import json
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.endpoints.splitter import hash_chunk
+from allie.flowkit.utils import dedup, jobs
+from allie.flowkit.utils.cache import ChunkCache
+from allie.flowkit.utils.dedup import ChunkIndex
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+from tests.test_jobs import wait_for_job
+
+client = TestClient(flowkit_service)
+
+CODE = "".join(f"def function_{index}():\n    return {index}\n\n" for index in range(20))
+ADDED_FUNCTION = "def added():\n    return None"
+
+
+@pytest.fixture(autouse=True)
+def chunk_index(tmp_path, monkeypatch):
+    """Index the chunks of each test in its temporary directory."""
+    monkeypatch.setattr(dedup, "_chunk_index", ChunkIndex(str(tmp_path)))
+
+
+def split(document: str, **options) -> dict:
+    """Split Python code and return the response."""
+    payload = {"document_content": base64.b64encode(document.encode()).decode(), "chunk_size": 20, "chunk_overlap": 0}
+    response = client.post("/splitter/py", json={**payload, **options}, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_chunk_index(tmp_path):
+    """Test that hashes already in a collection or earlier in the same lookup are duplicates."""
+    index = ChunkIndex(str(tmp_path))
+    hashes = [hash_chunk(str(number)) for number in range(1200)]
+    assert index.add("a", hashes[:700]) == [False] * 700
+    assert index.add("a", hashes[600:] + hashes[:1]) == [True] * 100 + [False] * 500 + [True]
+    assert index.add("b", [hashes[0], hashes[0]]) == [False, True]
+
+
+def test_split_py_dedup_flag():
+    """Test that the chunks already seen in a collection are flagged, and not those of other collections."""
+    first = split(CODE, dedup_collection="tenant")
+    assert first["duplicate_chunks"] == [False] * len(first["chunks"])
+    assert first["duplicate_chunk_count"] == 0
+
+    revision = CODE.replace("return 5\n", "return 'five'\n")
+    second = split(revision, dedup_collection="tenant")
+    assert second["duplicate_chunk_count"] == len(second["chunks"]) - sum(
+        chunk not in first["chunks"] for chunk in second["chunks"]
+    )
+    assert [chunk in first["chunks"] for chunk in second["chunks"]] == second["duplicate_chunks"]
+    assert not all(second["duplicate_chunks"])
+
+    other = split(CODE, dedup_collection="other")
+    assert other["duplicate_chunk_count"] == 0
+
+
+def test_split_py_dedup_omit():
+    """Test that the chunks already seen in a collection are omitted with their metadata."""
+    first = split(CODE, dedup_collection="tenant", dedup_mode="omit")
+    revision = CODE + ADDED_FUNCTION + "\n"
+    second = split(revision, dedup_collection="tenant", dedup_mode="omit", include_metadata=True)
+    assert second["chunks"] == [ADDED_FUNCTION]
+    assert second["duplicate_chunk_count"] == len(first["chunks"])
+    assert "duplicate_chunks" not in second
+    assert len(second["spans"]) == len(second["chunk_hashes"]) == len(second["chunk_ids"]) == 1
+    assert [revision[start:end] for start, end in second["spans"]] == second["chunks"]
+
+
+def test_split_py_dedup_cached(monkeypatch):
+    """Test that cached results are deduplicated again, without changing the cached result."""
+    monkeypatch.setattr("allie.flowkit.utils.cache._chunk_cache", ChunkCache(max_size=1024 * 1024))
+    first = split(CODE, dedup_collection="tenant", dedup_mode="omit")
+    assert first["chunks"]
+    assert split(CODE, dedup_collection="tenant", dedup_mode="omit")["chunks"] == []
+    assert split(CODE)["chunks"] == first["chunks"]
+
+
+def test_stream_py_dedup():
+    """Test that streamed chunks are flagged or omitted."""
+    split(CODE, dedup_collection="tenant")
+    payload = {
+        "document_content": base64.b64encode((CODE + ADDED_FUNCTION + "\n").encode()).decode(),
+        "chunk_size": 20,
+        "chunk_overlap": 0,
+        "dedup_collection": "tenant",
+    }
+    headers = {"api-key": MOCK_API_KEY, "accept": "application/x-ndjson"}
+    response = client.post("/splitter/py", json=payload, headers=headers)
+    assert response.status_code == 200
+    chunks = [json.loads(line) for line in response.text.splitlines()]
+    assert [chunk["chunk"] for chunk in chunks if not chunk["duplicate"]] == [ADDED_FUNCTION]
+
+    response = client.post("/splitter/py", json={**payload, "dedup_mode": "omit"}, headers=headers)
+    assert response.text == ""
+
+
+def test_python_job_dedup(tmp_path, monkeypatch):
+    """Test that the chunks of a job are flagged."""
+    monkeypatch.setattr(jobs, "_job_store", jobs.JobStore(tmp_path / "jobs"))
+    split(CODE, dedup_collection="tenant")
+    payload = {
+        "document_content": base64.b64encode((CODE + ADDED_FUNCTION + "\n").encode()).decode(),
+        "chunk_size": 20,
+        "chunk_overlap": 0,
+        "dedup_collection": "tenant",
+    }
+    response = client.post("/jobs/splitter/py", json=payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 202
+    job = wait_for_job(response.json()["job_id"])
+    assert job["status"] == "succeeded"
+
+    page = client.get(f"/jobs/{job['job_id']}/chunks", headers={"api-key": MOCK_API_KEY}).json()
+    assert [chunk for chunk, duplicate in zip(page["chunks"], page["duplicate_chunks"]) if not duplicate] == [
+        ADDED_FUNCTION
+    ]
+
+
+def test_split_py_dedup_disabled(monkeypatch):
+    """Test that deduplication is rejected when the chunk index is not enabled."""
+    monkeypatch.setattr(dedup, "_chunk_index", ChunkIndex(""))
+    payload = {"document_content": base64.b64encode(b"x = 1").decode(), "chunk_size": 20, "chunk_overlap": 0}
+    response = client.post(
+        "/splitter/py", json={**payload, "dedup_collection": "tenant"}, headers={"api-key": MOCK_API_KEY}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Chunk deduplication is not enabled"
+    assert "duplicate_chunks" not in split("x = 1")
@@ -22,15 +22,21 @@
 """Test module for the splitter endpoints."""
 
 import base64
+import hashlib
+import json
 from pathlib import Path
+from unittest.mock import patch
+import warnings
 
 from allie.flowkit import flowkit_service
-from allie.flowkit.endpoints.splitter import validate_request
+from allie.flowkit.endpoints.splitter import extract_document, validate_request
 from allie.flowkit.models.splitter import SplitterRequest
+from allie.flowkit.utils.cache import ChunkCache
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 import pytest
 
+from tests.benchmarks.corpus import make_pdf, make_pptx
 from tests.conftest import MOCK_API_KEY
 
 # Create a test client
@@ -57,7 +63,46 @@ async def test_split_ppt():
         print(f"Response status code: {response.status_code}")
         print(f"Response content: {response.json()}")
     assert response.status_code == 200
-    assert "chunks" in response.json()
+    assert set(response.json()) == {"chunks", "slide_numbers"}
+
+
+@pytest.mark.parametrize("split_by_slide", [False, True])
+def test_split_ppt_slide_numbers(split_by_slide):
+    """Test that PowerPoint chunks come with the number of their slide."""
+    request_payload = {
+        "document_content": base64.b64encode(make_pptx(slide_count=6)).decode(),
+        "chunk_size": 40,
+        "chunk_overlap": 5,
+        "split_by_slide": split_by_slide,
+    }
+    response = client.post("/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    chunks = response.json()["chunks"]
+    slide_numbers = response.json()["slide_numbers"]
+    assert len(slide_numbers) == len(chunks)
+    assert slide_numbers == sorted(slide_numbers)
+    assert set(slide_numbers) == set(range(1, 7))
+    for chunk, slide_number in zip(chunks, slide_numbers):
+        if chunk.startswith("Slide "):
+            assert chunk.startswith(f"Slide {slide_number} ")
+        if split_by_slide:
+            assert f"Slide {slide_number + 1} " not in chunk
+
+
+def test_split_ppt_streaming_slide_numbers():
+    """Test that streamed PowerPoint chunks come with the number of their slide."""
+    request_payload = {
+        "document_content": base64.b64encode(make_pptx(slide_count=3)).decode(),
+        "chunk_size": 40,
+        "chunk_overlap": 5,
+    }
+    expected = client.post("/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY}).json()
+    response = client.post(
+        "/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY, "accept": "application/x-ndjson"}
+    )
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["chunk"] for event in events] == expected["chunks"]
+    assert [event["slide_number"] for event in events] == expected["slide_numbers"]
 
 
 @pytest.mark.asyncio
@@ -71,7 +116,7 @@ async def test_split_py():
     request_payload = {"document_content": python_code_base64, "chunk_size": 50, "chunk_overlap": 5}
     response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
     assert response.status_code == 200
-    assert "chunks" in response.json()
+    assert set(response.json()) == {"chunks"}
 
 
 @pytest.mark.asyncio
@@ -85,7 +130,224 @@ async def test_split_pdf():
     }
     response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
     assert response.status_code == 200
-    assert "chunks" in response.json()
+    assert set(response.json()) == {"chunks", "page_numbers"}
+
+
+@pytest.mark.parametrize(
+    "document_type, document_content, split_by_slide",
+    [
+        ("pdf", make_pdf(page_count=3), False),
+        ("ppt", make_pptx(slide_count=4), False),
+        ("ppt", make_pptx(slide_count=4), True),
+    ],
+    ids=["pdf", "ppt", "ppt-by-slide"],
+)
+def test_split_spans(document_type, document_content, split_by_slide):
+    """Test that the spans response format returns the text once and the offsets of the chunks."""
+    request_payload = {
+        "document_content": base64.b64encode(document_content).decode(),
+        "chunk_size": 100,
+        "chunk_overlap": 50,
+        "split_by_slide": split_by_slide,
+    }
+    expected = client.post(f"/splitter/{document_type}", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    request_payload["response_format"] = "spans"
+    response = client.post(f"/splitter/{document_type}", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    result = response.json()
+    assert "chunks" not in result
+    assert [result["text"][start:end] for start, end in result["spans"]] == expected.json()["chunks"]
+    assert result.get("slide_numbers") == expected.json().get("slide_numbers")
+    assert result.get("page_numbers") == expected.json().get("page_numbers")
+    assert len(response.content) < len(expected.content)
+
+
+def test_split_pdf_page_numbers():
+    """Test that PDF chunks come with the number of their page."""
+    request_payload = {
+        "document_content": base64.b64encode(make_pdf(page_count=3)).decode(),
+        "chunk_size": 40,
+        "chunk_overlap": 5,
+    }
+    response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    chunks = response.json()["chunks"]
+    page_numbers = response.json()["page_numbers"]
+    assert len(page_numbers) == len(chunks)
+    assert page_numbers == sorted(page_numbers)
+    assert set(page_numbers) == {1, 2, 3}
+    for chunk, page_number in zip(chunks, page_numbers):
+        if chunk.startswith("Page "):
+            assert chunk.startswith(f"Page {page_number}")
+
+
+def test_split_spans_streaming():
+    """Test that the spans response format cannot be streamed."""
+    request_payload = {
+        "document_content": base64.b64encode(b"print('hello')").decode(),
+        "chunk_size": 10,
+        "chunk_overlap": 0,
+        "response_format": "spans",
+    }
+    response = client.post(
+        "/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY, "accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "The spans response format cannot be streamed"
+
+
+@pytest.mark.parametrize("accept", ["application/x-ndjson", "text/event-stream"])
+def test_split_py_streaming(accept):
+    """Test streaming the chunks of Python code."""
+    python_code = "\n\n".join(f"def function_{i}():\n    return {i}" for i in range(20))
+    request_payload = {
+        "document_content": base64.b64encode(python_code.encode()).decode("utf-8"),
+        "chunk_size": 10,
+        "chunk_overlap": 0,
+    }
+    expected_chunks = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY}).json()
+    response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY, "accept": accept})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(accept)
+
+    if accept == "application/x-ndjson":
+        events = [json.loads(line) for line in response.text.splitlines()]
+    else:
+        messages = [message for message in response.text.split("\n\n") if message]
+        assert messages[-1] == f'event: done\ndata: {{"count": {len(messages) - 1}}}'
+        events = [json.loads(message.split("data: ", 1)[1]) for message in messages[:-1]]
+    assert [event["index"] for event in events] == list(range(len(events)))
+    assert [event["chunk"] for event in events] == expected_chunks["chunks"]
+
+
+def test_split_batch():
+    """Test splitting documents of mixed types, with per-document errors."""
+    ppt_content_base64 = encode_file_to_base64("./tests/test_files/test_presentation.pptx")
+    python_code_base64 = base64.b64encode(b"def hello_world():\n    print('Hello, world!')\n").decode("utf-8")
+    request_payload = {
+        "documents": [
+            {"document_type": "ppt", "document_content": ppt_content_base64, "chunk_size": 100, "chunk_overlap": 10},
+            {"document_type": "py", "document_content": python_code_base64, "chunk_size": 50, "chunk_overlap": 5},
+            {"document_type": "pdf", "document_content": python_code_base64, "chunk_size": 50, "chunk_overlap": 5},
+            {"document_type": "py", "document_content": python_code_base64, "chunk_size": 0, "chunk_overlap": 5},
+        ]
+    }
+    response = client.post("/splitter/batch", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    single_payload = {key: value for key, value in request_payload["documents"][0].items() if key != "document_type"}
+    single_response = client.post("/splitter/ppt", json=single_payload, headers={"api-key": MOCK_API_KEY})
+    assert results[0] == {**single_response.json(), "status_code": 200}
+    assert results[1]["status_code"] == 200
+    assert results[1]["chunks"] == ["def hello_world():\n    print('Hello, world!')"]
+    assert results[2]["status_code"] == 400
+    assert results[2]["error"].startswith("Error processing PDF file")
+    assert results[3]["status_code"] == 400
+    assert "chunks" not in results[3]
+    assert results[3]["error"] == "No chunk size provided"
+
+
+@pytest.mark.parametrize("validate_responses", [True, False])
+def test_split_batch_granularities(validate_responses):
+    """Test that batch results keep the nested granularities as models, with or without response validation."""
+    python_code_base64 = base64.b64encode(b"def f():\n    return 1\n\n\ndef g():\n    return 2\n").decode()
+    document = {"document_content": python_code_base64, "chunk_size": 6, "chunk_overlap": 0}
+    document["granularities"] = [{"chunk_size": 50, "chunk_overlap": 0}]
+    request_payload = {"documents": [{"document_type": "py", **document}]}
+    with (
+        patch("allie.flowkit.config.CONFIG.validate_responses", validate_responses),
+        warnings.catch_warnings(),
+    ):
+        warnings.simplefilter("error")
+        response = client.post("/splitter/batch", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    single_response = client.post("/splitter/py", json=document, headers={"api-key": MOCK_API_KEY})
+    assert response.json()["results"][0] == {**single_response.json(), "status_code": 200}
+
+
+def test_split_pdf_upload_raw():
+    """Test splitting a PDF document sent as the raw request body."""
+    pdf_content = Path("./tests/test_files/test_document.pdf").read_bytes()
+    response = client.post(
+        "/splitter/pdf/upload",
+        params={"chunk_size": 200, "chunk_overlap": 20},
+        content=pdf_content,
+        headers={"api-key": MOCK_API_KEY, "content-type": "application/octet-stream"},
+    )
+    assert response.status_code == 200
+
+    json_payload = {"document_content": base64.b64encode(pdf_content).decode(), "chunk_size": 200, "chunk_overlap": 20}
+    json_response = client.post("/splitter/pdf", json=json_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.json() == json_response.json()
+
+
+def test_split_ppt_upload_multipart_spooled():
+    """Test splitting a multipart PowerPoint upload that is spooled to disk."""
+    ppt_content = Path("./tests/test_files/test_presentation.pptx").read_bytes()
+    with (
+        patch("allie.flowkit.config.CONFIG.upload_spool_max_size", 1024),
+        patch("allie.flowkit.utils.uploads.UPLOAD_READ_SIZE", 4096),
+        # The body is parsed as it arrives, without Starlette spooling the document first
+        patch("starlette.requests.Request.form", side_effect=AssertionError("The form was parsed by Starlette")),
+    ):
+        response = client.post(
+            "/splitter/ppt/upload",
+            files={"file": ("test_presentation.pptx", ppt_content)},
+            data={"chunk_size": 100, "chunk_overlap": 10, "split_by_slide": "true"},
+            headers={"api-key": MOCK_API_KEY},
+        )
+    assert response.status_code == 200
+    json_payload = {
+        "document_content": base64.b64encode(ppt_content).decode(),
+        "chunk_size": 100,
+        "chunk_overlap": 10,
+        "split_by_slide": True,
+    }
+    assert response.json() == client.post("/splitter/ppt", json=json_payload, headers={"api-key": MOCK_API_KEY}).json()
+
+
+def test_split_py_upload_multipart_without_file():
+    """Test that a multipart upload needs the document in its 'file' field."""
+    response = client.post(
+        "/splitter/py/upload",
+        data={"chunk_size": 50, "chunk_overlap": 5, "file": "print('hello')"},
+        files={"other": ("code.py", b"print('hello')")},
+        headers={"api-key": MOCK_API_KEY},
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "No 'file' field in multipart body"}
+
+
+def test_split_py_upload_streaming():
+    """Test streaming the chunks of uploaded Python code."""
+    response = client.post(
+        "/splitter/py/upload",
+        params={"chunk_size": 50, "chunk_overlap": 5},
+        content=b"print('hello')\n",
+        headers={"api-key": MOCK_API_KEY, "accept": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [{"index": 0, "chunk": "print('hello')"}]
+
+
+@pytest.mark.parametrize(
+    "params, content, expected_detail",
+    [
+        ({"chunk_size": 50, "chunk_overlap": 5}, b"", "No document content provided"),
+        ({"chunk_overlap": 5}, b"print('hello')", "No chunk size provided"),
+        ({"chunk_size": 50}, b"print('hello')", "No chunk overlap provided"),
+        ({"chunk_size": "fifty", "chunk_overlap": 5}, b"print('hello')", None),
+    ],
+)
+def test_split_py_upload_invalid(params, content, expected_detail):
+    """Test the validation of raw upload requests."""
+    response = client.post("/splitter/py/upload", params=params, content=content, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+    if expected_detail:
+        assert response.json() == {"detail": expected_detail}
+    else:
+        assert response.json()["detail"].startswith("Invalid upload parameters: chunk_size:")
 
 
 # Define test cases for validate_request()
@@ -140,3 +402,120 @@ def test_validate_request(api_request, api_key, expected_exception):
             validate_request(api_request, api_key)
         except HTTPException:
             pytest.fail("validate_request() raised HTTPException unexpectedly!")
+
+
+def test_split_pdf_without_response_validation():
+    """Test that skipping the validation of responses does not change them."""
+    request_payload = {
+        "document_content": base64.b64encode(make_pdf(3)).decode("utf-8"),
+        "chunk_size": 50,
+        "chunk_overlap": 10,
+    }
+    contents = []
+    # Without the cache, the response is built again with each setting
+    with patch("allie.flowkit.utils.cache._chunk_cache", ChunkCache(max_size=0)):
+        for validate_responses in (True, False):
+            with patch("allie.flowkit.config.CONFIG.validate_responses", validate_responses):
+                response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            contents.append(response.content)
+    assert contents[0] == contents[1]
+    assert json.loads(contents[0])["page_numbers"][-1] == 3
+
+
+def test_split_py_metadata():
+    """Test the content hashes, IDs, and offsets of chunks."""
+    python_code = "\n\n".join(["def f():\n    return 1"] * 3 + ["def g():\n    return 2"])
+    request_payload = {
+        "document_content": base64.b64encode(python_code.encode()).decode("utf-8"),
+        "chunk_size": 6,
+        "chunk_overlap": 0,
+        "include_metadata": True,
+    }
+    response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["chunks"] == ["def f():\n    return 1"] * 3 + ["def g():\n    return 2"]
+    assert [python_code[start:end] for start, end in result["spans"]] == result["chunks"]
+    assert result["document_hash"] == hashlib.sha256(python_code.encode()).hexdigest()
+
+    # Equal chunks have the same hash but different IDs
+    assert len(set(result["chunk_hashes"])) == 2
+    assert result["chunk_hashes"][0] == hashlib.blake2b(result["chunks"][0].encode(), digest_size=16).hexdigest()
+    assert len(set(result["chunk_ids"])) == 4
+
+    # The metadata does not depend on the response format or the chunk size
+    request_payload.update(response_format="spans", chunk_size=7)
+    other = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY}).json()
+    assert other["spans"] == result["spans"]
+    assert other["chunk_hashes"] == result["chunk_hashes"]
+    assert other["chunk_ids"] == result["chunk_ids"]
+
+    request_payload["response_format"] = "chunks"
+    response = client.post(
+        "/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY, "accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Chunk metadata cannot be streamed"
+
+
+def test_split_pdf_granularities():
+    """Test that each granularity gives the chunks of a request with its chunk size, linked to parent chunks."""
+    pdf = base64.b64encode(make_pdf(3)).decode("utf-8")
+    granularities = [{"chunk_size": 200, "chunk_overlap": 0}, {"chunk_size": 20, "chunk_overlap": 5}]
+    request_payload = {"document_content": pdf, "chunk_size": 50, "chunk_overlap": 10, "granularities": granularities}
+
+    with patch("allie.flowkit.endpoints.splitter.extract_document", side_effect=extract_document) as extract:
+        response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    assert extract.call_count == 1
+    result = response.json()
+
+    for granularity, expected_parent in zip(result["granularities"], [None, 0]):
+        expected = client.post(
+            "/splitter/pdf",
+            json={
+                "document_content": pdf,
+                "chunk_size": granularity["chunk_size"],
+                "chunk_overlap": granularity["chunk_overlap"],
+            },
+            headers={"api-key": MOCK_API_KEY},
+        ).json()
+        assert granularity["chunks"] == expected["chunks"]
+        assert granularity["page_numbers"] == expected["page_numbers"]
+        assert granularity.get("parent_granularity") == expected_parent
+
+    large, small = result["granularities"]
+    assert "parent_chunk_indices" not in large
+    assert len(small["parent_chunk_indices"]) == len(small["chunks"])
+    assert small["parent_chunk_indices"] == sorted(small["parent_chunk_indices"])
+    for chunk, parent in zip(small["chunks"], small["parent_chunk_indices"]):
+        assert (
+            chunk[: len(chunk) // 2] in large["chunks"][parent] or chunk[len(chunk) // 2 :] in large["chunks"][parent]
+        )
+
+    request_payload["response_format"] = "spans"
+    spans = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY}).json()
+    assert [spans["text"][start:end] for start, end in spans["granularities"][1]["spans"]] == small["chunks"]
+    assert spans["granularities"][1]["parent_chunk_indices"] == small["parent_chunk_indices"]
+
+
+def test_split_py_granularities_invalid():
+    """Test that invalid or streamed granularities are rejected."""
+    request_payload = {
+        "document_content": base64.b64encode(b"x = 1").decode("utf-8"),
+        "chunk_size": 50,
+        "chunk_overlap": 10,
+        "granularities": [{"chunk_size": -1, "chunk_overlap": 0}],
+    }
+    response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Chunk size must be greater than 0"
+
+    request_payload["granularities"] = [{"chunk_size": 10, "chunk_overlap": 0}]
+    response = client.post(
+        "/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY, "accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Multiple granularities cannot be streamed"
@@ -0,0 +1,141 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the executor utilities."""
+
+import base64
+import time
+from unittest.mock import patch
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.endpoints.splitter import extract_pdf_text
+from allie.flowkit.utils import executor
+from allie.flowkit.utils.executor import get_extraction_pool, get_process_pool, run_in_executor, shutdown_process_pool
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.benchmarks.corpus import make_pdf
+from tests.conftest import MOCK_API_KEY
+
+client = TestClient(flowkit_service)
+
+
+@pytest.fixture
+def process_mode():
+    """Run the splitter work in a process pool of two workers."""
+    with (
+        patch("allie.flowkit.config.CONFIG.splitter_execution_mode", "process"),
+        patch("allie.flowkit.config.CONFIG.process_pool_size", 2),
+    ):
+        yield
+    shutdown_process_pool()
+
+
+def test_split_py_in_process_pool(process_mode):
+    """Test that the splitter endpoints return the same chunks from the process pool."""
+    python_code_base64 = base64.b64encode(b"def hello_world():\n    print('Hello, world!')\n").decode("utf-8")
+    request_payload = {"document_content": python_code_base64, "chunk_size": 50, "chunk_overlap": 5}
+    response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    assert response.json()["chunks"] == ["def hello_world():\n    print('Hello, world!')"]
+
+
+def test_http_exception_from_process_pool(process_mode):
+    """Test that HTTP errors raised in a worker process reach the client."""
+    request_payload = {
+        "document_content": base64.b64encode(b"not a pdf").decode(),
+        "chunk_size": 50,
+        "chunk_overlap": 5,
+    }
+    response = client.post("/splitter/pdf", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Error processing PDF file")
+
+
+@pytest.mark.asyncio
+async def test_process_pool_timeout(process_mode):
+    """Test that a task exceeding the timeout is reported as a gateway timeout, and its worker process killed."""
+    with patch("allie.flowkit.config.CONFIG.process_pool_task_timeout", 1):
+        pool = get_process_pool()
+        assert await run_in_executor(sum, [1, 2, 3]) == 6
+        processes = list(pool._processes.values())
+        with pytest.raises(HTTPException) as exc_info:
+            await run_in_executor(time.sleep, 30)
+        assert exc_info.value.status_code == 504
+
+        # New tasks run in a new pool, while the processes of the old one are killed
+        assert get_process_pool() is not pool
+        assert await run_in_executor(sum, [1, 2, 3]) == 6
+        for process in processes:
+            process.join(timeout=5)
+        assert processes and not any(process.is_alive() for process in processes)
+        assert not executor._process_pool_tasks
+
+
+def get_extraction_pool_size() -> int:
+    """Get the number of processes of the extraction pool of the current process."""
+    return get_extraction_pool()._max_workers
+
+
+@pytest.mark.asyncio
+async def test_extraction_pool_in_request_worker(process_mode):
+    """Test that a request worker forked after the extraction pool was created uses its own, smaller pool."""
+    document = make_pdf(6)
+    with (
+        patch("allie.flowkit.config.CONFIG.pdf_partition_size", 2),
+        patch("allie.flowkit.config.CONFIG.extraction_pool_size", 4),
+        patch("allie.flowkit.config.CONFIG.process_pool_task_timeout", 60),
+    ):
+        assert get_extraction_pool_size() == 4
+        assert await run_in_executor(extract_pdf_text, document) == extract_pdf_text(document)
+        assert await run_in_executor(get_extraction_pool_size) == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_sizes_shared_between_workers(process_mode):
+    """Test that by default the pools of the service workers together start one process per CPU."""
+    with (
+        patch("os.cpu_count", return_value=8),
+        patch("allie.flowkit.config.CONFIG.flowkit_python_workers", 4),
+        patch("allie.flowkit.config.CONFIG.process_pool_size", 0),
+        patch("allie.flowkit.config.CONFIG.extraction_pool_size", 0),
+    ):
+        assert get_process_pool()._max_workers == 2
+        assert get_extraction_pool_size() == 2
+        assert await run_in_executor(get_extraction_pool_size) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["inline", "thread"])
+async def test_run_in_executor_modes(mode):
+    """Test running a function inline and in the thread pool."""
+    with patch("allie.flowkit.config.CONFIG.splitter_execution_mode", mode):
+        assert await run_in_executor(sum, [1, 2, 3]) == 6
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor_invalid_mode():
+    """Test that an unknown execution mode is rejected."""
+    with patch("allie.flowkit.config.CONFIG.splitter_execution_mode", "cluster"):
+        with pytest.raises(ValueError):
+            await run_in_executor(sum, [1, 2, 3])
@@ -0,0 +1,65 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the import time of the service.
+
+The import time is budgeted relative to importing fastapi in the same run,
+which the service cannot do without, so that the budget holds on slow or
+busy machines. The details are measured by ``tests.benchmarks.bench_boot``.
+
+"""
+
+import json
+import subprocess
+import sys
+
+from tests.benchmarks.bench_boot import measure_import
+
+# Budget for importing the service, as a multiple of the import time of fastapi
+IMPORT_TIME_BUDGET = 2.5
+
+# Number of imports measured, of which the fastest is kept to leave out the noise of other processes
+IMPORT_TIME_RUNS = 3
+
+# Packages only needed by some requests, which are imported on first use
+LAZY_PACKAGES = ("azure", "langchain", "pdfminer", "pptx", "yaml")
+
+
+def test_import_time():
+    """Test that importing the service stays within its budget relative to importing fastapi."""
+    import_times = {"allie.flowkit": [], "fastapi": []}
+    for _ in range(IMPORT_TIME_RUNS):
+        for module, times in import_times.items():
+            times.append(measure_import(module)[0])
+    assert min(import_times["allie.flowkit"]) < IMPORT_TIME_BUDGET * min(import_times["fastapi"])
+
+
+def test_lazy_imports():
+    """Test that importing the service neither imports heavy packages nor starts process pools."""
+    statement = (
+        "import json, multiprocessing, sys; import allie.flowkit; "
+        "print(json.dumps([list(sys.modules), len(multiprocessing.active_children())]))"
+    )
+    result = subprocess.run([sys.executable, "-c", statement], capture_output=True, text=True, check=True)
+    modules, child_process_count = json.loads(result.stdout)
+    assert {name.split(".")[0] for name in modules}.isdisjoint(LAZY_PACKAGES)
+    assert child_process_count == 0
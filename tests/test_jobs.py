@@ -0,0 +1,192 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the splitter job endpoints."""
+
+import base64
+import os
+import time
+from unittest.mock import patch
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.utils import jobs
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.benchmarks.corpus import make_pdf
+from tests.conftest import MOCK_API_KEY
+
+client = TestClient(flowkit_service)
+
+
+@pytest.fixture(autouse=True)
+def job_store(tmp_path):
+    """Store the jobs of each test in its temporary directory."""
+    with patch.object(jobs, "_job_store", jobs.JobStore(tmp_path / "jobs")):
+        yield jobs.get_job_store()
+        # The job processes of the next test must see its configuration
+        jobs.shutdown_job_runner()
+
+
+def wait_for_job(job_id: str) -> dict:
+    """Poll a job until it is finished."""
+    for _ in range(600):
+        job = client.get(f"/jobs/{job_id}", headers={"api-key": MOCK_API_KEY}).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(f"Job {job_id} did not finish")
+
+
+def test_pdf_job_matches_splitter():
+    """Test that the chunks of a PDF job, read page by page, are the ones of the splitter endpoint."""
+    payload = {
+        "document_content": base64.b64encode(make_pdf(6)).decode(),
+        "chunk_size": 50,
+        "chunk_overlap": 10,
+    }
+    expected = client.post("/splitter/pdf", json=payload, headers={"api-key": MOCK_API_KEY}).json()
+
+    with patch("allie.flowkit.config.CONFIG.pdf_partition_size", 2):
+        response = client.post("/jobs/splitter/pdf", json=payload, headers={"api-key": MOCK_API_KEY})
+        assert response.status_code == 202
+        job = wait_for_job(response.json()["job_id"])
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 1.0
+    assert job["chunk_count"] == len(expected["chunks"])
+
+    chunks, page_numbers, offset = [], [], 0
+    while offset is not None:
+        page = client.get(
+            f"/jobs/{job['job_id']}/chunks", params={"offset": offset, "limit": 3}, headers={"api-key": MOCK_API_KEY}
+        ).json()
+        assert page["total"] == job["chunk_count"]
+        chunks.extend(page["chunks"])
+        page_numbers.extend(page["page_numbers"])
+        offset = page.get("next_offset")
+    assert chunks == expected["chunks"]
+    assert page_numbers == expected["page_numbers"]
+
+
+def test_python_job():
+    """Test a job splitting Python code."""
+    payload = {
+        "document_content": base64.b64encode(b"def f():\n    return 1\n\n\ndef g():\n    return 2\n").decode(),
+        "chunk_size": 6,
+        "chunk_overlap": 0,
+    }
+    response = client.post("/jobs/splitter/py", json=payload, headers={"api-key": MOCK_API_KEY})
+    job = wait_for_job(response.json()["job_id"])
+    assert job["status"] == "succeeded"
+
+    page = client.get(f"/jobs/{job['job_id']}/chunks", headers={"api-key": MOCK_API_KEY}).json()
+    assert page["chunks"] == ["def f():\n    return 1", "def g():\n    return 2"]
+    assert "next_offset" not in page
+    assert "page_numbers" not in page
+
+    response = client.delete(f"/jobs/{job['job_id']}", headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 204
+    assert client.get(f"/jobs/{job['job_id']}", headers={"api-key": MOCK_API_KEY}).status_code == 404
+
+
+def test_failed_job():
+    """Test that an invalid document fails its job, whose chunks cannot be read."""
+    payload = {"document_content": base64.b64encode(b"not a pdf").decode(), "chunk_size": 50, "chunk_overlap": 10}
+    response = client.post("/jobs/splitter/pdf", json=payload, headers={"api-key": MOCK_API_KEY})
+    job = wait_for_job(response.json()["job_id"])
+    assert job["status"] == "failed"
+    assert job["error"].startswith("Error processing PDF file")
+
+    response = client.get(f"/jobs/{job['job_id']}/chunks", headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 409
+
+
+def test_interrupted_job(job_store):
+    """Test that a queued job without a recent heartbeat is reported as failed."""
+    job = job_store.create(b"", "py", jobs.SplitterRequest(document_content=b"", chunk_size=1, chunk_overlap=0))
+    response = client.get(f"/jobs/{job.job_id}", headers={"api-key": MOCK_API_KEY})
+    assert response.json()["status"] == "queued"
+
+    heartbeat = time.time() - jobs.HEARTBEAT_TIMEOUT - 1
+    os.utime(job_store.directory / job.job_id / jobs.HEARTBEAT_FILE, (heartbeat, heartbeat))
+    response = client.get(f"/jobs/{job.job_id}", headers={"api-key": MOCK_API_KEY})
+    assert response.json()["status"] == "failed"
+
+
+def test_expired_jobs(job_store):
+    """Test that the job monitor deletes the finished jobs older than the retention."""
+    options = jobs.SplitterRequest(document_content=b"", chunk_size=1, chunk_overlap=0)
+    expired, recent = job_store.create(b"", "py", options), job_store.create(b"", "py", options)
+    for job in (expired, recent):
+        job.status = jobs.JobStatus.SUCCEEDED
+        job_store.save(job)
+    with patch("allie.flowkit.config.CONFIG.job_retention", 60):
+        status_path = job_store.directory / expired.job_id / jobs.STATUS_FILE
+        status_path.write_text(expired.model_copy(update={"updated_at": time.time() - 120}).model_dump_json())
+        stop = jobs.threading.Event()
+        stop.set()
+        jobs.monitor_jobs(stop)
+    assert job_store.get(expired.job_id) is None
+    assert job_store.get(recent.job_id) is not None
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"response_format": "spans"},
+        {"include_metadata": True},
+        {"previous_version": "v1"},
+        {"granularities": [{"chunk_size": 2, "chunk_overlap": 0}]},
+    ],
+)
+def test_job_unsupported_options(options):
+    """Test that the options whose output is not stored by jobs are rejected."""
+    payload = {"document_content": "ZGF0YQ==", "chunk_size": 50, "chunk_overlap": 10, **options}
+    response = client.post("/jobs/splitter/py", json=payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Jobs ")
+
+
+@pytest.mark.parametrize(
+    "method, path, status_code",
+    [
+        ("get", "/jobs/0123456789abcdef0123456789abcdef", 404),
+        ("get", "/jobs/not-a-job", 404),
+        ("delete", "/jobs/0123456789abcdef0123456789abcdef", 404),
+        ("post", "/jobs/splitter/docx", 404),
+    ],
+)
+def test_job_not_found(method, path, status_code):
+    """Test requests for unknown jobs and document types."""
+    payload = {"document_content": "ZGF0YQ==", "chunk_size": 50, "chunk_overlap": 10}
+    kwargs = {"json": payload} if method == "post" else {}
+    response = getattr(client, method)(path, headers={"api-key": MOCK_API_KEY}, **kwargs)
+    assert response.status_code == status_code
+
+
+def test_job_invalid_api_key():
+    """Test that jobs require a valid API key."""
+    payload = {"document_content": "ZGF0YQ==", "chunk_size": 50, "chunk_overlap": 10}
+    response = client.post("/jobs/splitter/py", json=payload, headers={"api-key": "invalid"})
+    assert response.status_code == 401
+    response = client.get("/jobs/0123456789abcdef0123456789abcdef", headers={"api-key": "invalid"})
+    assert response.status_code == 401
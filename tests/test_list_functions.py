@@ -22,14 +22,25 @@
 """Test module for list functions."""
 
 import re
+from unittest.mock import patch
 
 from allie.flowkit import flowkit_service
+from allie.flowkit.flowkit_service import function_map
+from allie.flowkit.models.functions import FunctionCategory
+from allie.flowkit.models.splitter import ChunkGranularity, GranularityChunks
+from allie.flowkit.utils.decorators import category
 from fastapi.testclient import TestClient
 import pytest
 
 # Initialize the test client
 client = TestClient(flowkit_service)
 
+# Schemas of the nested models of the splitter request and response
+SPLITTER_DEFINITIONS = {
+    "ChunkGranularity": ChunkGranularity.model_json_schema(),
+    "GranularityChunks": GranularityChunks.model_json_schema(),
+}
+
 
 def normalize_text(text):
     """Remove extra spaces, newlines, and indentation."""
@@ -64,14 +75,41 @@ async def test_list_functions():
             An object containing 'document_content' in Base64,
             'chunk_size', and 'chunk_overlap'
             api_key : str
-            The API key for authentication.""",
+            The API key for authentication.
+            accept : str | None
+            'application/x-ndjson' or 'text/event-stream' to stream the chunks.""",
             "inputs": [
                 {"name": "document_content", "type": "string(binary)"},
                 {"name": "chunk_size", "type": "integer"},
                 {"name": "chunk_overlap", "type": "integer"},
+                {"name": "split_by_slide", "type": "boolean"},
+                {"name": "ppt_backend", "type": "string"},
+                {"name": "length_function", "type": "string"},
+                {"name": "response_format", "type": "string"},
+                {"name": "previous_version", "type": "string"},
+                {"name": "include_metadata", "type": "boolean"},
+                {"name": "boilerplate", "type": "string"},
+                {"name": "dedup_collection", "type": "string"},
+                {"name": "dedup_mode", "type": "string"},
+                {"name": "granularities", "type": "array<ChunkGranularity>"},
+            ],
+            "outputs": [
+                {"name": "chunks", "type": "array<string>"},
+                {"name": "slide_numbers", "type": "array<integer>"},
+                {"name": "page_numbers", "type": "array<integer>"},
+                {"name": "text", "type": "string"},
+                {"name": "spans", "type": "array<array<integer>>"},
+                {"name": "document_hash", "type": "string"},
+                {"name": "previous_chunk_indices", "type": "array<integer>"},
+                {"name": "removed_chunk_indices", "type": "array<integer>"},
+                {"name": "chunk_hashes", "type": "array<string>"},
+                {"name": "chunk_ids", "type": "array<string>"},
+                {"name": "boilerplate_characters_removed", "type": "integer"},
+                {"name": "duplicate_chunks", "type": "array<boolean>"},
+                {"name": "duplicate_chunk_count", "type": "integer"},
+                {"name": "granularities", "type": "array<GranularityChunks>"},
             ],
-            "outputs": [{"name": "chunks", "type": "array<string>"}],
-            "definitions": {},
+            "definitions": SPLITTER_DEFINITIONS,
         },
         {
             "name": "split_py",
@@ -86,6 +124,8 @@ async def test_list_functions():
             'chunk_size', and 'chunk_overlap'
             api_key : str
             The API key for authentication.
+            accept : str | None
+            'application/x-ndjson' or 'text/event-stream' to stream the chunks.
             Returns
             -------
             SplitterResponse
@@ -94,9 +134,34 @@ async def test_list_functions():
                 {"name": "document_content", "type": "string(binary)"},
                 {"name": "chunk_size", "type": "integer"},
                 {"name": "chunk_overlap", "type": "integer"},
+                {"name": "split_by_slide", "type": "boolean"},
+                {"name": "ppt_backend", "type": "string"},
+                {"name": "length_function", "type": "string"},
+                {"name": "response_format", "type": "string"},
+                {"name": "previous_version", "type": "string"},
+                {"name": "include_metadata", "type": "boolean"},
+                {"name": "boilerplate", "type": "string"},
+                {"name": "dedup_collection", "type": "string"},
+                {"name": "dedup_mode", "type": "string"},
+                {"name": "granularities", "type": "array<ChunkGranularity>"},
             ],
-            "outputs": [{"name": "chunks", "type": "array<string>"}],
-            "definitions": {},
+            "outputs": [
+                {"name": "chunks", "type": "array<string>"},
+                {"name": "slide_numbers", "type": "array<integer>"},
+                {"name": "page_numbers", "type": "array<integer>"},
+                {"name": "text", "type": "string"},
+                {"name": "spans", "type": "array<array<integer>>"},
+                {"name": "document_hash", "type": "string"},
+                {"name": "previous_chunk_indices", "type": "array<integer>"},
+                {"name": "removed_chunk_indices", "type": "array<integer>"},
+                {"name": "chunk_hashes", "type": "array<string>"},
+                {"name": "chunk_ids", "type": "array<string>"},
+                {"name": "boilerplate_characters_removed", "type": "integer"},
+                {"name": "duplicate_chunks", "type": "array<boolean>"},
+                {"name": "duplicate_chunk_count", "type": "integer"},
+                {"name": "granularities", "type": "array<GranularityChunks>"},
+            ],
+            "definitions": SPLITTER_DEFINITIONS,
         },
         {
             "name": "split_pdf",
@@ -111,6 +176,8 @@ async def test_list_functions():
             'chunk_size', and 'chunk_overlap'.
             api_key : str
             The API key for authentication.
+            accept : str | None
+            'application/x-ndjson' or 'text/event-stream' to stream the chunks.
             Returns
             -------
             SplitterResponse
@@ -119,9 +186,34 @@ async def test_list_functions():
                 {"name": "document_content", "type": "string(binary)"},
                 {"name": "chunk_size", "type": "integer"},
                 {"name": "chunk_overlap", "type": "integer"},
+                {"name": "split_by_slide", "type": "boolean"},
+                {"name": "ppt_backend", "type": "string"},
+                {"name": "length_function", "type": "string"},
+                {"name": "response_format", "type": "string"},
+                {"name": "previous_version", "type": "string"},
+                {"name": "include_metadata", "type": "boolean"},
+                {"name": "boilerplate", "type": "string"},
+                {"name": "dedup_collection", "type": "string"},
+                {"name": "dedup_mode", "type": "string"},
+                {"name": "granularities", "type": "array<ChunkGranularity>"},
+            ],
+            "outputs": [
+                {"name": "chunks", "type": "array<string>"},
+                {"name": "slide_numbers", "type": "array<integer>"},
+                {"name": "page_numbers", "type": "array<integer>"},
+                {"name": "text", "type": "string"},
+                {"name": "spans", "type": "array<array<integer>>"},
+                {"name": "document_hash", "type": "string"},
+                {"name": "previous_chunk_indices", "type": "array<integer>"},
+                {"name": "removed_chunk_indices", "type": "array<integer>"},
+                {"name": "chunk_hashes", "type": "array<string>"},
+                {"name": "chunk_ids", "type": "array<string>"},
+                {"name": "boilerplate_characters_removed", "type": "integer"},
+                {"name": "duplicate_chunks", "type": "array<boolean>"},
+                {"name": "duplicate_chunk_count", "type": "integer"},
+                {"name": "granularities", "type": "array<GranularityChunks>"},
             ],
-            "outputs": [{"name": "chunks", "type": "array<string>"}],
-            "definitions": {},
+            "definitions": SPLITTER_DEFINITIONS,
         },
     ]
 
@@ -135,3 +227,58 @@ async def test_list_functions():
     response = client.get("/", headers={"api-key": "invalid_api_key"})
     assert response.status_code == 401
     assert response.json() == {"detail": "Invalid API key"}
+
+
+def test_list_functions_etag():
+    """Test that an unchanged list of functions is not sent again."""
+    response = client.get("/", headers={"api-key": "test_api_key"})
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    response = client.get("/", headers={"api-key": "test_api_key", "if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get("/", headers={"api-key": "test_api_key", "if-none-match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+
+    response = client.get("/", headers={"api-key": "test_api_key", "if-none-match": '"other"'})
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+
+    response = client.get("/", headers={"api-key": "invalid_api_key", "if-none-match": etag})
+    assert response.status_code == 401
+
+
+def test_list_functions_catalog_rebuilt():
+    """Test that the list of functions is rebuilt when the functions change."""
+    etag = client.get("/", headers={"api-key": "test_api_key"}).headers["etag"]
+    with patch.dict(function_map):
+        del function_map["split_batch"]
+        response = client.get("/", headers={"api-key": "test_api_key", "if-none-match": etag})
+        assert response.status_code == 200
+        assert "split_batch" not in [function["name"] for function in response.json()]
+    response = client.get("/", headers={"api-key": "test_api_key", "if-none-match": etag})
+    assert response.status_code == 304
+
+
+def test_decorators_register_without_wrapping():
+    """Test that the decorators register endpoints as they are, without wrapping them."""
+    assert list(function_map) == ["split_ppt", "split_py", "split_pdf", "split_batch"]
+    for route in flowkit_service.routes:
+        if route.path == "/splitter/ppt":
+            assert route.endpoint is function_map["split_ppt"]
+    assert not hasattr(function_map["split_ppt"], "__wrapped__")
+    assert function_map["split_ppt"].display_name == "Split PPT"
+
+
+def test_register_function_name_conflict():
+    """Test that registering two functions with the same name fails."""
+
+    async def split_ppt():
+        """Endpoint with the name of a registered one."""
+
+    with pytest.raises(ValueError, match="split_ppt"):
+        category(FunctionCategory.GENERIC)(split_ppt)
+    assert function_map["split_ppt"] is not split_ppt
@@ -0,0 +1,206 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the Prometheus metrics."""
+
+import base64
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.utils.executor import run_in_executor, shutdown_process_pool
+from allie.flowkit.utils.metrics import current_endpoint
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+
+client = TestClient(flowkit_service)
+
+
+def get_samples(metrics: str) -> dict[tuple, float]:
+    """Parse metrics into the value of each sample, keyed by name and sorted labels."""
+    return {
+        (sample.name, *sorted(sample.labels.items())): sample.value
+        for family in text_string_to_metric_families(metrics)
+        for sample in family.samples
+    }
+
+
+def test_metrics():
+    """Test that splitter requests are counted and their stages timed."""
+    before = get_samples(client.get("/metrics", headers={"api-key": MOCK_API_KEY}).text)
+    documents = [f"def hello_world_{i}():\n    print('Hello, world!')\n".encode() for i in range(2)]
+    for document in documents:
+        # Distinct documents, so that no result comes from the cache
+        request_payload = {
+            "document_content": base64.b64encode(document).decode(),
+            "chunk_size": 50,
+            "chunk_overlap": 5,
+        }
+        response = client.post("/splitter/py", json=request_payload, headers={"api-key": MOCK_API_KEY})
+        assert response.status_code == 200
+    response = client.get("/metrics", headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    after = get_samples(response.text)
+
+    def increase(name: str, **labels) -> float:
+        key = (name, *sorted(labels.items()))
+        return after.get(key, 0) - before.get(key, 0)
+
+    assert increase("flowkit_requests_total", endpoint="/splitter/py", status_code="200") == 2
+    assert after[("flowkit_requests_in_flight", ("endpoint", "/splitter/py"))] == 0
+    assert increase("flowkit_request_duration_seconds_count", endpoint="/splitter/py") == 2
+    for stage in ("decode", "extract", "split", "serialize"):
+        assert increase("flowkit_splitter_stage_duration_seconds_count", endpoint="/splitter/py", stage=stage) == 2
+    assert increase("flowkit_splitter_document_size_bytes_sum", document_type="py") == sum(
+        len(document) for document in documents
+    )
+    assert increase("flowkit_splitter_chunks_sum", document_type="py") == 2
+
+
+def get_current_endpoint() -> str:
+    """Get the endpoint labelling the stage timings of the current process."""
+    return current_endpoint.get()
+
+
+@pytest.mark.asyncio
+async def test_metrics_process_pool():
+    """Test that the stages timed in a process pool worker are labelled with the endpoint of the request."""
+    with (
+        patch("allie.flowkit.config.CONFIG.splitter_execution_mode", "process"),
+        patch("allie.flowkit.config.CONFIG.process_pool_size", 1),
+    ):
+        token = current_endpoint.set("/splitter/py")
+        try:
+            assert await run_in_executor(get_current_endpoint) == "/splitter/py"
+        finally:
+            current_endpoint.reset(token)
+            shutdown_process_pool()
+
+
+def test_metrics_api_key():
+    """Test that the metrics require the API key unless configured otherwise."""
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"api-key": "invalid"}).status_code == 401
+    with patch("allie.flowkit.config.CONFIG.metrics_require_api_key", False):
+        assert client.get("/metrics").status_code == 200
+
+
+def test_metrics_unmatched_route():
+    """Test that requests to unknown paths share a single series."""
+    client.get("/unknown/path")
+    samples = get_samples(client.get("/metrics", headers={"api-key": MOCK_API_KEY}).text)
+    assert samples[("flowkit_requests_total", ("endpoint", "unmatched"), ("status_code", "404"))] >= 1
+    assert not any("/unknown/path" in str(key) for key in samples)
+
+
+def test_metrics_multiprocess(tmp_path):
+    """Test that the metrics of several processes are aggregated."""
+    environment = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    record = (
+        "from allie.flowkit.utils.metrics import CHUNK_COUNT, current_endpoint, time_stage\n"
+        "CHUNK_COUNT.labels('pdf').observe(10)\n"
+        "current_endpoint.set('/splitter/pdf')\n"
+        "with time_stage('extract'):\n"
+        "    pass\n"
+    )
+    for _ in range(3):
+        subprocess.run([sys.executable, "-c", record], env=environment, check=True)
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from allie.flowkit.utils.metrics import generate_metrics; print(generate_metrics().decode())",
+        ],
+        env=environment,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    samples = get_samples(result.stdout)
+    assert samples[("flowkit_splitter_chunks_sum", ("document_type", "pdf"))] == 30
+    assert (
+        samples[("flowkit_splitter_stage_duration_seconds_count", ("endpoint", "/splitter/pdf"), ("stage", "extract"))]
+        == 3
+    )
+
+
+# Handles a request in a uvicorn worker and writes the metrics it reports to the file named in the environment
+WORKER = """
+import base64
+import os
+from pathlib import Path
+
+from allie.flowkit.flowkit_service import flowkit_service
+from fastapi.testclient import TestClient
+
+client = TestClient(flowkit_service)
+headers = {"api-key": "test_api_key"}
+document = base64.b64encode(b"print('Hello, world!')").decode()
+payload = {"document_content": document, "chunk_size": 50, "chunk_overlap": 5}
+client.post("/splitter/py", json=payload, headers=headers).raise_for_status()
+Path(os.environ["METRICS_OUTPUT_PATH"]).write_text(client.get("/metrics", headers=headers).text)
+"""
+
+# Starts the service through its entrypoint, running the workers like uvicorn: in this process for a single one
+MAIN = """
+import subprocess
+import sys
+from unittest.mock import patch
+
+from allie.flowkit.__main__ import main
+
+
+def run(app, workers, **kwargs):
+    for _ in range(workers):
+        if workers == 1:
+            exec(WORKER)
+        else:
+            subprocess.run([sys.executable, "-c", WORKER], check=True)
+
+
+with patch("uvicorn.run", run):
+    main()
+"""
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_metrics_main(tmp_path, workers):
+    """Test that the metrics of the service started through its entrypoint report the requests of all workers."""
+    pytest.importorskip("uvicorn")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(f"FLOWKIT_PYTHON_API_KEY: test_api_key\nMETRICS_DIRECTORY: {tmp_path / 'metrics'}\n")
+    environment = {key: value for key, value in os.environ.items() if key != "PROMETHEUS_MULTIPROC_DIR"}
+    metrics_path = tmp_path / "metrics.txt"
+    environment.update(ALLIE_CONFIG_PATH=str(config_path), METRICS_OUTPUT_PATH=str(metrics_path))
+    subprocess.run(
+        [sys.executable, "-c", f"WORKER = {WORKER!r}\n{MAIN}", "--workers", str(workers)],
+        env=environment,
+        check=True,
+    )
+    samples = get_samples(metrics_path.read_text())
+    assert samples[("flowkit_requests_total", ("endpoint", "/splitter/py"), ("status_code", "200"))] == workers
@@ -0,0 +1,83 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the PDF extraction utilities."""
+
+import io
+from pathlib import Path
+from unittest.mock import patch
+
+from allie.flowkit.endpoints.splitter import extract_pdf_text
+from allie.flowkit.utils.executor import shutdown_process_pool
+from allie.flowkit.utils.pdf import count_pdf_pages, extract_pdf_pages, extract_pdf_text_parallel
+from pdfminer.high_level import extract_text
+import pytest
+
+from tests.benchmarks.corpus import make_pdf
+
+
+@pytest.fixture(scope="module")
+def pdf_document():
+    """Create a PDF document of seven pages."""
+    return make_pdf(page_count=7, lines_per_page=5)
+
+
+@pytest.fixture
+def extraction_pool():
+    """Extract PDF documents with two worker processes."""
+    with patch("allie.flowkit.config.CONFIG.extraction_pool_size", 2):
+        yield
+    shutdown_process_pool()
+
+
+def test_count_pdf_pages(pdf_document):
+    """Test counting the pages of a PDF document."""
+    assert count_pdf_pages(io.BytesIO(pdf_document)) == 7
+
+
+def test_extract_pdf_pages_concatenate(pdf_document):
+    """Test that page ranges concatenate to the text of the whole document."""
+    ranges = [(0, 3), (3, 6), (6, 7)]
+    text = "".join(extract_pdf_pages(pdf_document, start, stop) for start, stop in ranges)
+    assert text == extract_text(io.BytesIO(pdf_document))
+    assert extract_pdf_pages(pdf_document, 1, 2).startswith("Page 2\n")
+
+
+def test_extract_pdf_text_parallel(pdf_document, extraction_pool, tmp_path):
+    """Test extracting a PDF document in parallel from memory and from disk."""
+    expected_text = extract_text(io.BytesIO(pdf_document))
+    spool_directory = tmp_path / "spool"
+    spool_directory.mkdir()
+    with patch("allie.flowkit.config.CONFIG.upload_spool_directory", str(spool_directory)):
+        assert extract_pdf_text_parallel(pdf_document, 7, 2) == expected_text
+    assert not any(spool_directory.iterdir())
+
+    path = tmp_path / "document.pdf"
+    path.write_bytes(pdf_document)
+    assert extract_pdf_text_parallel(path, 7, 3) == expected_text
+
+
+def test_extract_pdf_text_partitioned(extraction_pool):
+    """Test that partitioned extraction of the test document gives the same text."""
+    pdf_document = Path("./tests/test_files/test_document.pdf").read_bytes()
+    with patch("allie.flowkit.config.CONFIG.pdf_partition_size", 1):
+        assert extract_pdf_text(pdf_document) == extract_text(io.BytesIO(pdf_document))
@@ -0,0 +1,124 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the PowerPoint extraction utilities."""
+
+import base64
+import io
+from pathlib import Path
+from unittest.mock import patch
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.endpoints.splitter import iter_slide_texts
+from allie.flowkit.utils.executor import shutdown_process_pool
+from allie.flowkit.utils.ppt import extract_ppt_slides_from_xml
+from fastapi.testclient import TestClient
+from pptx import Presentation
+from pptx.util import Inches
+import pytest
+
+from tests.benchmarks.corpus import make_pptx
+from tests.conftest import MOCK_API_KEY
+
+client = TestClient(flowkit_service)
+
+
+def make_mixed_pptx() -> bytes:
+    """Make a PowerPoint document with text in a group, a table, and a reordered slide."""
+    presentation = Presentation()
+    for title in ["First", "Second"]:
+        slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+        slide.shapes.title.text = title
+        group = slide.shapes.add_group_shape()
+        group.shapes.add_textbox(Inches(1), Inches(1), Inches(2), Inches(1)).text_frame.text = "Grouped"
+        table = slide.shapes.add_table(1, 1, Inches(1), Inches(3), Inches(2), Inches(1)).table
+        table.cell(0, 0).text = "Cell"
+        text_frame = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(4), Inches(1)).text_frame
+        text_frame.text = f"{title} body"
+        text_frame.add_paragraph().text = ""
+    # Move the second slide first
+    slide_ids = presentation.slides._sldIdLst
+    slide_ids.insert(0, slide_ids[1])
+    output = io.BytesIO()
+    presentation.save(output)
+    return output.getvalue()
+
+
+def pptx_slides(document: bytes) -> list[str]:
+    """Extract the text of each slide through the python-pptx object model."""
+    return list(iter_slide_texts(Presentation(io.BytesIO(document))))
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        Path("./tests/test_files/test_presentation.pptx").read_bytes(),
+        make_pptx(slide_count=4),
+        make_mixed_pptx(),
+    ],
+)
+def test_xml_backend_matches_pptx_backend(document):
+    """Test that reading the slide XML parts gives the python-pptx text."""
+    assert extract_ppt_slides_from_xml(document) == pptx_slides(document)
+
+
+def test_xml_backend_parallel(tmp_path):
+    """Test parsing the slides in parallel worker processes."""
+    document = make_pptx(slide_count=5)
+    path = tmp_path / "document.pptx"
+    path.write_bytes(document)
+    with patch("allie.flowkit.config.CONFIG.extraction_pool_size", 2):
+        assert extract_ppt_slides_from_xml(document, partition_size=2) == pptx_slides(document)
+        assert extract_ppt_slides_from_xml(path, partition_size=3) == pptx_slides(document)
+    shutdown_process_pool()
+
+
+def test_split_ppt_xml_backend():
+    """Test selecting the XML backend in the request and in the configuration."""
+    request_payload = {
+        "document_content": base64.b64encode(make_pptx(slide_count=3)).decode(),
+        "chunk_size": 40,
+        "chunk_overlap": 5,
+    }
+    expected = client.post("/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY}).json()
+
+    response = client.post(
+        "/splitter/ppt", json={**request_payload, "ppt_backend": "xml"}, headers={"api-key": MOCK_API_KEY}
+    )
+    assert response.json() == expected
+
+    with patch("allie.flowkit.config.CONFIG.ppt_extraction_backend", "xml"):
+        response = client.post("/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.json() == expected
+
+
+def test_split_ppt_xml_backend_invalid_document():
+    """Test that a document that is not a PowerPoint archive is rejected."""
+    request_payload = {
+        "document_content": base64.b64encode(b"not a pptx").decode(),
+        "chunk_size": 40,
+        "chunk_overlap": 5,
+        "ppt_backend": "xml",
+    }
+    response = client.post("/splitter/ppt", json=request_payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Error processing PowerPoint file")
@@ -0,0 +1,171 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the incremental splitting of revised documents."""
+
+import base64
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.utils import revisions
+from allie.flowkit.utils.cache import ChunkCache
+from allie.flowkit.utils.revisions import Region, diff_units, plan_regions
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.benchmarks.corpus import make_pdf, make_python_code, make_pptx
+from tests.conftest import MOCK_API_KEY
+
+client = TestClient(flowkit_service)
+
+
+@pytest.fixture(autouse=True)
+def revision_store(tmp_path, monkeypatch):
+    """Store the revisions of each test in its temporary directory, without the chunk cache."""
+    monkeypatch.setattr(revisions, "_revision_store", revisions.RevisionStore(str(tmp_path)))
+    monkeypatch.setattr("allie.flowkit.utils.cache._chunk_cache", ChunkCache(max_size=0))
+
+
+def split(document_type: str, document: bytes, **options) -> dict:
+    """Split a document and return the response."""
+    payload = {"document_content": base64.b64encode(document).decode(), "chunk_size": 40, "chunk_overlap": 10}
+    response = client.post(f"/splitter/{document_type}", json={**payload, **options}, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def check_revision(previous: dict, revision: dict):
+    """Check that unchanged chunks are the chunks of the previous version, each matched once."""
+    indices = [index for index in revision["previous_chunk_indices"] if index is not None]
+    assert len(indices) == len(set(indices))
+    assert sorted(indices + revision["removed_chunk_indices"]) == list(range(len(previous["chunks"])))
+    for chunk, index in zip(revision["chunks"], revision["previous_chunk_indices"]):
+        if index is not None:
+            assert chunk == previous["chunks"][index]
+
+
+def test_split_python_revision():
+    """Test that an edit in the middle of Python code only adds and removes the chunks around it."""
+    code = make_python_code(8000)
+    lines = code.splitlines(keepends=True)
+    lines[len(lines) // 2] = "    edited = True  # A new line in the middle\n"
+    revised_code = "".join(lines)
+
+    previous = split("py", code.encode())
+    revision = split("py", revised_code.encode(), previous_version=previous["document_hash"])
+    check_revision(previous, revision)
+    added = [chunk for chunk, index in zip(revision["chunks"], revision["previous_chunk_indices"]) if index is None]
+    assert any("edited = True" in chunk for chunk in added)
+    assert len(added) <= 4
+    assert 0 < len(revision["removed_chunk_indices"]) <= 4
+    assert revision["document_hash"] != previous["document_hash"]
+
+    # The revision can be the previous version of the next one
+    again = split("py", revised_code.encode(), previous_version=revision["document_hash"])
+    assert again["chunks"] == revision["chunks"]
+    assert again["previous_chunk_indices"] == list(range(len(revision["chunks"])))
+    assert again["removed_chunk_indices"] == []
+
+
+def test_split_pdf_revision():
+    """Test that a page added to a PDF document keeps the chunks of the other pages and their page numbers."""
+    previous = split("pdf", make_pdf(4))
+    revision = split("pdf", make_pdf(5), previous_version=previous["document_hash"])
+    check_revision(previous, revision)
+    full = split("pdf", make_pdf(5))
+    assert revision["page_numbers"][-1] == 5
+    for index, page_number in zip(revision["previous_chunk_indices"], revision["page_numbers"]):
+        if index is not None:
+            assert page_number == previous["page_numbers"][index]
+    assert revision["chunks"][: len(previous["chunks"]) - 2] == full["chunks"][: len(previous["chunks"]) - 2]
+
+
+def test_split_ppt_revision_by_slide():
+    """Test that slides split on their own are split again only if they changed."""
+    previous = split("ppt", make_pptx(6), split_by_slide=True)
+    revision = split("ppt", make_pptx(7), split_by_slide=True, previous_version=previous["document_hash"])
+    full = split("ppt", make_pptx(7), split_by_slide=True)
+    check_revision(previous, revision)
+    assert revision["chunks"] == full["chunks"]
+    assert revision["slide_numbers"] == full["slide_numbers"]
+    assert revision["removed_chunk_indices"] == []
+    assert all(
+        (index is None) == (slide_number == 7)
+        for index, slide_number in zip(revision["previous_chunk_indices"], revision["slide_numbers"])
+    )
+
+
+def test_split_revision_spans():
+    """Test the spans response format of a revision."""
+    previous = split("py", b"def f():\n    return 1\n")
+    revision = split(
+        "py",
+        b"def f():\n    return 1\n\n\ndef g():\n    return 2\n",
+        previous_version=previous["document_hash"],
+        response_format="spans",
+    )
+    assert [revision["text"][start:end] for start, end in revision["spans"]] == [
+        "def f():\n    return 1",
+        "def g():\n    return 2",
+    ]
+    assert revision["previous_chunk_indices"] == [0, None]
+
+
+def test_split_revision_errors(monkeypatch):
+    """Test revisions of unknown versions, streamed, or without a store."""
+    payload = {"document_content": "ZGF0YQ==", "chunk_size": 40, "chunk_overlap": 10, "previous_version": "0" * 64}
+    response = client.post("/splitter/py", json=payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Previous version not found: {'0' * 64}"
+
+    headers = {"api-key": MOCK_API_KEY, "accept": "application/x-ndjson"}
+    response = client.post("/splitter/py", json=payload, headers=headers)
+    assert response.status_code == 400
+
+    monkeypatch.setattr(revisions, "_revision_store", revisions.RevisionStore(""))
+    response = client.post("/splitter/py", json=payload, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Incremental splitting is not enabled"
+    assert "document_hash" not in {key for key, value in split("py", b"x = 1").items() if value is not None}
+
+
+def test_diff_units():
+    """Test finding the changed regions of two versions of a text."""
+    previous = ["a\n", "b\n", "c\n", "d\n"]
+    assert diff_units(previous, previous) == []
+    assert diff_units(previous, ["a\n", "B\n", "c\n", "d\n", "e\n"]) == [(2, 4, 2, 4), (8, 8, 8, 10)]
+    assert diff_units(previous, ["a\n", "d\n"]) == [(2, 6, 2, 2)]
+
+
+def test_plan_regions():
+    """Test that regions extend to the chunks they touch and are merged when they meet."""
+    spans = [[0, 10], [8, 20], [22, 30], [32, 40]]
+    regions, affected = plan_regions(spans, [(12, 14, 12, 16), (21, 21, 23, 25)], expand=True)
+    assert affected == {1}
+    assert regions == [Region(8, 20, 8, 22), Region(21, 21, 23, 25)]
+
+    regions, affected = plan_regions(spans, [(12, 14, 12, 16), (20, 22, 22, 23)], expand=True)
+    assert affected == {1, 2}
+    assert regions == [Region(8, 30, 8, 31)]
+
+    regions, affected = plan_regions(spans, [(20, 30, 20, 25)], expand=False)
+    assert affected == {2}
+    assert regions == [Region(20, 30, 20, 25)]
@@ -0,0 +1,80 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the recursive text splitter."""
+
+from allie.flowkit.utils.text_splitter import PYTHON_SEPARATORS, TEXT_SEPARATORS, RecursiveTextSplitter
+from langchain.text_splitter import PythonCodeTextSplitter, RecursiveCharacterTextSplitter
+import pytest
+
+from tests.benchmarks.corpus import make_python_code, make_text
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(1, 0), (7, 3), (40, 0), (400, 40), (2000, 2000)])
+def test_same_chunks_as_langchain(chunk_size, chunk_overlap):
+    """Test that text is split into the same chunks as with langchain."""
+    text = make_text(20000, seed=chunk_size)
+    flat_text = text.replace("\n", " ")
+    code = make_python_code(20000, seed=chunk_size)
+    text_splitter = RecursiveTextSplitter(chunk_size, chunk_overlap, TEXT_SEPARATORS)
+    python_splitter = RecursiveTextSplitter(chunk_size, chunk_overlap, PYTHON_SEPARATORS)
+    langchain_kwargs = {"chunk_size": chunk_size, "chunk_overlap": chunk_overlap}
+    assert text_splitter.split_text(text) == RecursiveCharacterTextSplitter(**langchain_kwargs).split_text(text)
+    assert text_splitter.split_text(flat_text) == RecursiveCharacterTextSplitter(**langchain_kwargs).split_text(
+        flat_text
+    )
+    assert python_splitter.split_text(code) == PythonCodeTextSplitter(**langchain_kwargs).split_text(code)
+
+
+def test_same_chunks_as_langchain_with_length_function():
+    """Test that text measured with a length function is split into the same chunks as with langchain."""
+    text = make_text(20000)
+
+    def count_words(value: str) -> int:
+        return len(value.split())
+
+    splitter = RecursiveTextSplitter(50, 10, TEXT_SEPARATORS, count_words)
+    langchain_splitter = RecursiveCharacterTextSplitter(chunk_size=50, chunk_overlap=10, length_function=count_words)
+    assert splitter.split_text(text) == langchain_splitter.split_text(text)
+
+
+def test_split_spans():
+    """Test that chunk offsets delimit the stripped chunks in the text."""
+    text = "  first paragraph\n\nsecond paragraph  \n\n\n third one"
+    splitter = RecursiveTextSplitter(20, 0)
+    spans = splitter.split_spans(text)
+    assert [text[start:end] for start, end in spans] == ["first paragraph", "second paragraph", "third one"]
+    assert spans[0] == (2, 17)
+
+
+def test_separators_without_match():
+    """Test that text without any of the separators is kept whole."""
+    splitter = RecursiveTextSplitter(5, 0, ("\n",))
+    assert splitter.split_text("abcdefgh") == ["abcdefgh"]
+    assert splitter.split_text("") == []
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(0, 0), (10, -1), (10, 11)])
+def test_invalid_chunk_parameters(chunk_size, chunk_overlap):
+    """Test that invalid chunk parameters are rejected."""
+    with pytest.raises(ValueError):
+        RecursiveTextSplitter(chunk_size, chunk_overlap)
@@ -0,0 +1,132 @@
+# Copyright (C) 2024 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Test module for the tokenizer."""
+
+import base64
+from unittest.mock import patch
+
+from allie.flowkit import flowkit_service
+from allie.flowkit.utils import tokenizer
+from allie.flowkit.utils.tokenizer import UNKNOWN_TOKEN, WordPieceTokenizer
+from fastapi.testclient import TestClient
+import pytest
+
+from tests.conftest import MOCK_API_KEY
+
+client = TestClient(flowkit_service)
+
+VOCABULARY = [
+    "[UNK]",
+    "the",
+    "quick",
+    "brown",
+    "fox",
+    "jump",
+    "##s",
+    "##ed",
+    "over",
+    "lazy",
+    "dog",
+    ".",
+    ",",
+    "中",
+    "文",
+]
+
+
+@pytest.fixture
+def vocabulary_file(tmp_path):
+    """Write a small vocabulary file and use it as the configured tokenizer."""
+    path = tmp_path / "vocab.txt"
+    path.write_text("\n".join(VOCABULARY) + "\n", encoding="utf-8")
+    with (
+        patch("allie.flowkit.config.CONFIG.tokenizer_vocabulary_file", str(path)),
+        patch.object(tokenizer, "_tokenizer", None),
+    ):
+        yield path
+
+
+def test_tokenize(vocabulary_file):
+    """Test that words are split into the longest pieces of the vocabulary."""
+    wordpiece = WordPieceTokenizer.from_file(str(vocabulary_file))
+    assert wordpiece.tokenize("The quick fox jumped.") == ["the", "quick", "fox", "jump", "##ed", "."]
+    assert wordpiece.tokenize("jumps, dogs") == ["jump", "##s", ",", "dog", "##s"]
+    assert wordpiece.tokenize("中文") == ["中", "文"]
+    assert wordpiece.tokenize("zebra fox") == [UNKNOWN_TOKEN, "fox"]
+
+
+def test_count_tokens(vocabulary_file):
+    """Test that token counts match the tokens and are memoized."""
+    wordpiece = WordPieceTokenizer.from_file(str(vocabulary_file))
+    text = "The quick brown fox jumps over the lazy dog."
+    assert wordpiece.count_tokens(text) == len(wordpiece.tokenize(text)) == 11
+    assert wordpiece.count_tokens(text) == 11
+    assert wordpiece.count_tokens.cache_info().hits == 1
+
+
+def test_case_sensitive(vocabulary_file):
+    """Test that cased tokenizers keep the case of the text."""
+    wordpiece = WordPieceTokenizer.from_file(str(vocabulary_file), lowercase=False)
+    assert wordpiece.tokenize("The fox") == [UNKNOWN_TOKEN, "fox"]
+
+
+def test_split_by_tokens(vocabulary_file):
+    """Test that chunks measured in tokens fit the chunk size."""
+    text = " ".join(["The quick brown fox jumps over the lazy dog."] * 20)
+    request = {
+        "document_content": base64.b64encode(text.encode()).decode(),
+        "chunk_size": 25,
+        "chunk_overlap": 5,
+        "length_function": "tokens",
+    }
+    response = client.post("/splitter/py", json=request, headers={"api-key": MOCK_API_KEY})
+    assert response.status_code == 200
+    chunks = response.json()["chunks"]
+    assert len(chunks) > 1
+    wordpiece = tokenizer.get_tokenizer()
+    assert all(wordpiece.count_tokens(chunk) <= 25 for chunk in chunks)
+
+
+@pytest.mark.parametrize("accept", [None, "application/x-ndjson"])
+@pytest.mark.parametrize(
+    "vocabulary_path, status_code, message",
+    [("", 400, "TOKENIZER_VOCABULARY_FILE"), ("missing/vocab.txt", 500, "vocabulary file cannot be read")],
+)
+def test_split_by_tokens_without_vocabulary(tmp_path, accept, vocabulary_path, status_code, message):
+    """Test that splitting by tokens fails without a readable vocabulary, also before streaming."""
+    request = {
+        "document_content": base64.b64encode(b"print('hello')").decode(),
+        "chunk_size": 10,
+        "chunk_overlap": 0,
+        "length_function": "tokens",
+    }
+    headers = {"api-key": MOCK_API_KEY, **({"accept": accept} if accept else {})}
+    with (
+        patch(
+            "allie.flowkit.config.CONFIG.tokenizer_vocabulary_file", vocabulary_path and str(tmp_path / vocabulary_path)
+        ),
+        patch.object(tokenizer, "_tokenizer", None),
+    ):
+        response = client.post("/splitter/py", json=request, headers=headers)
+    assert response.status_code == status_code
+    assert message in response.json()["detail"]